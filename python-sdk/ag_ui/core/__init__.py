@@ -49,6 +49,9 @@ from ag_ui.core.types import (
     State
 )
 
+from ag_ui.core.coalesce import CoalescePolicy, coalesce_deltas
+from ag_ui.core.queue import BoundedEventQueue, EventQueueOverflow, OverflowPolicy
+
 __all__ = [
     # Events
     "EventType",
@@ -92,5 +95,11 @@ __all__ = [
     "Context",
     "Tool",
     "RunAgentInput",
-    "State"
+    "State",
+    # Stream stages
+    "CoalescePolicy",
+    "coalesce_deltas",
+    "BoundedEventQueue",
+    "EventQueueOverflow",
+    "OverflowPolicy"
 ]
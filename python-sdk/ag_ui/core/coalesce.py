@@ -0,0 +1,117 @@
+"""
+This module contains a stream stage that merges bursts of small content deltas.
+"""
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple, Type
+
+from .events import (
+    BaseEvent,
+    TextMessageChunkEvent,
+    TextMessageContentEvent,
+    ToolCallArgsEvent,
+    ToolCallChunkEvent,
+)
+from .read_ahead import ReadAhead
+
+# Event class -> fields that must match for two of its deltas to be merged
+_COALESCABLE_EVENTS: Dict[Type[BaseEvent], Tuple[str, ...]] = {
+    TextMessageContentEvent: ("message_id",),
+    ToolCallArgsEvent: ("tool_call_id",),
+    TextMessageChunkEvent: ("message_id", "role"),
+    ToolCallChunkEvent: ("tool_call_id", "tool_call_name", "parent_message_id"),
+}
+
+
+class CoalescePolicy:
+    """
+    Controls how many consecutive deltas are merged into a single event.
+
+    A merged event is emitted once its delta reaches max_chars, once the first
+    delta has waited max_latency_seconds, or as soon as any other event arrives.
+    """
+    def __init__(self, max_chars: int = 1024, max_latency_seconds: float = 0.02):
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive")
+        if max_latency_seconds < 0:
+            raise ValueError("max_latency_seconds must not be negative")
+        self.max_chars = max_chars
+        self.max_latency_seconds = max_latency_seconds
+
+
+async def coalesce_deltas(
+    events: AsyncIterable[BaseEvent],
+    policy: Optional[CoalescePolicy] = None,
+) -> AsyncIterator[BaseEvent]:
+    """
+    Merges consecutive TEXT_MESSAGE_CONTENT, TOOL_CALL_ARGS, TEXT_MESSAGE_CHUNK
+    and TOOL_CALL_CHUNK deltas.
+
+    Only deltas of the same message_id or tool_call_id that directly follow each
+    other are merged, so events are never reordered; chunks must also agree on
+    their role, tool_call_name and parent_message_id. The merged event keeps the
+    timestamp of its first delta; events carrying raw_event and chunks without
+    a delta pass through untouched.
+    """
+    policy = policy or CoalescePolicy()
+    loop = asyncio.get_running_loop()
+    # The source runs in one task, so its context variables behave as usual
+    reader = ReadAhead(events)
+    held: Optional[BaseEvent] = None
+    deltas: List[str] = []
+    size = 0
+    deadline = 0.0
+
+    def merged() -> BaseEvent:
+        if len(deltas) == 1:
+            return held
+        return held.model_copy(update={"delta": "".join(deltas)})
+
+    try:
+        while True:
+            try:
+                # Race the next event against the latency deadline of the held delta
+                if held is not None and not await reader.wait(deadline - loop.time()):
+                    yield merged()
+                    held = None
+                    continue
+                event = await reader.__anext__()
+            except StopAsyncIteration:
+                break
+            except Exception:
+                if held is not None:
+                    yield merged()
+                raise
+
+            keys = _COALESCABLE_EVENTS.get(type(event))
+            if keys is not None and event.raw_event is None and event.delta is not None:
+                if (
+                    held is not None
+                    and type(held) is type(event)
+                    and all(getattr(held, key) == getattr(event, key) for key in keys)
+                    and size + len(event.delta) <= policy.max_chars
+                ):
+                    deltas.append(event.delta)
+                    size += len(event.delta)
+                else:
+                    if held is not None:
+                        yield merged()
+                    held = event
+                    deltas = [event.delta]
+                    size = len(event.delta)
+                    deadline = loop.time() + policy.max_latency_seconds
+
+                if size >= policy.max_chars:
+                    yield merged()
+                    held = None
+                continue
+
+            if held is not None:
+                yield merged()
+                held = None
+            yield event
+
+        if held is not None:
+            yield merged()
+    finally:
+        await reader.aclose()
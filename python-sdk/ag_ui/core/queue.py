@@ -0,0 +1,130 @@
+"""
+This module contains a bounded event queue with a policy for slow consumers.
+"""
+
+import asyncio
+from enum import Enum
+from typing import Any, Dict
+
+from .coalesce import _COALESCABLE_EVENTS
+from .events import EventType, RunErrorEvent
+
+
+class OverflowPolicy(str, Enum):
+    """
+    What a BoundedEventQueue does with an event that arrives while it is full.
+    """
+    BLOCK = "block"
+    COALESCE = "coalesce"
+    DROP = "drop"
+
+
+class EventQueueOverflow(Exception):
+    """
+    Raised to producers of a queue that overflowed under OverflowPolicy.DROP.
+    """
+
+
+class BoundedEventQueue(asyncio.Queue):
+    """
+    An asyncio.Queue of events that bounds memory when the consumer falls behind.
+
+    When the queue holds maxsize items, the policy decides what happens:
+
+    - BLOCK: put() waits for space; put_nowait() raises asyncio.QueueFull.
+    - COALESCE: a content, tool call argument or chunk delta is appended to the
+      delta at the tail of the queue if both are of the same type and belong to
+      the same message or tool call (for chunks, with the same role, or the same
+      tool_call_name and parent_message_id); any other event is handled as with BLOCK.
+    - DROP: the queued events are discarded and replaced by a single RUN_ERROR,
+      and every later put raises EventQueueOverflow so the producer can stop.
+
+    The deepest the queue has been is kept in high_water_mark.
+    """
+    def __init__(self, maxsize: int = 1000, policy: OverflowPolicy = OverflowPolicy.BLOCK):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        super().__init__(maxsize)
+        self.policy = OverflowPolicy(policy)
+        self.high_water_mark = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.overflowed = False
+
+    def _put(self, item: Any) -> None:
+        super()._put(item)
+        self.high_water_mark = max(self.high_water_mark, self.qsize())
+
+    async def put(self, item: Any) -> None:
+        if self._put_full(item):
+            return
+        await super().put(item)
+
+    def put_nowait(self, item: Any) -> None:
+        if self._put_full(item):
+            return
+        super().put_nowait(item)
+
+    def _put_full(self, item: Any) -> bool:
+        """
+        Applies the overflow policy; returns True if the item needs no further put.
+        """
+        if self.overflowed:
+            self.dropped += 1
+            raise EventQueueOverflow("Event queue overflowed; the event was dropped")
+        if not self.full():
+            return False
+        if self.policy == OverflowPolicy.COALESCE:
+            return self._coalesce(item)
+        if self.policy == OverflowPolicy.DROP:
+            self.overflow()
+            self.dropped += 1
+            raise EventQueueOverflow("Event queue overflowed; the event was dropped")
+        return False
+
+    def _coalesce(self, item: Any) -> bool:
+        tail = self._queue[-1]
+        # The same fields as for coalesce_deltas decide what belongs to one stream
+        keys = _COALESCABLE_EVENTS.get(type(item))
+        if (
+            keys is None
+            or type(tail) is not type(item)
+            or item.raw_event is not None
+            or tail.raw_event is not None
+            or any(getattr(tail, key) != getattr(item, key) for key in keys)
+        ):
+            return False
+        delta = (tail.delta or "") + (item.delta or "")
+        self._queue[-1] = tail.model_copy(update={"delta": delta})
+        self.coalesced += 1
+        return True
+
+    def overflow(self) -> None:
+        """
+        Discards the queued events and ends the stream with a RUN_ERROR event.
+        """
+        if self.overflowed:
+            return
+        while not self.empty():
+            self.get_nowait()
+            self.dropped += 1
+        self.overflowed = True
+        super().put_nowait(RunErrorEvent(
+            type=EventType.RUN_ERROR,
+            message="Event queue overflowed: the client is not reading events fast enough",
+            code="SLOW_CONSUMER",
+        ))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns the current depth and the counters of the queue.
+        """
+        return {
+            "maxsize": self.maxsize,
+            "policy": self.policy.value,
+            "depth": self.qsize(),
+            "high_water_mark": self.high_water_mark,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "overflowed": self.overflowed,
+        }
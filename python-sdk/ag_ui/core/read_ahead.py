@@ -0,0 +1,85 @@
+"""
+This module contains a helper that reads an async iterable ahead of its consumer.
+"""
+
+import asyncio
+from typing import AsyncIterable, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class ReadAhead(Generic[T]):
+    """
+    Iterates an async iterable in a single background task and hands its items
+    to the consumer through a queue, so the consumer can wait for the next item
+    with a deadline without losing it.
+
+    Calling __anext__() of the source in a new task per step would give every
+    step its own copy of the context, and break sources that set a context
+    variable before a yield and reset it after (tracing spans, for example).
+    Here the source runs from start to end in one task.
+    """
+    def __init__(self, source: AsyncIterable[T]):
+        self._queue: "asyncio.Queue[Tuple[bool, object]]" = asyncio.Queue(maxsize=1)
+        self._getter: Optional[asyncio.Future] = None
+        self._finished = False
+        self._task = asyncio.ensure_future(self._pump(source))
+
+    async def _pump(self, source: AsyncIterable[T]) -> None:
+        iterator = source.__aiter__()
+        try:
+            async for item in iterator:
+                await self._queue.put((False, item))
+            await self._queue.put((True, None))
+        except Exception as error:
+            await self._queue.put((True, error))
+        finally:
+            # Close the source in the task that ran it
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Waits up to timeout seconds for the next item, the end of the source or
+        its error. Returns True if __anext__() will not block.
+        """
+        if self._getter is None:
+            self._getter = asyncio.ensure_future(self._queue.get())
+        if timeout > 0 and not self._getter.done():
+            await asyncio.wait((self._getter,), timeout=timeout)
+        return self._getter.done()
+
+    def __aiter__(self) -> "ReadAhead[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        """
+        Returns the next item, or raises the source's error or StopAsyncIteration.
+        """
+        if self._finished:
+            raise StopAsyncIteration
+        if self._getter is None:
+            self._getter = asyncio.ensure_future(self._queue.get())
+        getter = self._getter
+        finished, value = await getter
+        self._getter = None
+        if finished:
+            self._finished = True
+            if value is not None:
+                raise value
+            raise StopAsyncIteration
+        return value
+
+    async def aclose(self) -> None:
+        """
+        Stops reading and closes the source.
+        """
+        if self._getter is not None and not self._getter.done():
+            self._getter.cancel()
+        if not self._task.done():
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
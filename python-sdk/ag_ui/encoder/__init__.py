@@ -3,5 +3,6 @@ This module contains the EventEncoder class.
 """
 
 from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.encoder.batching import FlushPolicy, batch_frames, DEFAULT_BOUNDARY_EVENTS
 
-__all__ = ["EventEncoder", "AGUI_MEDIA_TYPE"]
+__all__ = ["EventEncoder", "AGUI_MEDIA_TYPE", "FlushPolicy", "batch_frames", "DEFAULT_BOUNDARY_EVENTS"]
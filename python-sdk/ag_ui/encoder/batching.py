@@ -0,0 +1,131 @@
+"""
+This module contains helpers to coalesce encoded events into fewer transport writes.
+"""
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator, FrozenSet, Iterable, List, Optional, Union
+
+from ag_ui.core.events import EventType
+from ag_ui.core.read_ahead import ReadAhead
+from ag_ui.proto import peek_event_type
+
+Frame = Union[str, bytes]
+
+_SSE_TYPE_PREFIX = 'data: {"type":"'
+_FRAME_HEADER_SIZE = 4
+
+DEFAULT_BOUNDARY_EVENTS: FrozenSet[EventType] = frozenset({
+    EventType.TEXT_MESSAGE_END,
+    EventType.THINKING_TEXT_MESSAGE_END,
+    EventType.TOOL_CALL_END,
+    EventType.THINKING_END,
+    EventType.RUN_FINISHED,
+    EventType.RUN_ERROR,
+})
+
+
+class FlushPolicy:
+    """
+    Decides when buffered frames are written to the transport.
+
+    Buffered frames are flushed once they reach max_bytes, once the oldest
+    buffered frame has waited max_latency_seconds, or right after a frame
+    carrying one of the boundary events.
+    """
+    def __init__(
+        self,
+        max_bytes: int = 16384,
+        max_latency_seconds: float = 0.015,
+        boundary_events: Optional[Iterable[EventType]] = None,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if max_latency_seconds < 0:
+            raise ValueError("max_latency_seconds must not be negative")
+        self.max_bytes = max_bytes
+        self.max_latency_seconds = max_latency_seconds
+        self.boundary_events = (
+            DEFAULT_BOUNDARY_EVENTS if boundary_events is None else frozenset(boundary_events)
+        )
+
+    def is_boundary(self, frame: Frame) -> bool:
+        """
+        Returns True if the frame carries a boundary event.
+        """
+        return frame_event_type(frame) in self.boundary_events
+
+
+def frame_event_type(frame: Frame) -> Optional[EventType]:
+    """
+    Returns the event type of a frame produced by EventEncoder, or None if unknown.
+    """
+    if isinstance(frame, str):
+        start = frame.find(_SSE_TYPE_PREFIX)
+        if start < 0:
+            return None
+        start += len(_SSE_TYPE_PREFIX)
+        end = frame.find('"', start)
+        try:
+            return EventType(frame[start:end])
+        except ValueError:
+            return None
+    return peek_event_type(frame[_FRAME_HEADER_SIZE:])
+
+
+async def batch_frames(
+    frames: AsyncIterable[Frame],
+    flush_policy: FlushPolicy,
+) -> AsyncIterator[Frame]:
+    """
+    Coalesces encoded frames into larger chunks according to flush_policy.
+
+    Frames keep their order; a chunk is simply the concatenation of the frames
+    buffered since the last flush.
+    """
+    loop = asyncio.get_running_loop()
+    # The source runs in one task, so its context variables behave as usual
+    reader = ReadAhead(frames)
+    buffer: List[Frame] = []
+    size = 0
+    deadline = 0.0
+
+    try:
+        while True:
+            try:
+                # Race the next frame against the latency deadline of the buffer
+                if buffer and not await reader.wait(deadline - loop.time()):
+                    yield _join(buffer)
+                    buffer = []
+                    size = 0
+                    continue
+                frame = await reader.__anext__()
+            except StopAsyncIteration:
+                break
+            except Exception:
+                # Deliver what was produced before the failure
+                if buffer:
+                    yield _join(buffer)
+                raise
+
+            if not buffer:
+                deadline = loop.time() + flush_policy.max_latency_seconds
+            buffer.append(frame)
+            size += len(frame)
+
+            if size >= flush_policy.max_bytes or flush_policy.is_boundary(frame):
+                yield _join(buffer)
+                buffer = []
+                size = 0
+
+        if buffer:
+            yield _join(buffer)
+    finally:
+        await reader.aclose()
+
+
+def _join(frames: List[Frame]) -> Frame:
+    if len(frames) == 1:
+        return frames[0]
+    if all(isinstance(frame, str) for frame in frames):
+        return "".join(frames)
+    return b"".join(frame.encode("utf-8") if isinstance(frame, str) else frame for frame in frames)
@@ -2,31 +2,137 @@
 This module contains the EventEncoder class
 """
 
-from ag_ui.core.events import BaseEvent
+from json.encoder import encode_basestring
+from typing import Callable, Dict, Optional, Type, Union
 
-AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
+from pydantic_core import to_json
+
+from ag_ui.core.events import (
+    BaseEvent,
+    TextMessageContentEvent,
+    TextMessageChunkEvent,
+    ToolCallArgsEvent,
+    StateDeltaEvent,
+)
+from ag_ui.proto import AGUI_MEDIA_TYPE, encode_frame
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+SSESerializer = Callable[[BaseEvent], Optional[str]]
+
+
+def _compile_sse_serializer(event_class: Type[BaseEvent]) -> SSESerializer:
+    """
+    Builds an SSE serializer that writes the fields of event_class directly.
+
+    The output is byte-identical to model_dump_json(by_alias=True, exclude_none=True).
+    Returns None for events it cannot serialize so the caller falls back to pydantic.
+    """
+    type_value = event_class.model_fields["type"].default
+    prefix = f'data: {{"type":{encode_basestring(type_value.value)}'
+    fields = tuple(
+        (name, f",{encode_basestring(info.alias or name)}:")
+        for name, info in event_class.model_fields.items()
+        if name not in ("type", "raw_event")
+    )
+
+    def serialize(event: BaseEvent) -> Optional[str]:
+        if event.raw_event is not None:
+            return None
+        parts = [prefix]
+        for name, key in fields:
+            value = getattr(event, name)
+            if value is None:
+                continue
+            parts.append(key)
+            if type(value) is str:
+                parts.append(encode_basestring(value))
+            elif type(value) is int:
+                parts.append(str(value))
+            else:
+                parts.append(
+                    to_json(value, by_alias=True, exclude_none=True, inf_nan_mode="null").decode("utf-8")
+                )
+        parts.append("}\n\n")
+        return "".join(parts)
+
+    return serialize
+
+
+# Hot event types emitted once per streamed token
+_SSE_SERIALIZERS: Dict[Type[BaseEvent], SSESerializer] = {
+    event_class: _compile_sse_serializer(event_class)
+    for event_class in (
+        TextMessageContentEvent,
+        ToolCallArgsEvent,
+        TextMessageChunkEvent,
+        StateDeltaEvent,
+    )
+}
 
 class EventEncoder:
     """
     Encodes Agent User Interaction events.
     """
     def __init__(self, accept: str = None):
-        pass
+        self._accepts_protobuf = self._is_protobuf_accepted(accept) if accept else False
 
     def get_content_type(self) -> str:
         """
         Returns the content type of the encoder.
         """
-        return "text/event-stream"
+        if self._accepts_protobuf:
+            return AGUI_MEDIA_TYPE
+        return SSE_MEDIA_TYPE
 
-    def encode(self, event: BaseEvent) -> str:
+    def encode(self, event: BaseEvent, event_id: Optional[int] = None) -> Union[str, bytes]:
         """
         Encodes an event.
+
+        Returns length-prefixed protobuf bytes if the client accepts AGUI_MEDIA_TYPE,
+        otherwise an SSE string. If event_id is given, SSE frames carry it in an
+        id field so clients can resume with a Last-Event-ID header.
         """
+        if self._accepts_protobuf:
+            return self._encode_protobuf(event)
+        if event_id is not None:
+            return f"id: {event_id}\n{self._encode_sse(event)}"
         return self._encode_sse(event)
 
     def _encode_sse(self, event: BaseEvent) -> str:
         """
         Encodes an event into an SSE string.
         """
+        serializer = _SSE_SERIALIZERS.get(type(event))
+        if serializer is not None:
+            encoded = serializer(event)
+            if encoded is not None:
+                return encoded
         return f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+
+    def _encode_protobuf(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into a protobuf message prefixed with its 4 byte big-endian length.
+        """
+        return encode_frame(event)
+
+    @staticmethod
+    def _is_protobuf_accepted(accept: str) -> bool:
+        """
+        Checks whether the accept header explicitly prefers AGUI_MEDIA_TYPE over SSE.
+        """
+        qualities: Dict[str, float] = {}
+        for media_range in accept.split(","):
+            media_type, *params = media_range.split(";")
+            quality = 1.0
+            for param in params:
+                key, _, value = param.partition("=")
+                if key.strip().lower() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            qualities[media_type.strip().lower()] = quality
+
+        protobuf_quality = qualities.get(AGUI_MEDIA_TYPE, 0.0)
+        return protobuf_quality > 0 and protobuf_quality >= qualities.get(SSE_MEDIA_TYPE, 0.0)
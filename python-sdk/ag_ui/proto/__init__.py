@@ -0,0 +1,14 @@
+"""
+This module contains the protocol buffer encoding for Agent User Interaction events.
+"""
+
+from ag_ui.proto.proto import (
+    AGUI_MEDIA_TYPE,
+    encode,
+    decode,
+    encode_frame,
+    decode_frames,
+    peek_event_type,
+)
+
+__all__ = ["AGUI_MEDIA_TYPE", "encode", "decode", "encode_frame", "decode_frames", "peek_event_type"]
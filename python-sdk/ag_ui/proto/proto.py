@@ -0,0 +1,395 @@
+"""
+This module contains the protocol buffer encoding of Agent User Interaction events.
+
+The wire layout follows the `events.proto`, `patch.proto` and `types.proto`
+schemas shared with the TypeScript SDK.
+"""
+
+import struct
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from pydantic_core import to_jsonable_python
+
+from ag_ui.core.events import (
+    EventType,
+    BaseEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    ToolCallResultEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+)
+from ag_ui.proto.wire import (
+    WIRE_LENGTH_DELIMITED,
+    decode_value,
+    encode_value,
+    iter_fields,
+    read_varint,
+    to_signed64,
+    write_bytes_field,
+    write_string_field,
+    write_varint_field,
+)
+
+AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
+
+_FRAME_HEADER = struct.Struct(">I")
+
+# Field kinds
+_STRING = "string"
+_VALUE = "value"
+_MESSAGES = "messages"
+_PATCHES = "patches"
+
+# ag_ui.EventType enum numbers
+_EVENT_TYPE_NUMBERS: Dict[EventType, int] = {
+    EventType.TEXT_MESSAGE_START: 0,
+    EventType.TEXT_MESSAGE_CONTENT: 1,
+    EventType.TEXT_MESSAGE_END: 2,
+    EventType.TOOL_CALL_START: 3,
+    EventType.TOOL_CALL_ARGS: 4,
+    EventType.TOOL_CALL_END: 5,
+    EventType.STATE_SNAPSHOT: 6,
+    EventType.STATE_DELTA: 7,
+    EventType.MESSAGES_SNAPSHOT: 8,
+    EventType.RAW: 9,
+    EventType.CUSTOM: 10,
+    EventType.RUN_STARTED: 11,
+    EventType.RUN_FINISHED: 12,
+    EventType.RUN_ERROR: 13,
+    EventType.STEP_STARTED: 14,
+    EventType.STEP_FINISHED: 15,
+    EventType.TEXT_MESSAGE_CHUNK: 16,
+    EventType.TOOL_CALL_CHUNK: 17,
+    EventType.TOOL_CALL_RESULT: 18,
+    EventType.THINKING_START: 19,
+    EventType.THINKING_END: 20,
+    EventType.THINKING_TEXT_MESSAGE_START: 21,
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: 22,
+    EventType.THINKING_TEXT_MESSAGE_END: 23,
+}
+
+# ag_ui.JsonPatchOperationType enum numbers
+_PATCH_OPS = ["add", "remove", "replace", "move", "copy", "test"]
+_PATCH_OP_NUMBERS = {op: number for number, op in enumerate(_PATCH_OPS)}
+
+
+class _Field(NamedTuple):
+    number: int
+    name: str
+    alias: str
+    kind: str
+    required: bool
+
+
+class _EventSchema(NamedTuple):
+    event_type: EventType
+    oneof_number: int
+    event_class: Type[BaseEvent]
+    fields: Tuple[_Field, ...]
+
+
+def _schema(
+    event_type: EventType,
+    oneof_number: int,
+    event_class: Type[BaseEvent],
+    *fields: Tuple[int, str, str],
+) -> _EventSchema:
+    resolved = []
+    for number, name, kind in fields:
+        model_field = event_class.model_fields[name]
+        resolved.append(_Field(
+            number=number,
+            name=name,
+            alias=model_field.alias or name,
+            kind=kind,
+            required=model_field.is_required(),
+        ))
+    return _EventSchema(event_type, oneof_number, event_class, tuple(resolved))
+
+
+# Field numbers follow the ag_ui.Event oneof and the per-event messages
+_SCHEMAS: Dict[EventType, _EventSchema] = {schema.event_type: schema for schema in (
+    _schema(EventType.TEXT_MESSAGE_START, 1, TextMessageStartEvent,
+            (2, "message_id", _STRING), (3, "role", _STRING)),
+    _schema(EventType.TEXT_MESSAGE_CONTENT, 2, TextMessageContentEvent,
+            (2, "message_id", _STRING), (3, "delta", _STRING)),
+    _schema(EventType.TEXT_MESSAGE_END, 3, TextMessageEndEvent,
+            (2, "message_id", _STRING)),
+    _schema(EventType.TOOL_CALL_START, 4, ToolCallStartEvent,
+            (2, "tool_call_id", _STRING), (3, "tool_call_name", _STRING),
+            (4, "parent_message_id", _STRING)),
+    _schema(EventType.TOOL_CALL_ARGS, 5, ToolCallArgsEvent,
+            (2, "tool_call_id", _STRING), (3, "delta", _STRING)),
+    _schema(EventType.TOOL_CALL_END, 6, ToolCallEndEvent,
+            (2, "tool_call_id", _STRING)),
+    _schema(EventType.STATE_SNAPSHOT, 7, StateSnapshotEvent,
+            (2, "snapshot", _VALUE)),
+    _schema(EventType.STATE_DELTA, 8, StateDeltaEvent,
+            (2, "delta", _PATCHES)),
+    _schema(EventType.MESSAGES_SNAPSHOT, 9, MessagesSnapshotEvent,
+            (2, "messages", _MESSAGES)),
+    _schema(EventType.RAW, 10, RawEvent,
+            (2, "event", _VALUE), (3, "source", _STRING)),
+    _schema(EventType.CUSTOM, 11, CustomEvent,
+            (2, "name", _STRING), (3, "value", _VALUE)),
+    _schema(EventType.RUN_STARTED, 12, RunStartedEvent,
+            (2, "thread_id", _STRING), (3, "run_id", _STRING)),
+    _schema(EventType.RUN_FINISHED, 13, RunFinishedEvent,
+            (2, "thread_id", _STRING), (3, "run_id", _STRING), (4, "result", _VALUE)),
+    _schema(EventType.RUN_ERROR, 14, RunErrorEvent,
+            (2, "code", _STRING), (3, "message", _STRING)),
+    _schema(EventType.STEP_STARTED, 15, StepStartedEvent,
+            (2, "step_name", _STRING)),
+    _schema(EventType.STEP_FINISHED, 16, StepFinishedEvent,
+            (2, "step_name", _STRING)),
+    _schema(EventType.TEXT_MESSAGE_CHUNK, 17, TextMessageChunkEvent,
+            (2, "message_id", _STRING), (3, "role", _STRING), (4, "delta", _STRING)),
+    _schema(EventType.TOOL_CALL_CHUNK, 18, ToolCallChunkEvent,
+            (2, "tool_call_id", _STRING), (3, "tool_call_name", _STRING),
+            (4, "parent_message_id", _STRING), (5, "delta", _STRING)),
+    _schema(EventType.TOOL_CALL_RESULT, 19, ToolCallResultEvent,
+            (2, "message_id", _STRING), (3, "tool_call_id", _STRING),
+            (4, "content", _STRING), (5, "role", _STRING)),
+    _schema(EventType.THINKING_START, 20, ThinkingStartEvent,
+            (2, "title", _STRING)),
+    _schema(EventType.THINKING_END, 21, ThinkingEndEvent),
+    _schema(EventType.THINKING_TEXT_MESSAGE_START, 22, ThinkingTextMessageStartEvent),
+    _schema(EventType.THINKING_TEXT_MESSAGE_CONTENT, 23, ThinkingTextMessageContentEvent,
+            (2, "delta", _STRING)),
+    _schema(EventType.THINKING_TEXT_MESSAGE_END, 24, ThinkingTextMessageEndEvent),
+)}
+
+_SCHEMAS_BY_ONEOF: Dict[int, _EventSchema] = {
+    schema.oneof_number: schema for schema in _SCHEMAS.values()
+}
+
+
+def encode(event: BaseEvent) -> bytes:
+    """
+    Encodes an event as a serialized ag_ui.Event message.
+    """
+    schema = _SCHEMAS.get(event.type)
+    if schema is None:
+        raise ValueError(f"Unsupported event type: {event.type}")
+
+    base = bytearray()
+    type_number = _EVENT_TYPE_NUMBERS[schema.event_type]
+    if type_number:
+        write_varint_field(base, 1, type_number)
+    if event.timestamp:
+        write_varint_field(base, 2, event.timestamp)
+    if event.raw_event is not None:
+        write_bytes_field(base, 3, encode_value(to_jsonable_python(event.raw_event)))
+
+    body = bytearray()
+    write_bytes_field(body, 1, base)
+    for field in schema.fields:
+        value = getattr(event, field.name, None)
+        if value is None:
+            continue
+        if field.kind == _STRING:
+            if value:
+                write_string_field(body, field.number, value)
+        elif field.kind == _VALUE:
+            write_bytes_field(body, field.number, encode_value(to_jsonable_python(value)))
+        elif field.kind == _MESSAGES:
+            for message in value:
+                write_bytes_field(body, field.number, _encode_message(message))
+        elif field.kind == _PATCHES:
+            for operation in value:
+                write_bytes_field(body, field.number, _encode_patch(operation))
+
+    buf = bytearray()
+    write_bytes_field(buf, schema.oneof_number, body)
+    return bytes(buf)
+
+
+def decode(data: bytes) -> BaseEvent:
+    """
+    Decodes a serialized ag_ui.Event message into an event.
+    """
+    for field_number, wire_type, value in iter_fields(data):
+        schema = _SCHEMAS_BY_ONEOF.get(field_number)
+        if schema is not None and wire_type == WIRE_LENGTH_DELIMITED:
+            return _decode_event(schema, value)
+    raise ValueError("Invalid event")
+
+
+def peek_event_type(data: bytes) -> Optional[EventType]:
+    """
+    Returns the event type of a serialized ag_ui.Event message without decoding it.
+    """
+    try:
+        tag, _ = read_varint(data, 0)
+    except ValueError:
+        return None
+    schema = _SCHEMAS_BY_ONEOF.get(tag >> 3)
+    return schema.event_type if schema is not None else None
+
+
+def encode_frame(event: BaseEvent) -> bytes:
+    """
+    Encodes an event prefixed with its length as a 4 byte big-endian uint32.
+    """
+    message = encode(event)
+    return _FRAME_HEADER.pack(len(message)) + message
+
+
+def decode_frames(data: bytes) -> Tuple[List[BaseEvent], bytes]:
+    """
+    Decodes all complete length-prefixed frames in data.
+
+    Returns the decoded events and the trailing bytes of an incomplete frame,
+    which should be prepended to the next chunk read from the stream.
+    """
+    events = []
+    view = memoryview(data)
+    pos = 0
+    while len(view) - pos >= _FRAME_HEADER.size:
+        length = _FRAME_HEADER.unpack_from(view, pos)[0]
+        start = pos + _FRAME_HEADER.size
+        if len(view) - start < length:
+            break
+        events.append(decode(view[start:start + length]))
+        pos = start + length
+    return events, bytes(view[pos:])
+
+
+def _decode_event(schema: _EventSchema, data: Any) -> BaseEvent:
+    fields_by_number = {field.number: field for field in schema.fields}
+    payload: Dict[str, Any] = {"type": schema.event_type}
+
+    for field_number, _, value in iter_fields(data):
+        if field_number == 1:
+            for base_number, _, base_value in iter_fields(value):
+                if base_number == 2:
+                    payload["timestamp"] = to_signed64(base_value)
+                elif base_number == 3:
+                    payload["rawEvent"] = decode_value(base_value)
+            continue
+
+        field = fields_by_number.get(field_number)
+        if field is None:
+            continue
+        if field.kind == _STRING:
+            payload[field.alias] = bytes(value).decode("utf-8")
+        elif field.kind == _VALUE:
+            payload[field.alias] = decode_value(value)
+        elif field.kind == _MESSAGES:
+            payload.setdefault(field.alias, []).append(_decode_message(value))
+        elif field.kind == _PATCHES:
+            payload.setdefault(field.alias, []).append(_decode_patch(value))
+
+    # proto3 omits default values, restore them for required fields
+    for field in schema.fields:
+        if field.required and field.alias not in payload:
+            if field.kind == _STRING:
+                payload[field.alias] = ""
+            elif field.kind == _VALUE:
+                payload[field.alias] = None
+            else:
+                payload[field.alias] = []
+
+    return schema.event_class.model_validate(payload)
+
+
+def _encode_message(message: Any) -> bytearray:
+    buf = bytearray()
+    for number, name in ((1, "id"), (2, "role"), (3, "content"), (4, "name")):
+        value = getattr(message, name, None)
+        if value:
+            write_string_field(buf, number, value)
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        call = bytearray()
+        write_string_field(call, 1, tool_call.id)
+        write_string_field(call, 2, tool_call.type)
+        function = bytearray()
+        if tool_call.function.name:
+            write_string_field(function, 1, tool_call.function.name)
+        if tool_call.function.arguments:
+            write_string_field(function, 2, tool_call.function.arguments)
+        write_bytes_field(call, 3, function)
+        write_bytes_field(buf, 5, call)
+    tool_call_id = getattr(message, "tool_call_id", None)
+    if tool_call_id:
+        write_string_field(buf, 6, tool_call_id)
+    return buf
+
+
+def _decode_message(data: Any) -> Dict[str, Any]:
+    message: Dict[str, Any] = {}
+    names = {1: "id", 2: "role", 3: "content", 4: "name", 6: "toolCallId"}
+    for field_number, _, value in iter_fields(data):
+        if field_number in names:
+            message[names[field_number]] = bytes(value).decode("utf-8")
+        elif field_number == 5:
+            tool_call: Dict[str, Any] = {"function": {"name": "", "arguments": ""}}
+            for call_number, _, call_value in iter_fields(value):
+                if call_number == 1:
+                    tool_call["id"] = bytes(call_value).decode("utf-8")
+                elif call_number == 2:
+                    tool_call["type"] = bytes(call_value).decode("utf-8")
+                elif call_number == 3:
+                    for function_number, _, function_value in iter_fields(call_value):
+                        key = "name" if function_number == 1 else "arguments"
+                        tool_call["function"][key] = bytes(function_value).decode("utf-8")
+            tool_call.setdefault("id", "")
+            message.setdefault("toolCalls", []).append(tool_call)
+
+    message.setdefault("id", "")
+    role = message.get("role")
+    if role != "assistant":
+        message.setdefault("content", "")
+    if role == "tool":
+        message.setdefault("toolCallId", "")
+    return message
+
+
+def _encode_patch(operation: Dict[str, Any]) -> bytearray:
+    buf = bytearray()
+    op_number = _PATCH_OP_NUMBERS.get(str(operation.get("op", "")).lower())
+    if op_number is None:
+        raise ValueError(f"Unsupported JSON Patch operation: {operation.get('op')}")
+    if op_number:
+        write_varint_field(buf, 1, op_number)
+    if operation.get("path"):
+        write_string_field(buf, 2, operation["path"])
+    if operation.get("from"):
+        write_string_field(buf, 3, operation["from"])
+    if "value" in operation:
+        write_bytes_field(buf, 4, encode_value(to_jsonable_python(operation["value"])))
+    return buf
+
+
+def _decode_patch(data: Any) -> Dict[str, Any]:
+    operation: Dict[str, Any] = {"op": _PATCH_OPS[0], "path": ""}
+    for field_number, _, value in iter_fields(data):
+        if field_number == 1:
+            operation["op"] = _PATCH_OPS[value]
+        elif field_number == 2:
+            operation["path"] = bytes(value).decode("utf-8")
+        elif field_number == 3:
+            operation["from"] = bytes(value).decode("utf-8")
+        elif field_number == 4:
+            operation["value"] = decode_value(value)
+    return operation
@@ -0,0 +1,186 @@
+"""
+This module contains the low level protocol buffer wire format helpers.
+"""
+
+import struct
+from typing import Any, Iterator, Tuple, Union
+
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LENGTH_DELIMITED = 2
+WIRE_FIXED32 = 5
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_DOUBLE = struct.Struct("<d")
+
+
+def write_varint(buf: bytearray, value: int) -> None:
+    """
+    Appends a base 128 varint. Negative values are written as 64 bit two's complement.
+    """
+    if value < 0:
+        value += 1 << 64
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def write_tag(buf: bytearray, field_number: int, wire_type: int) -> None:
+    """
+    Appends a field tag.
+    """
+    write_varint(buf, (field_number << 3) | wire_type)
+
+
+def write_varint_field(buf: bytearray, field_number: int, value: int) -> None:
+    """
+    Appends a varint field.
+    """
+    write_tag(buf, field_number, WIRE_VARINT)
+    write_varint(buf, value)
+
+
+def write_bytes_field(buf: bytearray, field_number: int, value: Buffer) -> None:
+    """
+    Appends a length delimited field.
+    """
+    write_tag(buf, field_number, WIRE_LENGTH_DELIMITED)
+    write_varint(buf, len(value))
+    buf += value
+
+
+def write_string_field(buf: bytearray, field_number: int, value: str) -> None:
+    """
+    Appends a UTF-8 encoded string field.
+    """
+    write_bytes_field(buf, field_number, value.encode("utf-8"))
+
+
+def read_varint(data: Buffer, pos: int) -> Tuple[int, int]:
+    """
+    Reads a varint starting at pos and returns the value and the next position.
+    """
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 70:
+            raise ValueError("Varint is too long")
+
+
+def to_signed64(value: int) -> int:
+    """
+    Interprets an unsigned varint as a signed 64 bit integer.
+    """
+    value &= (1 << 64) - 1
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def iter_fields(data: Buffer) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Iterates over the fields of a message, yielding (field_number, wire_type, value).
+
+    Varints are yielded as ints, every other wire type as the raw bytes.
+    """
+    data = memoryview(data)
+    pos = 0
+    end = len(data)
+    while pos < end:
+        tag, pos = read_varint(data, pos)
+        field_number = tag >> 3
+        wire_type = tag & 0x07
+        if wire_type == WIRE_VARINT:
+            value, pos = read_varint(data, pos)
+        elif wire_type == WIRE_LENGTH_DELIMITED:
+            length, pos = read_varint(data, pos)
+            if pos + length > end:
+                raise ValueError("Truncated length delimited field")
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == WIRE_FIXED64:
+            value = data[pos:pos + 8]
+            pos += 8
+        elif wire_type == WIRE_FIXED32:
+            value = data[pos:pos + 4]
+            pos += 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        if pos > end:
+            raise ValueError("Truncated fixed width field")
+        yield field_number, wire_type, value
+
+
+# google.protobuf.Value
+
+def encode_value(value: Any) -> bytearray:
+    """
+    Encodes a JSON compatible value as a google.protobuf.Value message.
+    """
+    buf = bytearray()
+    if value is None:
+        write_varint_field(buf, 1, 0)
+    elif isinstance(value, bool):
+        write_varint_field(buf, 4, int(value))
+    elif isinstance(value, (int, float)):
+        write_tag(buf, 2, WIRE_FIXED64)
+        buf += _DOUBLE.pack(float(value))
+    elif isinstance(value, str):
+        write_string_field(buf, 3, value)
+    elif isinstance(value, dict):
+        fields = bytearray()
+        for key, item in value.items():
+            entry = bytearray()
+            write_string_field(entry, 1, str(key))
+            write_bytes_field(entry, 2, encode_value(item))
+            write_bytes_field(fields, 1, entry)
+        write_bytes_field(buf, 5, fields)
+    elif isinstance(value, (list, tuple)):
+        values = bytearray()
+        for item in value:
+            write_bytes_field(values, 1, encode_value(item))
+        write_bytes_field(buf, 6, values)
+    else:
+        raise TypeError(f"Cannot encode value of type {type(value).__name__}")
+    return buf
+
+
+def decode_value(data: Buffer) -> Any:
+    """
+    Decodes a google.protobuf.Value message into a JSON compatible value.
+
+    Integral numbers are returned as ints, mirroring JSON semantics.
+    """
+    result = None
+    for field_number, _, raw in iter_fields(data):
+        if field_number == 1:
+            result = None
+        elif field_number == 2:
+            number = _DOUBLE.unpack(raw)[0]
+            result = int(number) if number.is_integer() else number
+        elif field_number == 3:
+            result = bytes(raw).decode("utf-8")
+        elif field_number == 4:
+            result = bool(raw)
+        elif field_number == 5:
+            result = {}
+            for _, _, entry in iter_fields(raw):
+                key = ""
+                item = None
+                for entry_field, _, entry_raw in iter_fields(entry):
+                    if entry_field == 1:
+                        key = bytes(entry_raw).decode("utf-8")
+                    elif entry_field == 2:
+                        item = decode_value(entry_raw)
+                result[key] = item
+        elif field_number == 6:
+            result = [decode_value(item) for _, _, item in iter_fields(raw)]
+    return result
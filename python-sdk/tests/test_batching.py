@@ -0,0 +1,130 @@
+import asyncio
+import contextvars
+import unittest
+
+from ag_ui.core import (
+    EventType,
+    RunStartedEvent,
+    RunFinishedEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+)
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE, FlushPolicy, batch_frames
+from ag_ui.encoder.batching import frame_event_type
+from ag_ui.proto import decode_frames
+
+
+async def frames_of(frames, delays=None):
+    for index, frame in enumerate(frames):
+        if delays and delays[index]:
+            await asyncio.sleep(delays[index])
+        yield frame
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+class TestBatchFrames(unittest.IsolatedAsyncioTestCase):
+    """Test suite for coalescing encoded frames"""
+
+    def setUp(self):
+        encoder = EventEncoder()
+        self.events = [
+            RunStartedEvent(thread_id="t", run_id="r"),
+            TextMessageStartEvent(message_id="m"),
+            TextMessageContentEvent(message_id="m", delta="Hel"),
+            TextMessageContentEvent(message_id="m", delta="lo"),
+            TextMessageEndEvent(message_id="m"),
+            RunFinishedEvent(thread_id="t", run_id="r"),
+        ]
+        self.frames = [encoder.encode(event) for event in self.events]
+
+    def test_frame_event_type(self):
+        """Test that event types are read from SSE and protobuf frames"""
+        self.assertEqual(frame_event_type(self.frames[4]), EventType.TEXT_MESSAGE_END)
+        self.assertEqual(frame_event_type(f"id: 7\n{self.frames[0]}"), EventType.RUN_STARTED)
+        self.assertIsNone(frame_event_type("event: error\ndata: {}\n\n"))
+
+        protobuf = EventEncoder(accept=AGUI_MEDIA_TYPE).encode(self.events[5])
+        self.assertEqual(frame_event_type(protobuf), EventType.RUN_FINISHED)
+
+    async def test_flush_on_boundary_events(self):
+        """Test that boundary events close a chunk and order is preserved"""
+        policy = FlushPolicy(max_latency_seconds=10)
+        chunks = await collect(batch_frames(frames_of(self.frames), policy))
+
+        self.assertEqual(chunks, ["".join(self.frames[:5]), self.frames[5]])
+
+    async def test_flush_on_size(self):
+        """Test that the byte threshold closes a chunk"""
+        policy = FlushPolicy(max_bytes=1, max_latency_seconds=10, boundary_events=[])
+        chunks = await collect(batch_frames(frames_of(self.frames), policy))
+
+        self.assertEqual(chunks, self.frames)
+
+    async def test_flush_on_latency(self):
+        """Test that a slow producer does not hold back buffered frames"""
+        policy = FlushPolicy(max_latency_seconds=0.01, boundary_events=[])
+        delays = [0, 0, 0, 0.1, 0, 0]
+        chunks = await collect(batch_frames(frames_of(self.frames, delays), policy))
+
+        self.assertEqual(chunks, ["".join(self.frames[:3]), "".join(self.frames[3:])])
+
+    async def test_error_flushes_buffer(self):
+        """Test that buffered frames are delivered before an upstream error"""
+        async def failing():
+            yield self.frames[0]
+            yield self.frames[1]
+            raise RuntimeError("boom")
+
+        policy = FlushPolicy(max_latency_seconds=10, boundary_events=[])
+        received = []
+        with self.assertRaises(RuntimeError):
+            async for chunk in batch_frames(failing(), policy):
+                received.append(chunk)
+
+        self.assertEqual(received, ["".join(self.frames[:2])])
+
+    async def test_source_context_variables(self):
+        """Test that a source setting and resetting a context variable across yields works"""
+        current_span = contextvars.ContextVar("current_span", default=None)
+
+        async def traced():
+            token = current_span.set("span")
+            try:
+                for frame in self.frames:
+                    await asyncio.sleep(0)
+                    yield frame
+                    self.assertEqual(current_span.get(), "span")
+            finally:
+                current_span.reset(token)
+
+        policy = FlushPolicy(max_latency_seconds=0, boundary_events=[])
+        chunks = await collect(batch_frames(traced(), policy))
+
+        self.assertEqual("".join(chunks), "".join(self.frames))
+        self.assertIsNone(current_span.get())
+
+    async def test_protobuf_frames(self):
+        """Test that protobuf frames are joined into a decodable buffer"""
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        frames = [encoder.encode(event) for event in self.events]
+        chunks = await collect(batch_frames(frames_of(frames), FlushPolicy(max_latency_seconds=10)))
+
+        self.assertEqual(len(chunks), 2)
+        events, rest = decode_frames(b"".join(chunks))
+        self.assertEqual(events, self.events)
+        self.assertEqual(rest, b"")
+
+    def test_invalid_policy(self):
+        """Test that invalid thresholds are rejected"""
+        with self.assertRaises(ValueError):
+            FlushPolicy(max_bytes=0)
+        with self.assertRaises(ValueError):
+            FlushPolicy(max_latency_seconds=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import contextvars
+import unittest
+
+from ag_ui.core import (
+    CoalescePolicy,
+    coalesce_deltas,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallArgsEvent,
+    ToolCallChunkEvent,
+    ToolCallEndEvent,
+)
+
+
+async def stream(events, delays=None):
+    for index, event in enumerate(events):
+        if delays and delays[index]:
+            await asyncio.sleep(delays[index])
+        yield event
+
+
+async def collect(events, policy, delays=None):
+    return [event async for event in coalesce_deltas(stream(events, delays), policy)]
+
+
+class TestCoalesceDeltas(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the delta coalescing stage"""
+
+    async def test_merges_consecutive_text_deltas(self):
+        """Test that consecutive deltas of one message become a single event"""
+        events = [
+            TextMessageStartEvent(message_id="m"),
+            TextMessageContentEvent(message_id="m", delta="He", timestamp=1),
+            TextMessageContentEvent(message_id="m", delta="ll", timestamp=2),
+            TextMessageContentEvent(message_id="m", delta="o", timestamp=3),
+            TextMessageEndEvent(message_id="m"),
+        ]
+        result = await collect(events, CoalescePolicy(max_latency_seconds=10))
+
+        self.assertEqual(result, [
+            events[0],
+            TextMessageContentEvent(message_id="m", delta="Hello", timestamp=1),
+            events[4],
+        ])
+
+    async def test_does_not_merge_across_ids_or_types(self):
+        """Test that deltas of different streams are kept apart and in order"""
+        events = [
+            TextMessageContentEvent(message_id="a", delta="1"),
+            TextMessageContentEvent(message_id="b", delta="2"),
+            ToolCallArgsEvent(tool_call_id="b", delta='{"x"'),
+            ToolCallArgsEvent(tool_call_id="b", delta=": 1}"),
+            ToolCallEndEvent(tool_call_id="b"),
+            TextMessageContentEvent(message_id="b", delta="3"),
+        ]
+        result = await collect(events, CoalescePolicy(max_latency_seconds=10))
+
+        self.assertEqual(result, [
+            events[0],
+            events[1],
+            ToolCallArgsEvent(tool_call_id="b", delta='{"x": 1}'),
+            events[4],
+            events[5],
+        ])
+
+    async def test_merges_chunk_deltas(self):
+        """Test that consecutive chunks of one message or tool call are merged"""
+        events = [
+            TextMessageChunkEvent(message_id="m", role="assistant", delta="He", timestamp=1),
+            TextMessageChunkEvent(message_id="m", role="assistant", delta="llo", timestamp=2),
+            ToolCallChunkEvent(tool_call_id="t", tool_call_name="search", delta='{"q"'),
+            ToolCallChunkEvent(tool_call_id="t", tool_call_name="search", delta=': "x"}'),
+            ToolCallChunkEvent(tool_call_id="t", tool_call_name="lookup", delta="{}"),
+        ]
+        result = await collect(events, CoalescePolicy(max_latency_seconds=10))
+
+        self.assertEqual(result, [
+            TextMessageChunkEvent(message_id="m", role="assistant", delta="Hello", timestamp=1),
+            ToolCallChunkEvent(tool_call_id="t", tool_call_name="search", delta='{"q": "x"}'),
+            events[4],
+        ])
+
+    async def test_chunks_without_delta_pass_through(self):
+        """Test that a chunk without a delta is not merged and releases the held one"""
+        events = [
+            TextMessageChunkEvent(message_id="m", delta="a"),
+            TextMessageChunkEvent(message_id="m"),
+            TextMessageChunkEvent(message_id="m", delta="b"),
+        ]
+        result = await collect(events, CoalescePolicy(max_latency_seconds=10))
+
+        self.assertEqual(result, events)
+
+    async def test_size_window(self):
+        """Test that merged deltas never exceed max_chars"""
+        events = [TextMessageContentEvent(message_id="m", delta="ab") for _ in range(5)]
+        result = await collect(events, CoalescePolicy(max_chars=4, max_latency_seconds=10))
+
+        self.assertEqual([event.delta for event in result], ["abab", "abab", "ab"])
+
+    async def test_time_window(self):
+        """Test that a held delta is released when the producer stalls"""
+        events = [
+            TextMessageContentEvent(message_id="m", delta="a"),
+            TextMessageContentEvent(message_id="m", delta="b"),
+            TextMessageContentEvent(message_id="m", delta="c"),
+        ]
+        received = []
+        loop = asyncio.get_running_loop()
+        async for event in coalesce_deltas(stream(events, [0, 0, 0.2]), CoalescePolicy(max_latency_seconds=0.01)):
+            received.append((event.delta, loop.time()))
+
+        self.assertEqual([delta for delta, _ in received], ["ab", "c"])
+        self.assertGreater(received[1][1] - received[0][1], 0.1)
+
+    async def test_raw_events_pass_through(self):
+        """Test that deltas carrying raw_event are not merged"""
+        events = [
+            TextMessageContentEvent(message_id="m", delta="a", raw_event={"id": 1}),
+            TextMessageContentEvent(message_id="m", delta="b", raw_event={"id": 2}),
+        ]
+        result = await collect(events, CoalescePolicy(max_latency_seconds=10))
+
+        self.assertEqual(result, events)
+
+    async def test_error_releases_held_delta(self):
+        """Test that a held delta is emitted before an upstream error propagates"""
+        async def failing():
+            yield TextMessageContentEvent(message_id="m", delta="a")
+            raise RuntimeError("boom")
+
+        received = []
+        with self.assertRaises(RuntimeError):
+            async for event in coalesce_deltas(failing(), CoalescePolicy(max_latency_seconds=10)):
+                received.append(event)
+
+        self.assertEqual([event.delta for event in received], ["a"])
+
+    async def test_source_context_variables(self):
+        """Test that a source setting and resetting a context variable across yields works"""
+        current_flow = contextvars.ContextVar("current_flow", default=None)
+
+        async def flow():
+            token = current_flow.set("flow")
+            try:
+                for delta in "abc":
+                    await asyncio.sleep(0.01)
+                    yield TextMessageContentEvent(message_id="m", delta=delta)
+                    self.assertEqual(current_flow.get(), "flow")
+            finally:
+                current_flow.reset(token)
+
+        result = [event async for event in coalesce_deltas(flow(), CoalescePolicy(max_latency_seconds=0))]
+
+        self.assertEqual("".join(event.delta for event in result), "abc")
+        self.assertIsNone(current_flow.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
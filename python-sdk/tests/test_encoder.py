@@ -3,7 +3,18 @@ import json
 from datetime import datetime
 
 from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
-from ag_ui.core.events import BaseEvent, EventType, TextMessageContentEvent, ToolCallStartEvent
+from ag_ui.encoder.batching import frame_event_type
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    TextMessageContentEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    StateDeltaEvent,
+)
+from ag_ui.core.types import UserMessage
+from ag_ui.proto import decode_frames
 
 
 class TestEventEncoder(unittest.TestCase):
@@ -182,3 +193,84 @@ class TestEventEncoder(unittest.TestCase):
             original_event.model_dump(), 
             deserialized_event.model_dump()
         )
+
+    def test_content_negotiation(self):
+        """Test that the content type follows the accept header"""
+        self.assertEqual(EventEncoder().get_content_type(), "text/event-stream")
+        self.assertEqual(EventEncoder(accept="text/event-stream").get_content_type(), "text/event-stream")
+        self.assertEqual(EventEncoder(accept="*/*").get_content_type(), "text/event-stream")
+        self.assertEqual(EventEncoder(accept=AGUI_MEDIA_TYPE).get_content_type(), AGUI_MEDIA_TYPE)
+        self.assertEqual(
+            EventEncoder(accept=f"text/event-stream;q=0.5, {AGUI_MEDIA_TYPE}").get_content_type(),
+            AGUI_MEDIA_TYPE
+        )
+        self.assertEqual(
+            EventEncoder(accept=f"text/event-stream, {AGUI_MEDIA_TYPE};q=0.5").get_content_type(),
+            "text/event-stream"
+        )
+        self.assertEqual(EventEncoder(accept=f"{AGUI_MEDIA_TYPE};q=0").get_content_type(), "text/event-stream")
+
+    def test_encode_protobuf(self):
+        """Test that encode emits length-prefixed protobuf when negotiated"""
+        event = TextMessageContentEvent(message_id="msg_123", delta="Hello, world!", timestamp=1648214400000)
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        encoded = encoder.encode(event)
+
+        self.assertIsInstance(encoded, bytes)
+        self.assertLess(len(encoded), len(EventEncoder().encode(event)))
+        events, rest = decode_frames(encoded)
+        self.assertEqual(events, [event])
+        self.assertEqual(rest, b"")
+
+    def test_encode_with_event_id(self):
+        """Test that an event id is written as an SSE id field"""
+        event = TextMessageContentEvent(message_id="msg_123", delta="Hi")
+        encoded = EventEncoder().encode(event, event_id=7)
+
+        self.assertEqual(encoded, "id: 7\n" + EventEncoder().encode(event))
+        self.assertEqual(frame_event_type(encoded), EventType.TEXT_MESSAGE_CONTENT)
+        # Length-prefixed protobuf frames have no room for an id
+        self.assertEqual(
+            EventEncoder(accept=AGUI_MEDIA_TYPE).encode(event, event_id=7),
+            EventEncoder(accept=AGUI_MEDIA_TYPE).encode(event)
+        )
+
+    def test_fast_path_matches_pydantic(self):
+        """Test that the precompiled serializers are byte-identical to pydantic"""
+        tricky = ['plain', 'quote " backslash \\', 'ctrl \x00\x1f\x7f\n\t\r\b\f', 'unicode é 世界 🚀', '\u2028\u2029']
+        events = []
+        for text in tricky:
+            events.extend([
+                TextMessageContentEvent(message_id=text, delta=text),
+                TextMessageContentEvent(message_id="msg", delta=text, timestamp=1648214400000),
+                ToolCallArgsEvent(tool_call_id="call", delta=text),
+                ToolCallArgsEvent(tool_call_id="call", delta=""),
+                TextMessageChunkEvent(message_id="msg", role="assistant", delta=text),
+            ])
+        events.extend([
+            TextMessageChunkEvent(),
+            TextMessageChunkEvent(delta="only delta", timestamp=0),
+            StateDeltaEvent(delta=[]),
+            StateDeltaEvent(delta=[
+                {"op": "add", "path": "/a", "value": {"n": None, "f": 0.1, "big": 1e16, "nan": float("nan")}},
+                {"op": "replace", "path": "/msg", "value": UserMessage(id="u", content="c")},
+                {"op": "remove", "path": "/b"},
+            ], timestamp=-1),
+        ])
+
+        encoder = EventEncoder()
+        for event in events:
+            with self.subTest(event=event):
+                expected = f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+                self.assertEqual(encoder._encode_sse(event), expected)
+
+    def test_fast_path_falls_back_to_pydantic(self):
+        """Test that events the fast path cannot handle still encode correctly"""
+        encoder = EventEncoder()
+        events = [
+            TextMessageContentEvent(message_id="msg", delta="x", raw_event={"source": "adk"}),
+            ToolCallStartEvent(tool_call_id="call", tool_call_name="tool"),
+        ]
+        for event in events:
+            expected = f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+            self.assertEqual(encoder._encode_sse(event), expected)
@@ -0,0 +1,142 @@
+import unittest
+import struct
+
+from ag_ui.core import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    ToolCallResultEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+    UserMessage,
+    AssistantMessage,
+    ToolMessage,
+    SystemMessage,
+    ToolCall,
+    FunctionCall,
+)
+from ag_ui.proto import encode, decode, encode_frame, decode_frames
+from ag_ui.proto.wire import encode_value, decode_value
+
+
+class TestProtoEncoding(unittest.TestCase):
+    """Test suite for the protobuf event encoding"""
+
+    def assert_round_trip(self, event):
+        decoded = decode(encode(event))
+        self.assertIs(type(decoded), type(event))
+        self.assertEqual(decoded, event)
+
+    def test_round_trip_all_event_types(self):
+        """Test that every event type survives an encode/decode round trip"""
+        events = [
+            TextMessageStartEvent(message_id="msg_1", timestamp=1648214400000),
+            TextMessageContentEvent(message_id="msg_1", delta="Hello, 世界"),
+            TextMessageEndEvent(message_id="msg_1"),
+            TextMessageChunkEvent(message_id="msg_1", role="assistant", delta="chunk"),
+            TextMessageChunkEvent(),
+            ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START),
+            ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="hmm"),
+            ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END),
+            ToolCallStartEvent(tool_call_id="call_1", tool_call_name="search", parent_message_id="msg_1"),
+            ToolCallArgsEvent(tool_call_id="call_1", delta=""),
+            ToolCallEndEvent(tool_call_id="call_1"),
+            ToolCallChunkEvent(tool_call_id="call_1", tool_call_name="search", delta="{}"),
+            ToolCallResultEvent(
+                type=EventType.TOOL_CALL_RESULT, message_id="msg_2", tool_call_id="call_1",
+                content='{"ok": true}', role="tool"
+            ),
+            ThinkingStartEvent(type=EventType.THINKING_START, title="Planning"),
+            ThinkingEndEvent(type=EventType.THINKING_END),
+            StateSnapshotEvent(snapshot={"count": 3, "ratio": 0.5, "tags": ["a", None, True], "empty": {}}),
+            StateDeltaEvent(delta=[
+                {"op": "add", "path": "/count", "value": 4},
+                {"op": "remove", "path": "/tags"},
+                {"op": "move", "path": "/b", "from": "/a"},
+                {"op": "replace", "path": "/empty", "value": None},
+            ]),
+            MessagesSnapshotEvent(messages=[
+                SystemMessage(id="sys", content="Be brief"),
+                UserMessage(id="u1", content="Hi"),
+                AssistantMessage(id="a1", tool_calls=[
+                    ToolCall(id="call_1", function=FunctionCall(name="search", arguments='{"q": "x"}'))
+                ]),
+                ToolMessage(id="t1", content="", tool_call_id="call_1"),
+            ]),
+            RawEvent(event={"provider": "adk"}, source="adk", raw_event=[1, 2]),
+            CustomEvent(name="metadata", value="value"),
+            RunStartedEvent(thread_id="thread_1", run_id="run_1"),
+            RunFinishedEvent(thread_id="thread_1", run_id="run_1", result={"answer": 42}),
+            RunErrorEvent(message="boom", code="ERR"),
+            StepStartedEvent(step_name="step"),
+            StepFinishedEvent(step_name="step"),
+        ]
+        for event in events:
+            with self.subTest(event_type=event.type):
+                self.assert_round_trip(event)
+
+    def test_field_numbers_match_schema(self):
+        """Test the wire layout of a TEXT_MESSAGE_CONTENT event against events.proto"""
+        encoded = encode(TextMessageContentEvent(message_id="m", delta="hi"))
+        # Event.text_message_content = 2 { base_event = 1 { type = 1 }, message_id = 2, delta = 3 }
+        expected = bytes([
+            0x12, 0x0b,
+            0x0a, 0x02, 0x08, 0x01,
+            0x12, 0x01, ord("m"),
+            0x1a, 0x02, ord("h"), ord("i"),
+        ])
+        self.assertEqual(encoded, expected)
+
+    def test_negative_timestamp(self):
+        """Test that int64 timestamps keep their sign"""
+        self.assert_round_trip(RunErrorEvent(message="x", timestamp=-5))
+
+    def test_value_numbers(self):
+        """Test that integral numbers decode as ints and others as floats"""
+        self.assertEqual(decode_value(encode_value(3)), 3)
+        self.assertIsInstance(decode_value(encode_value(3)), int)
+        self.assertEqual(decode_value(encode_value(2.25)), 2.25)
+
+    def test_decode_invalid_data(self):
+        """Test that data without an event raises"""
+        with self.assertRaises(ValueError):
+            decode(b"")
+        with self.assertRaises(ValueError):
+            decode(b"\x12\x05\x0a")
+
+    def test_frames(self):
+        """Test length-prefixed framing and incremental decoding"""
+        first = TextMessageContentEvent(message_id="msg_1", delta="Hello")
+        second = TextMessageEndEvent(message_id="msg_1")
+        frame = encode_frame(first)
+        self.assertEqual(struct.unpack(">I", frame[:4])[0], len(frame) - 4)
+
+        stream = frame + encode_frame(second)
+        events, rest = decode_frames(stream[:len(frame) + 3])
+        self.assertEqual(events, [first])
+        events, rest = decode_frames(rest + stream[len(frame) + 3:])
+        self.assertEqual(events, [second])
+        self.assertEqual(rest, b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
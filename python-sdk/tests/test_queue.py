@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+
+from ag_ui.core import (
+    BoundedEventQueue,
+    EventQueueOverflow,
+    OverflowPolicy,
+    EventType,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallChunkEvent,
+)
+
+
+def content(delta, message_id="m"):
+    return TextMessageContentEvent(message_id=message_id, delta=delta)
+
+
+class TestBoundedEventQueue(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the bounded event queue"""
+
+    async def test_block_waits_for_consumer(self):
+        """Test that the BLOCK policy makes producers wait for free space"""
+        queue = BoundedEventQueue(maxsize=2)
+        await queue.put(content("a"))
+        await queue.put(content("b"))
+
+        producer = asyncio.create_task(queue.put(content("c")))
+        await asyncio.sleep(0)
+        self.assertFalse(producer.done())
+        with self.assertRaises(asyncio.QueueFull):
+            queue.put_nowait(content("d"))
+
+        self.assertEqual(queue.get_nowait().delta, "a")
+        await asyncio.wait_for(producer, timeout=1)
+        self.assertEqual([queue.get_nowait().delta for _ in range(2)], ["b", "c"])
+        self.assertEqual(queue.high_water_mark, 2)
+
+    async def test_coalesce_merges_deltas_into_tail(self):
+        """Test that the COALESCE policy merges deltas of the same message when full"""
+        queue = BoundedEventQueue(maxsize=2, policy=OverflowPolicy.COALESCE)
+        await queue.put(content("a", message_id="other"))
+        await queue.put(content("b"))
+        await queue.put(content("c"))
+        queue.put_nowait(content("d"))
+
+        self.assertEqual(queue.qsize(), 2)
+        self.assertEqual(queue.coalesced, 2)
+        with self.assertRaises(asyncio.QueueFull):
+            queue.put_nowait(TextMessageEndEvent(message_id="m"))
+        with self.assertRaises(asyncio.QueueFull):
+            queue.put_nowait(content("e", message_id="third"))
+
+        self.assertEqual(queue.get_nowait().delta, "a")
+        self.assertEqual(queue.get_nowait().delta, "bcd")
+
+    async def test_coalesce_keeps_chunks_of_other_tool_calls_apart(self):
+        """Test that chunks without ids are merged only if their other fields match"""
+        queue = BoundedEventQueue(maxsize=1, policy=OverflowPolicy.COALESCE)
+        queue.put_nowait(ToolCallChunkEvent(tool_call_name="search", delta='{"q": 1}'))
+
+        with self.assertRaises(asyncio.QueueFull):
+            queue.put_nowait(ToolCallChunkEvent(tool_call_name="lookup", delta="{}"))
+        queue.put_nowait(ToolCallChunkEvent(tool_call_name="search", delta=""))
+
+        chunk = queue.get_nowait()
+        self.assertEqual((chunk.tool_call_name, chunk.delta), ("search", '{"q": 1}'))
+        self.assertEqual(queue.coalesced, 1)
+
+    async def test_drop_replaces_queue_with_run_error(self):
+        """Test that the DROP policy ends the stream with a RUN_ERROR"""
+        queue = BoundedEventQueue(maxsize=2, policy=OverflowPolicy.DROP)
+        await queue.put(content("a"))
+        await queue.put(content("b"))
+
+        with self.assertRaises(EventQueueOverflow):
+            await queue.put(content("c"))
+        with self.assertRaises(EventQueueOverflow):
+            queue.put_nowait(content("d"))
+
+        error = queue.get_nowait()
+        self.assertEqual(error.type, EventType.RUN_ERROR)
+        self.assertEqual(error.code, "SLOW_CONSUMER")
+        self.assertTrue(queue.empty())
+        self.assertEqual(queue.get_stats(), {
+            "maxsize": 2,
+            "policy": "drop",
+            "depth": 0,
+            "high_water_mark": 2,
+            "coalesced": 0,
+            "dropped": 4,
+            "overflowed": True,
+        })
+
+    def test_invalid_maxsize(self):
+        """Test that the queue must be bounded"""
+        with self.assertRaises(ValueError):
+            BoundedEventQueue(maxsize=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+# examples/context_fragments.py
+
+"""Memoized prompt fragments for before_model_callback injectors.
+
+The injectors run on every model request of their agent and used to rebuild
+the same text each time from static tables or from session state that rarely
+changes between turns. A ContextFragment keeps the last rendered text and
+renders again only when one of its inputs changed. A ContextInjector builds
+on it to put blocks of session state into the system instruction, within a
+token budget.
+"""
+
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+from google.genai import types
+
+_NOT_RENDERED = object()
+
+TRUNCATION_MARKER = "\n... [truncated]"
+
+
+class ContextFragment:
+    """A piece of prompt text that is rendered again only when its inputs change.
+
+    Inputs are compared by identity first and by equality otherwise: session
+    services hand out a fresh copy of the state for each request, and
+    comparing two copies is far cheaper than formatting them again.
+
+    Example:
+        benchmarks = ContextFragment(render_benchmarks)          # Static data
+        summary = ContextFragment(render_summary, state_keys=["team_gap_analysis"])
+
+        text = benchmarks.get() + summary.get_from_state(callback_context.state)
+    """
+
+    def __init__(self, render: Callable[..., str], state_keys: Sequence[str] = ()):
+        """Initialize the fragment.
+
+        Args:
+            render: Builds the text from the inputs passed to get()
+            state_keys: State keys whose values get_from_state() passes to
+                render, in order (None for a missing key)
+        """
+        self._render = render
+        self._state_keys = tuple(state_keys)
+        self._inputs: Any = _NOT_RENDERED
+        self._text = ""
+        self.render_count = 0
+
+    def get(self, *inputs: Any) -> str:
+        """Get the text for inputs, rendering it only if they differ from the last call."""
+        if self._inputs is _NOT_RENDERED or self._inputs != inputs:
+            self._text = self._render(*inputs)
+            self._inputs = inputs
+            self.render_count += 1
+        return self._text
+
+    def get_from_state(self, state: Any) -> str:
+        """Get the text for the current values of the fragment's state keys."""
+        return self.get(*(state.get(key) for key in self._state_keys))
+
+
+class ContextInjector:
+    """Puts blocks of session state into the system instruction, within a token budget.
+
+    Context appended to the user message is stored in the session with every
+    turn, so the prompt grows with the conversation. The system instruction is
+    rebuilt for each model request instead, so the context is sent once per
+    request, in its current version.
+
+    Blocks are added in order until the budget is used up; the block that
+    crosses it is truncated and later blocks are left out. A block whose text
+    equals an earlier block's is skipped, and nothing is added if the
+    instruction already holds the rendered context. The text is rendered
+    again only when one of the state values changed.
+    """
+
+    def __init__(
+        self,
+        blocks: Sequence[Tuple[str, str, Optional[str]]],
+        max_tokens: int = 4000,
+        chars_per_token: int = 4,
+        header: str = "=== SESSION CONTEXT ===",
+        footer: str = ""
+    ):
+        """Initialize the injector.
+
+        Args:
+            blocks: (title, state key, default text) per block, most important
+                first; a block without a state value or default is skipped
+            max_tokens: Budget for the blocks, estimated from their length
+            chars_per_token: Characters counted as one token
+            header: Text put before the blocks
+            footer: Text put after the blocks (not counted against the budget)
+        """
+        self._blocks = [(title, default) for title, _, default in blocks]
+        self._max_chars = max_tokens * chars_per_token
+        self._header = header
+        self._footer = footer
+        self._fragment = ContextFragment(self._render, state_keys=[key for _, key, _ in blocks])
+
+    def _render(self, *values: Any) -> str:
+        remaining = self._max_chars
+        seen = set()
+        sections = []
+        for (title, default), value in zip(self._blocks, values):
+            text = default if value is None else str(value)
+            if not text or text in seen:
+                continue
+            seen.add(text)
+
+            section = f"\n\n## {title}:\n{text}"
+            if len(section) > remaining:
+                if remaining <= len(title) + len(TRUNCATION_MARKER) + 8:
+                    break
+                section = section[:remaining - len(TRUNCATION_MARKER)] + TRUNCATION_MARKER
+            remaining -= len(section)
+            sections.append(section)
+
+        if not sections:
+            return ""
+        return f"\n\n{self._header}" + "".join(sections) + self._footer
+
+    def render(self, state: Any) -> str:
+        """Get the context for the current state, or an empty string if there is none."""
+        return self._fragment.get_from_state(state)
+
+    def inject(self, state: Any, llm_request: Any) -> bool:
+        """Append the context for the current state to the request's system instruction.
+
+        Args:
+            state: Session state, e.g. callback_context.state
+            llm_request: The LlmRequest passed to the before_model_callback
+
+        Returns:
+            True if the instruction was changed
+        """
+        context = self.render(state)
+        if not context:
+            return False
+
+        instruction = llm_request.config.system_instruction
+        if isinstance(instruction, types.Content):
+            if not instruction.parts:
+                instruction.parts = [types.Part(text="")]
+            current = instruction.parts[0].text or ""
+            if context in current:
+                return False
+            instruction.parts[0].text = current + context
+        else:
+            current = str(instruction) if instruction else ""
+            if context in current:
+                return False
+            llm_request.config.system_instruction = current + context
+        return True
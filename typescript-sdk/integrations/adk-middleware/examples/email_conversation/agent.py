@@ -6,8 +6,22 @@ from google.adk.models import LlmResponse, LlmRequest
 from google.adk.agents.callback_context import CallbackContext
 from .tools import prepare_email_for_approval_tool
 from google.adk.tools import LongRunningFunctionTool
+from ..context_fragments import ContextFragment
 
 
+def _render_user_context(users_data) -> str:
+    """Formats the users as name-email pairs for the system prompt."""
+    user_list = [
+        f"- Name: {user['name']}, Email: {user['email']}"
+        for user in users_data
+    ]
+    user_context = "\n".join(user_list)
+    return f"\n\n=== AVAILABLE USERS ===\n{user_context}\n\nUse these names and emails when looking for recipient email.\n"
+
+
+# Rendered again only when the user list returned by the API changes
+user_context_fragment = ContextFragment(_render_user_context)
+
 def inject_user_emails_to_email_agent(
     callback_context: CallbackContext, llm_request: LlmRequest
 ) -> Optional[LlmResponse]:
@@ -26,13 +40,6 @@ def inject_user_emails_to_email_agent(
             print(f"[Callback Error] Failed to fetch users: {e}")
             return None
 
-        # Prepare list of name-email pairs
-        user_list = [
-            f"- Name: {user['name']}, Email: {user['email']}"
-            for user in users_data
-        ]
-        user_context = "\n".join(user_list)
-
         # Get current system instruction
         original_instruction = llm_request.config.system_instruction or types.Content(role="system", parts=[])
 
@@ -43,7 +50,7 @@ def inject_user_emails_to_email_agent(
             original_instruction.parts.append(types.Part(text=""))
 
         # Append user context to the system prompt
-        postfix = f"\n\n=== AVAILABLE USERS ===\n{user_context}\n\nUse these names and emails when looking for recipient email.\n"
+        postfix = user_context_fragment.get(users_data)
         modified_text = (original_instruction.parts[0].text or "") + postfix
 
         original_instruction.parts[0].text = modified_text
@@ -169,7 +169,8 @@ try:
   
     memory_service = VertexAiMemoryBankService(project=os.environ.get('GOOGLE_CLOUD_PROJECT','slamsportsai'),location=os.environ.get('GOOGLE_CLOUD_LOCATION','us-central1'))
     artifact_service = GcsArtifactService(bucket_name='slams-app-bucket')
-    # Create ADK middleware agent
+    # Create one ADK middleware agent for all endpoints: they share its
+    # execution slots, session index and cleanup loop
     adk_agent = ADKAgent(
         app_name="demo_app",
         user_id="demo_user",
@@ -179,42 +180,12 @@ try:
         memory_service = memory_service,
         credential_service=InMemoryCredentialService(),
         artifact_service=artifact_service,
-        cleanup_interval_seconds=604800
-    )
-    
-    adk_human_in_loop_agent = ADKAgent(
-        app_name="demo_app",
-        user_id="demo_user",
-        session_timeout_seconds=604800,
-        use_in_memory_services=False,
-        session_service = session_service,
-        memory_service = memory_service,
-        credential_service=InMemoryCredentialService(),
-        artifact_service=artifact_service,
-        cleanup_interval_seconds=604800
-    )
-    adk_email_agent = ADKAgent(
-        app_name="demo_app",
-        user_id="demo_user",
-        session_timeout_seconds=604800,
-        use_in_memory_services=False,
-        session_service = session_service,
-        memory_service = memory_service,
-        credential_service=InMemoryCredentialService(),
-        artifact_service=artifact_service,
-        cleanup_interval_seconds=604800
-    )
-    
-    adk_construction_project_agent = ADKAgent(
-        app_name="demo_app",
-        user_id="demo_user",
-        session_timeout_seconds=604800,
-        use_in_memory_services=False,
-        memory_service = memory_service,
-        credential_service=InMemoryCredentialService(),
-        session_service=session_service,
-        artifact_service=artifact_service,
-        cleanup_interval_seconds=604800
+        cleanup_interval_seconds=604800,
+        max_concurrent_executions=20,
+        max_concurrent_executions_per_agent={
+            'adk-email-agent': 5,
+            'adk-construction-project-agent': 5
+        }
     )
     
 
@@ -233,9 +204,9 @@ try:
     
     # Add the ADK endpoint
     add_adk_fastapi_endpoint(app, adk_agent, path="/chat")
-    add_adk_fastapi_endpoint(app, adk_human_in_loop_agent, path="/adk-human-in-loop-agent")
-    add_adk_fastapi_endpoint(app, adk_email_agent, path="/adk-email-agent")
-    add_adk_fastapi_endpoint(app, adk_construction_project_agent, path="/adk-construction-project-agent")
+    add_adk_fastapi_endpoint(app, adk_agent, path="/adk-human-in-loop-agent")
+    add_adk_fastapi_endpoint(app, adk_agent, path="/adk-email-agent")
+    add_adk_fastapi_endpoint(app, adk_agent, path="/adk-construction-project-agent")
     
     @app.get("/")
     async def root():
@@ -1,3 +1,4 @@
+import os
 
 from google.adk.agents import Agent,SequentialAgent
 from google.genai import types
@@ -21,30 +22,33 @@ from google.adk.planners import PlanReActPlanner
 from ..team_requirements_agent.agent import team_requirements_agent
 from ..player_stats_agent.agents import player_stats_agent
 from .mbb_glossary import mbb_metrics
+from ..context_fragments import ContextInjector
 planner = PlanReActPlanner()
 
+# Filters and sub-agent reports from the session state, most important first
+coach_context = ContextInjector(
+    blocks=[
+        ("Current filters for the required players", 'filters', None),
+        ("Team Gap Analysis", 'team_gap_analysis', None),
+        ("Team Requirements and Performance Criteria", 'team_requirements', 'No team requirements data available'),
+        ("Web Research Findings", 'web_news', 'No research data available'),
+    ],
+    max_tokens=int(os.environ.get('COACH_CONTEXT_MAX_TOKENS', '6000')),
+    header="=== CURRENT SESSION CONTEXT ===\nSummary of the current URI team gap analysis report and related findings.",
+    footer="\n\nIMPORTANT: Never include or reveal any player IDs in your responses. Always refer to players by name only."
+)
+
 # from dotenv import load_dotenv
 # load_dotenv()
 # --- Define the Callback Function ---
 def simple_before_model_modifier(
     callback_context: CallbackContext, llm_request: LlmRequest
 ) -> Optional[LlmResponse]:
-    """Inspects/modifies the LLM request or skips the call."""
+    """Adds the session context to the system instruction of the coach agent."""
     agent_name = callback_context.agent_name
-    if agent_name == "human_in_loop_agent":
-        if llm_request.contents and llm_request.contents[-1].role == 'user':
-            last_message = llm_request.contents[-1]
-            if last_message.parts and hasattr(last_message.parts[0],'text') and last_message.parts[0].text !="" and last_message.parts[0].function_response.__class__.__name__ != 'FunctionResponse' :
-                # Get the original text and add prefix
-                original_text = last_message.parts[0].text or ""
-                web_news_context = callback_context.state.get('web_news', 'No research data available')
-                team_requirements_context = callback_context.state.get('team_requirements', 'No team requirements data available')
-                modified_user_text = original_text + f"\n here are the current filters state for the required players {callback_context.state.get('filters')}\n\n Here is the summary of the current URI team gap analsyis report\n\n##Team Gap Analysis:\n{callback_context.state.get('team_gap_analysis')}\n\n##Web Research Findings:\n{web_news_context}\n\n##Team Requirements and Performance Criteria:\n{team_requirements_context}\n\nIMPORTANT: Never include or reveal any player IDs in your responses. Always refer to players by name only."
-                # Update the message content
-                last_message.parts[0].text = modified_user_text
-                if not isinstance(original_instruction, types.Content):
-                    # Handle case where it might be a string (though config expects Content)
-                    original_instruction = types.Content(role="system", parts=[types.Part(text=str(original_instruction))])
+    if agent_name == basketball_agent.name:
+        # Goes into the system instruction, so it is not stored with every user turn
+        coach_context.inject(callback_context.state, llm_request)
 
     return None
 
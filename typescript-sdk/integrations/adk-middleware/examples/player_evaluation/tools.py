@@ -2,16 +2,18 @@
 Tools for player evaluation agent - fetches player stats from API and provides evaluation capabilities.
 """
 
-import requests
+import asyncio
+import aiohttp
 import logging
 from typing import Dict, List, Any, Optional
 from google.adk.tools.base_tool import BaseTool
 from google.adk.tools.tool_context import ToolContext
+from ..stats_api import StatsApiError, get_client
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_player_stats(tool_context: ToolContext, player_ids: List[str]) -> Dict[str, Any]:
+async def fetch_player_stats(tool_context: ToolContext, player_ids: List[str]) -> Dict[str, Any]:
     """
     Fetch basketball player statistics from the API for evaluation.
     
@@ -31,12 +33,7 @@ def fetch_player_stats(tool_context: ToolContext, player_ids: List[str]) -> Dict
         
         # API configuration
         schema = "MBB"
-        url = f"https://slam-all-python-359065791766.us-central1.run.app/MBB/tp-players/stats?schema={schema}"
-        
-        headers = {
-            'accept': 'application/json',
-            'Content-Type': 'application/json'
-        }
+        path = f"/MBB/tp-players/stats?schema={schema}"
         
         payload = {
             "player_ids": player_ids
@@ -44,11 +41,8 @@ def fetch_player_stats(tool_context: ToolContext, player_ids: List[str]) -> Dict
         
         logger.info(f"Fetching stats for {len(player_ids)} players: {player_ids}")
         
-        # Make the API request
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()  # Raises an HTTPError for bad responses
-        
-        player_stats = response.json()
+        # Make the API request over the shared connection pool
+        player_stats = await get_client().post(path, json=payload)
         
         # Store the fetched stats in the tool context state for the agent to use
         current_stats = tool_context.state.get('player_stats', {})
@@ -74,7 +68,7 @@ def fetch_player_stats(tool_context: ToolContext, player_ids: List[str]) -> Dict
             "player_count": len(player_ids)
         }
         
-    except requests.exceptions.Timeout:
+    except asyncio.TimeoutError:
         error_msg = "Request timeout - the player stats API took too long to respond"
         logger.error(error_msg)
         return {
@@ -83,7 +77,7 @@ def fetch_player_stats(tool_context: ToolContext, player_ids: List[str]) -> Dict
             "data": None
         }
         
-    except requests.exceptions.ConnectionError:
+    except aiohttp.ClientConnectionError:
         error_msg = "Connection error - unable to connect to the player stats API"
         logger.error(error_msg)
         return {
@@ -92,8 +86,8 @@ def fetch_player_stats(tool_context: ToolContext, player_ids: List[str]) -> Dict
             "data": None
         }
         
-    except requests.exceptions.HTTPError as e:
-        error_msg = f"HTTP error {e.response.status_code}: {e.response.text}"
+    except StatsApiError as e:
+        error_msg = str(e)
         logger.error(error_msg)
         return {
             "status": "error",
@@ -111,7 +105,7 @@ def fetch_player_stats(tool_context: ToolContext, player_ids: List[str]) -> Dict
         }
 
 
-def search_player_by_name(tool_context: ToolContext, player_names: List[str]) -> Dict[str, Any]:
+async def search_player_by_name(tool_context: ToolContext, player_names: List[str]) -> Dict[str, Any]:
     """
     Search for a player in the transfer portal by name to get their player ID and basic info.
     
@@ -131,12 +125,7 @@ def search_player_by_name(tool_context: ToolContext, player_names: List[str]) ->
         
         # API configuration for searching players
         schema = "MBB"
-        url = f"https://slam-all-python-359065791766.us-central1.run.app/MBB/tp-players/stats?schema={schema}"
-        
-        headers = {
-            'accept': 'application/json',
-            'Content-Type': 'application/json'
-        }
+        path = f"/MBB/tp-players/stats?schema={schema}"
         
         payload = {
             "player_ids": [],
@@ -144,9 +133,7 @@ def search_player_by_name(tool_context: ToolContext, player_names: List[str]) ->
         }
         
         
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()  # Raises an HTTPError for bad responses
-        player_stats =  response.json()
+        player_stats = await get_client().post(path, json=payload)
 
 
         # Store the search results in state for later use
@@ -157,7 +144,7 @@ def search_player_by_name(tool_context: ToolContext, player_names: List[str]) ->
         return player_stats
 
         
-    except requests.exceptions.Timeout:
+    except asyncio.TimeoutError:
         error_msg = "Request timeout - the player search API took too long to respond"
         logger.error(error_msg)
         return {
@@ -166,7 +153,7 @@ def search_player_by_name(tool_context: ToolContext, player_names: List[str]) ->
             "data": None
         }
         
-    except requests.exceptions.ConnectionError:
+    except aiohttp.ClientConnectionError:
         error_msg = "Connection error - unable to connect to the player search API"
         logger.error(error_msg)
         return {
@@ -175,8 +162,8 @@ def search_player_by_name(tool_context: ToolContext, player_names: List[str]) ->
             "data": None
         }
         
-    except requests.exceptions.HTTPError as e:
-        error_msg = f"HTTP error {e.response.status_code}: {e.response.text}"
+    except StatsApiError as e:
+        error_msg = str(e)
         logger.error(error_msg)
         return {
             "status": "error",
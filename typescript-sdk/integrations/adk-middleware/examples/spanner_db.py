@@ -0,0 +1,65 @@
+# examples/spanner_db.py
+
+"""Shared Spanner database handle for the text2sql tools.
+
+Creating a Spanner client opens gRPC channels, authenticates and creates
+sessions, which is most of the latency of a text2sql query. The tools
+therefore share one lazily created database handle per process, backed by a
+fixed-size session pool.
+
+Configuration (environment variables):
+    GOOGLE_CLOUD_PROJECT: Project of the Spanner instance
+    SPANNER_INSTANCE_ID: Spanner instance
+    SPANNER_DATABASE_ID: Spanner database
+    SPANNER_POOL_SIZE: Number of pooled sessions (default 10)
+    SPANNER_POOL_TIMEOUT: Seconds to wait for a free session (default 10)
+
+Tests can inject a fake with set_database().
+"""
+
+import os
+import threading
+from typing import Any, Optional
+
+from google.cloud import spanner
+
+_database: Optional[Any] = None
+_lock = threading.Lock()
+
+
+def get_database() -> Any:
+    """Get the process-wide Spanner database handle, creating it on first use.
+
+    Returns:
+        The shared spanner Database (or the fake set with set_database())
+    """
+    global _database
+    database = _database
+    if database is not None:
+        return database
+
+    with _lock:
+        if _database is None:
+            project_id = os.environ.get('GOOGLE_CLOUD_PROJECT', 'slamsportsai')
+            instance_id = os.environ.get('SPANNER_INSTANCE_ID', 'slam-spanner')
+            database_id = os.environ.get('SPANNER_DATABASE_ID', 'slam-db')
+            pool = spanner.FixedSizePool(
+                size=int(os.environ.get('SPANNER_POOL_SIZE', '10')),
+                default_timeout=int(os.environ.get('SPANNER_POOL_TIMEOUT', '10'))
+            )
+            client = spanner.Client(project=project_id)
+            _database = client.instance(instance_id).database(database_id, pool=pool)
+            print(f"Created shared Spanner database handle for {instance_id}/{database_id}")
+        return _database
+
+
+def set_database(database: Optional[Any]):
+    """Replace the shared database handle, e.g. with a fake in tests.
+
+    Args:
+        database: Object with a snapshot() context manager, or None to
+            create the real handle again on next use
+    """
+    global _database
+    with _lock:
+        _database = database
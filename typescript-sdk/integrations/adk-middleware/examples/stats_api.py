@@ -0,0 +1,200 @@
+# examples/stats_api.py
+
+"""Shared async HTTP client for the SLAM stats API.
+
+The stats tools used to open a new connection (TCP and TLS handshake) for
+every request, and blocked the event loop while waiting for it. They now
+share one aiohttp session per event loop, which keeps connections alive,
+limits the connections per host and retries failed requests with jittered
+backoff.
+
+Configuration (environment variables):
+    SLAM_STATS_API_URL: Base URL of the stats API
+    SLAM_STATS_API_TIMEOUT: Seconds a request may take, retries excluded (default 30)
+    SLAM_STATS_API_CONNECTIONS: Connections per host (default 20)
+
+Tests can point the tools at a local stub server:
+
+    set_client(StatsApiClient(base_url="http://127.0.0.1:8080"))
+"""
+
+import asyncio
+import json
+import os
+import random
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+import aiohttp
+
+STATS_API_URL = "https://slam-all-python-359065791766.us-central1.run.app"
+
+# Worth retrying: the service is scaling up or briefly overloaded
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class StatsApiError(Exception):
+    """Raised when the stats API answers with an error status or a body that is not JSON."""
+
+    def __init__(self, status: int, text: str):
+        super().__init__(f"HTTP error {status}: {text}")
+        self.status = status
+        self.text = text
+
+
+# Everything a request can fail with, like requests.exceptions.RequestException
+REQUEST_ERRORS = (StatsApiError, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class StatsApiClient:
+    """Keep-alive HTTP client for the stats API with retries."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        limit_per_host: Optional[int] = None,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.25
+    ):
+        """Initialize the client.
+
+        Args:
+            base_url: Base URL that request paths are appended to
+            timeout: Seconds a single attempt may take
+            limit_per_host: Number of open connections per host
+            max_retries: Retries after a connection error, timeout or retryable status
+            backoff_seconds: Base of the exponential backoff between retries
+        """
+        self.base_url = (base_url or os.environ.get('SLAM_STATS_API_URL', STATS_API_URL)).rstrip('/')
+        self._timeout = timeout or float(os.environ.get('SLAM_STATS_API_TIMEOUT', '30'))
+        self._limit_per_host = limit_per_host or int(os.environ.get('SLAM_STATS_API_CONNECTIONS', '20'))
+        self._max_retries = max_retries
+        self._backoff = backoff_seconds
+        # aiohttp sessions are bound to the event loop that created them
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            # Drop sessions of loops that have ended
+            for old_loop in [l for l in self._sessions if l.is_closed()]:
+                del self._sessions[old_loop]
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self._limit_per_host, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+                headers={'accept': 'application/json'}
+            )
+        return session
+
+    async def request(self, method: str, path: str, **kwargs) -> Any:
+        """Send a request and return the decoded JSON response.
+
+        Args:
+            method: HTTP method
+            path: Path below base_url, e.g. "/MBB/teams/"
+            **kwargs: Passed to aiohttp (json, params, ...)
+
+        Raises:
+            StatsApiError: If the API answered with an error status or a body that is not JSON
+            aiohttp.ClientConnectionError: If the API could not be reached
+            asyncio.TimeoutError: If the request timed out
+        """
+        url = f"{self.base_url}{path}"
+        attempt = 0
+        while True:
+            try:
+                async with self._get_session().request(method, url, **kwargs) as response:
+                    text = await response.text()
+                    if response.status < 400:
+                        try:
+                            return json.loads(text)
+                        except ValueError:
+                            # An HTML error page or empty body from a proxy in front of the API
+                            raise StatsApiError(response.status, text or "Response is not JSON") from None
+                    error = StatsApiError(response.status, text)
+                    if response.status not in RETRY_STATUSES or attempt >= self._max_retries:
+                        raise error
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self._max_retries:
+                    raise
+            attempt += 1
+            # Full jitter keeps retries of concurrent tool calls apart
+            await asyncio.sleep(random.uniform(0, self._backoff * 2 ** attempt))
+
+    async def get(self, path: str, **kwargs) -> Any:
+        """Send a GET request; see request()."""
+        return await self.request('GET', path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> Any:
+        """Send a POST request; see request()."""
+        return await self.request('POST', path, **kwargs)
+
+    async def close(self):
+        """Close this client's session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        if session is not None:
+            await session.close()
+
+
+_client: Optional[StatsApiClient] = None
+
+
+def get_client() -> StatsApiClient:
+    """Get the process-wide stats API client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = StatsApiClient()
+    return _client
+
+
+def set_client(client: Optional[StatsApiClient]):
+    """Replace the shared client, e.g. with one pointing at a stub server in tests.
+
+    Args:
+        client: The client to use, or None to create the default one on next use
+    """
+    global _client
+    _client = client
+
+
+async def fan_out(
+    calls: Dict[str, Awaitable[Any]],
+    timeout: Optional[float] = None
+) -> Tuple[Dict[str, Any], Dict[str, BaseException]]:
+    """Run independent API calls concurrently under one shared deadline.
+
+    A failed or late call does not affect the others; callers merge what
+    arrived and report the rest. Errors other than REQUEST_ERRORS are raised.
+
+    Args:
+        calls: Coroutines by name, e.g. {"team_stats": client.post(...)}
+        timeout: Seconds all calls together may take (None = no deadline)
+
+    Returns:
+        The results and the errors of the calls, by name; calls still running
+        at the deadline are cancelled and get an asyncio.TimeoutError
+    """
+    tasks = {name: asyncio.ensure_future(call) for name, call in calls.items()}
+    try:
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    for task in pending:
+        task.cancel()
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, BaseException] = {}
+    for name, task in tasks.items():
+        if task in pending:
+            errors[name] = asyncio.TimeoutError(f"no response within {timeout}s")
+        elif task.exception() is None:
+            results[name] = task.result()
+        elif isinstance(task.exception(), REQUEST_ERRORS):
+            errors[name] = task.exception()
+        else:
+            raise task.exception()
+    return results, errors
@@ -8,8 +8,11 @@ from typing import Optional, Dict, Any, List
 from google.adk.agents import LlmAgent
 from .tools import fetch_team_basketball_data, fetch_team_name, fetch_team_official_name
 from google.adk.tools import agent_tool
+from .reference_data import team_reference
 from ..research_agent.agent import research_agent
-import requests
+
+# Load the team list in the background now, so no model call waits for it
+team_reference.preload()
 
 def team_analysis_modifier(
     callback_context: CallbackContext, llm_request: LlmRequest
@@ -21,62 +24,9 @@ def team_analysis_modifier(
     if agent_name == "team_gap_analysis_agent":
         print("[Callback] Modifying request for team_gap_analysis_agent...")
 
-        # --- Modifier Logic: Fetch and Inject Team Abbreviation Mapping ---
-        try:
-            teams_url = "https://slam-all-python-359065791766.us-central1.run.app/MBB/teams/?skip=0&limit=800&schema=MBB"
-            
-            response = requests.get(teams_url, timeout=30)
-            response.raise_for_status()
-            # The new API returns a list directly, not a dict with 'teams' key
-            teams_data_list = response.json() 
-
-            # 2. Build the team abbreviation mapping (grouped format)
-            # We'll create a list of strings like '"Name1", "Nickname1", "FullName1": "ABBREV"'
-            mapping_entries: List[str] = []
-            for team in teams_data_list: # Iterate directly over the list
-                abbrev = team.get('Abbrev')
-                if not abbrev:
-                    continue # Skip teams without an abbreviation
-
-                names_for_team = []
-                name = team.get('Name')
-                nickname = team.get('Nickname')
-                full_name = team.get('FullName')
-
-                unique_names = set()
-                if name:
-                    unique_names.add(name)
-                if nickname: # Add nickname regardless, set will handle if it's a duplicate
-                    unique_names.add(nickname)
-                if full_name: # Add full_name regardless, set will handle if it's a duplicate
-                    unique_names.add(full_name)
-
-                # Convert set back to list for processing
-                names_for_team = list(unique_names)
-
-                # Create a single entry string for this team
-                # e.g., '"Kansas Jayhawks", "Jayhawks", "Kansas Jayhawks Jayhawks": "KU"'
-                if names_for_team:
-                    # Escape quotes in names if necessary (simple approach)
-                    escaped_names = [f'"{n}"' for n in names_for_team]
-                    names_part = ", ".join(escaped_names)
-                    mapping_entries.append(f'  {names_part}: "{abbrev}"')
-            formatted_mapping_entries = ",\n".join(mapping_entries)
-            
-            # Wrap it in curly braces for a dictionary-like structure in the prompt
-            formatted_mapping = f"{{\n{formatted_mapping_entries}\n}}"
-
-            mapping_context = (
-                f"\n\n=== TEAM NAME TO ABBREVIATION MAPPING ===\n"
-                f"Use this mapping to convert team names or nicknames to their standard abbreviations:\n"
-                f"{formatted_mapping}\n"
-                f"==========================================\n"
-            )
-
-        except Exception as e:
-            print(f"[Callback Error] Failed to fetch or build team mapping: {e}")
-            # Even if mapping fails, we can still proceed, or inject an error message
-            mapping_context = "\n\n[Error: Could not load team abbreviation mapping.]\n"
+        # --- Modifier Logic: Inject the cached Team Abbreviation Mapping ---
+        # Loaded and refreshed in the background, never fetched during a model call
+        mapping_context = team_reference.get_mapping_context()
 
         # --- Inject Context into System Instruction ---
         # Get current system instruction
@@ -0,0 +1,154 @@
+"""
+Cached team reference data shared by the team analysis callbacks and tools.
+
+The team list changes rarely, so it is loaded in a background thread at
+startup and refreshed there when it is older than the TTL. Callers always get
+the last loaded snapshot right away and never wait for a fetch, which runs
+without holding the lock; only get(wait=True) loads a missing list inline,
+for scripts that run outside the event loop.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+TEAMS_URL = "https://slam-all-python-359065791766.us-central1.run.app/MBB/teams/?skip=0&limit=800&schema=MBB"
+
+MAPPING_ERROR_CONTEXT = "\n\n[Error: Could not load team abbreviation mapping.]\n"
+
+
+class TeamReference:
+    """Snapshot of the team list with its lookup indexes and prompt fragment."""
+
+    def __init__(self, teams: List[Dict[str, Any]]):
+        self.team_names: List[str] = []
+        self.name_by_abbrev: Dict[str, str] = {}
+        mapping_entries: List[str] = []
+
+        for team in teams:
+            name = team.get('Name')
+            if name:
+                self.team_names.append(name)
+
+            abbrev = team.get('Abbrev')
+            if not abbrev:
+                continue  # Skip teams without an abbreviation
+            if name:
+                self.name_by_abbrev.setdefault(abbrev.strip().upper(), name)
+
+            # One entry per team, e.g. '"Kansas Jayhawks", "Jayhawks": "KU"'
+            unique_names = {n for n in (name, team.get('Nickname'), team.get('FullName')) if n}
+            if unique_names:
+                names_part = ", ".join(f'"{n}"' for n in unique_names)
+                mapping_entries.append(f'  {names_part}: "{abbrev}"')
+
+        formatted_mapping = "{\n" + ",\n".join(mapping_entries) + "\n}"
+        self.mapping_context = (
+            f"\n\n=== TEAM NAME TO ABBREVIATION MAPPING ===\n"
+            f"Use this mapping to convert team names or nicknames to their standard abbreviations:\n"
+            f"{formatted_mapping}\n"
+            f"==========================================\n"
+        )
+
+    def find_names(self, team: str) -> List[str]:
+        """Get the team names that start with team, or have a word that does, case-insensitively."""
+        query = team.strip().lower()
+        if not query:
+            return []
+        return [
+            name for name in self.team_names
+            if any(word.startswith(query) for word in [name.lower()] + name.lower().split())
+        ]
+
+
+class TeamReferenceCache:
+    """Loads the team list in the background and refreshes it after ttl_seconds."""
+
+    def __init__(self, url: str = TEAMS_URL, ttl_seconds: float = 3600, retry_seconds: float = 60, timeout: int = 30):
+        self._url = url
+        self._ttl = ttl_seconds
+        self._retry = retry_seconds
+        self._timeout = timeout
+        self._reference: Optional[TeamReference] = None
+        self._next_refresh = 0.0
+        # Guards the fields below; never held while fetching
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def preload(self):
+        """Start loading the team list in the background, e.g. at startup."""
+        self._start_refresh()
+
+    def get(self, wait: bool = False) -> Optional[TeamReference]:
+        """Get the current snapshot, or None if the team list could not be loaded yet.
+
+        Args:
+            wait: Load the team list inline if it was never loaded; this blocks,
+                so it must not be used on the event loop. Without it the load
+                runs in the background and None is returned meanwhile
+        """
+        if self._reference is None and wait and time.monotonic() >= self._next_refresh:
+            self._load()
+        elif time.monotonic() >= self._next_refresh:
+            self._start_refresh()
+        return self._reference
+
+    def get_mapping_context(self) -> str:
+        """Get the team name to abbreviation mapping rendered for the system prompt."""
+        reference = self.get()
+        return reference.mapping_context if reference else MAPPING_ERROR_CONTEXT
+
+    def lookup_abbrev(self, abbrev: str) -> Optional[str]:
+        """Get the team name for an abbreviation, if it is in the team list."""
+        reference = self.get()
+        return reference.name_by_abbrev.get(abbrev.strip().upper()) if reference else None
+
+    def find_names(self, team: str) -> List[str]:
+        """Get the team names matching team, or an empty list."""
+        reference = self.get()
+        return reference.find_names(team) if reference else []
+
+    def set_teams(self, teams: List[Dict[str, Any]]):
+        """Replace the team list, e.g. with fixture data in tests."""
+        reference = TeamReference(teams)
+        with self._lock:
+            self._reference = reference
+            self._next_refresh = time.monotonic() + self._ttl
+
+    def _start_refresh(self):
+        """Start a background refresh unless one is running or the snapshot is fresh."""
+        with self._lock:
+            if self._refreshing or time.monotonic() < self._next_refresh:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="team-reference-refresh", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            self._load()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _load(self):
+        """Fetch the team list and swap in the new snapshot. Keeps the old snapshot on failure."""
+        try:
+            response = requests.get(self._url, timeout=self._timeout)
+            response.raise_for_status()
+            # The API returns a list directly, not a dict with 'teams' key
+            reference = TeamReference(response.json())
+        except Exception as e:
+            with self._lock:
+                self._next_refresh = time.monotonic() + self._retry
+            print(f"✗ Failed to load team reference data: {e}")
+            return
+
+        with self._lock:
+            self._reference = reference
+            self._next_refresh = time.monotonic() + self._ttl
+        print(f"✓ Loaded {len(reference.team_names)} teams into the team reference cache")
+
+
+team_reference = TeamReferenceCache()
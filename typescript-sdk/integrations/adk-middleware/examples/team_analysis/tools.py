@@ -1,10 +1,12 @@
-import requests
+import asyncio
 import json
 from typing import Dict, List, Optional, Any
 import time
 from .hardcoded_output import PENN_STATE_OUTPUT
+from .reference_data import team_reference
+from ..stats_api import REQUEST_ERRORS, StatsApiError, fan_out, get_client
 
-def fetch_team_official_name(abbrev: str) -> Dict[str, Any]:
+async def fetch_team_official_name(abbrev: str) -> Dict[str, Any]:
     """
     Fetches the official team name using a team abbreviation via POST request.
     
@@ -20,25 +22,24 @@ def fetch_team_official_name(abbrev: str) -> Dict[str, Any]:
         if not abbrev:
             return {"error": "No abbreviation provided.", "team_name": ""}
 
-        url = "https://slam-all-python-359065791766.us-central1.run.app/MBB/team-stats-mia/get-team-by-abbrev?schema=MBB"
-
-        response = requests.post(
-            url,
-            headers={
-                "accept": "application/json",
-                "Content-Type": "application/json"
-            },
-            json={"abbrev": abbrev},
-            timeout=30
-        )
-
-        if response.status_code != 200:
+        try:
+            data = await get_client().post(
+                "/MBB/team-stats-mia/get-team-by-abbrev?schema=MBB",
+                json={"abbrev": abbrev}
+            )
+        except StatsApiError as e:
+            # The cached team list is a different dataset, so it only stands in when the API fails
+            team_name = team_reference.lookup_abbrev(abbrev)
+            if team_name:
+                return {
+                    "team_name": team_name,
+                    "abbrev": abbrev
+                }
             return {
-                "error": f"API error: {response.status_code}", 
+                "error": f"API error: {e.status}", 
                 "team_name": ""
             }
 
-        data = response.json()
         team_name = data.get("team_name", "").strip()
 
         if not team_name:
@@ -55,7 +56,7 @@ def fetch_team_official_name(abbrev: str) -> Dict[str, Any]:
             "team_name": ""
         }
 
-def fetch_team_name(team: str):
+async def fetch_team_name(team: str):
     """
     Fetch exact team name matches from the API endpoint.
     
@@ -65,14 +66,6 @@ def fetch_team_name(team: str):
     Returns:
         List[str]: List of the exact name of the team (e.g., ('Penn','Penn State') for team 'Penn')
     """
-    base_url: str = "https://slam-all-python-359065791766.us-central1.run.app/MBB/team-stats-mia/similar"
-    timeout: int = 30
-    
-    headers = {
-        'accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
     try:
         # Prepare request body
         body = {
@@ -81,14 +74,7 @@ def fetch_team_name(team: str):
         
         # Fetch team name
         print(f"Fetching exact team name for {team}...")
-        response = requests.post(
-            base_url,
-            headers=headers,
-            json=body,
-            timeout=timeout
-        )
-        response.raise_for_status()
-        data = response.json()
+        data = await get_client().post("/MBB/team-stats-mia/similar", json=body)
         if data.get('total', 0) > 0 and len(data.get('data', [])) > 0:
             teams = [team_info['team'] for team_info in  data['data']]
             print(f"✓ Team name fetched successfully: {teams}")
@@ -97,12 +83,17 @@ def fetch_team_name(team: str):
             print("✗ No team data found in the response")
             return "No team data found"
             
-    except requests.exceptions.RequestException as e:
+    except REQUEST_ERRORS as e:
         error_msg = f"Error fetching team name: {str(e)}"
         print(f"✗ {error_msg}")
+        # The cached team list matches names differently, so it only stands in when the API fails
+        teams = team_reference.find_names(team)
+        if teams:
+            print(f"✓ Team name found in reference data: {teams}")
+            return teams
         return ""
 
-def fetch_team_basketball_data(team_name: str) -> Dict[str, Any]:
+async def fetch_team_basketball_data(team_name: str) -> Dict[str, Any]:
     """
     Fetch combined basketball data for a team including team stats and player stats.
     
@@ -112,14 +103,7 @@ def fetch_team_basketball_data(team_name: str) -> Dict[str, Any]:
     Returns:
         Dict containing combined team stats and player stats data
     """
-    base_url: str = "https://slam-all-python-359065791766.us-central1.run.app/MBB"
-    timeout: int = 30
-    schema: str = "MBB"
-    
-    headers = {
-        'accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
+    timeout: float = 30  # Shared by both requests
     
     combined_data = {
         'team_stats': None,
@@ -131,63 +115,41 @@ def fetch_team_basketball_data(team_name: str) -> Dict[str, Any]:
         }
     }
     
-    try:
-        # 1. Fetch team stats
-        print(f"Fetching team stats for {team_name}...")
-        team_stats_url = f"{base_url}/team-stats-mia/search-by-teams"
-        team_stats_body = {
-            "teams": [team_name]
-        }
-        
-        team_stats_response = requests.post(
-            team_stats_url,
-            headers=headers,
-            json=team_stats_body,
-            timeout=timeout
-        )
-        team_stats_response.raise_for_status()
-        
-        team_stats_data = team_stats_response.json()
+    # Both requests are independent, so they run concurrently under one deadline
+    print(f"Fetching team stats and player stats for {team_name}...")
+    client = get_client()
+    results, errors = await fan_out({
+        'team_stats': client.post("/MBB/team-stats-mia/search-by-teams", json={"teams": [team_name]}),
+        'player_stats': client.post("/MBB/official-roasters/search", json={"team_name": team_name}),
+    }, timeout=timeout)
+    
+    # 1. Team stats
+    if 'team_stats' in errors:
+        error_msg = f"Error fetching team stats: {str(errors['team_stats'])}"
+        combined_data['api_status']['errors'].append(error_msg)
+        print(f"✗ {error_msg}")
+    else:
+        team_stats_data = results['team_stats']
         if team_stats_data.get('total', 0) > 0 and len(team_stats_data.get('data', [])) > 0:
             combined_data['team_stats'] = team_stats_data['data'][0]
             combined_data['api_status']['team_stats_success'] = True
             print(f"✓ Team stats fetched successfully")
         else:
             print(f"✗ No team stats found for {team_name}")
-            
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Error fetching team stats: {str(e)}"
+    
+    # 2. Player stats
+    if 'player_stats' in errors:
+        error_msg = f"Error fetching player stats: {str(errors['player_stats'])}"
         combined_data['api_status']['errors'].append(error_msg)
         print(f"✗ {error_msg}")
-    
-    try:
-        # 2. Fetch player stats
-        print(f"Fetching player stats for {team_name}...")
-        player_stats_url = f"{base_url}/official-roasters/search"
-        player_stats_body = {
-            "team_name": team_name
-        }
-        
-        player_stats_response = requests.post(
-            player_stats_url,
-            headers=headers,
-            json=player_stats_body,
-            timeout=timeout
-        )
-        player_stats_response.raise_for_status()
-        
-        player_stats_data = player_stats_response.json()
+    else:
+        player_stats_data = results['player_stats']
         if player_stats_data.get('total_players', 0) > 0 and player_stats_data.get('data'):
             combined_data['player_stats'] = player_stats_data['data']
             combined_data['api_status']['player_stats_success'] = True
             print(f"✓ Player stats fetched successfully ({len(player_stats_data['data'])} players)")
         else:
             print(f"✗ No player stats found for {team_name}")
-            
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Error fetching player stats: {str(e)}"
-        combined_data['api_status']['errors'].append(error_msg)
-        print(f"✗ {error_msg}")
     
     # Special handling for Penn State - add hardcoded player data
     if team_name.lower() == "penn state":
@@ -265,7 +227,7 @@ if __name__ == "__main__":
     if team_name:
         # Test fetch_team_basketball_data with the exact team name
         print("\n=== Fetching Team Basketball Data ===")
-        data = fetch_team_basketball_data(team_name)
+        data = asyncio.run(fetch_team_basketball_data(team_name))
         print("\n=== Summary ===")
         print('data==>', data)
     
@@ -2,7 +2,7 @@ from typing import List, Optional, Dict, Any
 from google.adk.tools import ToolContext
 from urllib.parse import quote
 import requests
-from google.cloud import spanner
+from ..spanner_db import get_database
 import re
 import traceback
 import os
@@ -83,20 +83,13 @@ def text2sql_query_transfer_portal(
     print(f'-------------text2sql_query_transfer_portal---------------')
     print(f'Executing SQL Query: {sql_query}')
     
-    # Initialize Spanner client
-    instance_id = os.environ.get('SPANNER_INSTANCE_ID','slam-spanner')
-    database_id = os.environ.get('SPANNER_DATABASE_ID','slam-db')
-    project_id = os.environ.get('GOOGLE_CLOUD_PROJECT','slamsportsai')  # Replace with your actual project ID
-    
     max_retries = 3
     current_retry = 0
     
     while current_retry < max_retries:
         try:
-            # Create Spanner client
-            spanner_client = spanner.Client(project=project_id)
-            instance = spanner_client.instance(instance_id)
-            database = instance.database(database_id)
+            # Shared database handle; sessions come from its pool
+            database = get_database()
             
             # Modify query to ensure max 50 records to prevent model overflow
             modified_query = sql_query
@@ -47,6 +47,7 @@ setup(
             "pytest>=7.0",
             "pytest-asyncio>=0.21",
             "pytest-cov>=4.0",
+            "aiohttp>=3.9",
             "black>=23.0",
             "isort>=5.12",
             "flake8>=6.0",
@@ -9,8 +9,10 @@ from .adk_agent import ADKAgent
 from .agent_registry import AgentRegistry
 from .event_translator import EventTranslator
 from .session_manager import SessionManager
+from .execution_registry import ExecutionRegistry, InMemoryExecutionRegistry, SQLExecutionRegistry
 from .endpoint import add_adk_fastapi_endpoint, create_adk_app
 
-__all__ = ['ADKAgent', 'AgentRegistry', 'add_adk_fastapi_endpoint', 'create_adk_app','EventTranslator','SessionManager']
+__all__ = ['ADKAgent', 'AgentRegistry', 'add_adk_fastapi_endpoint', 'create_adk_app','EventTranslator','SessionManager',
+           'ExecutionRegistry', 'InMemoryExecutionRegistry', 'SQLExecutionRegistry']
 
 __version__ = "0.1.0"
\ No newline at end of file
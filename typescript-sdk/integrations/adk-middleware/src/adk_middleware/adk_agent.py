@@ -2,9 +2,15 @@
 
 """Main ADKAgent implementation for bridging AG-UI Protocol with Google ADK."""
 
-from typing import Optional, Dict, Callable, Any, AsyncGenerator, List
+from typing import Optional, Dict, Callable, Any, AsyncGenerator, List, Set, Tuple, FrozenSet, Union
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import hashlib
+import os
+import socket
 import time
 import json
+import uuid
 import asyncio
 from datetime import datetime
 
@@ -13,7 +19,8 @@ from ag_ui.core import (
     RunStartedEvent, RunFinishedEvent, RunErrorEvent,
     TextMessageStartEvent, TextMessageContentEvent, TextMessageEndEvent,
     StateSnapshotEvent, StateDeltaEvent,
-    Context, ToolMessage, ToolCallEndEvent, SystemMessage,ToolCallResultEvent
+    Context, ToolMessage, ToolCallEndEvent, SystemMessage,ToolCallResultEvent,
+    BoundedEventQueue, EventQueueOverflow, OverflowPolicy
 )
 
 from google.adk import Runner
@@ -30,7 +37,11 @@ from .agent_registry import AgentRegistry
 from .event_translator import EventTranslator
 from .session_manager import SessionManager
 from .execution_state import ExecutionState
+from .replay_buffer import ReplayBuffer, FollowerFellBehind
+from .execution_scheduler import ExecutionScheduler, ExecutionRejected
+from .execution_registry import ExecutionRegistry, InMemoryExecutionRegistry, HashRing
 from .client_proxy_toolset import ClientProxyToolset
+from .tool_executor import ToolExecutor, ToolTimeoutError
 
 import logging
 logger = logging.getLogger(__name__)
@@ -67,11 +78,36 @@ class ADKAgent:
         
         # Tool configuration
         execution_timeout_seconds: int = 600,  # 10 minutes
-        tool_timeout_seconds: int = 300,  # 5 minutes
+        tool_timeout_seconds: Optional[float] = 300,  # 5 minutes
         max_concurrent_executions: int = 10,
+        tool_thread_pool_size: int = 8,
+        max_concurrent_tool_calls: Optional[Dict[str, int]] = None,
+        
+        # Admission configuration
+        max_queued_executions: int = 100,
+        max_concurrent_executions_per_user: Optional[int] = None,
+        max_concurrent_executions_per_agent: Optional[Dict[str, int]] = None,
+        execution_queue_timeout_seconds: float = 30,
+        priority_extractor: Optional[Callable[[RunAgentInput], int]] = None,
+        
+        # Multi-worker configuration
+        execution_registry: Optional[ExecutionRegistry] = None,
+        worker_id: Optional[str] = None,
         
         # Session cleanup configuration
-        cleanup_interval_seconds: int = 300  # 5 minutes default
+        cleanup_interval_seconds: int = 300,  # 5 minutes default
+        
+        # Stream resumption configuration
+        replay_buffer_size: int = 1024,
+        replay_retention_seconds: int = 60,
+        
+        # Backpressure configuration
+        event_queue_size: int = 1000,
+        event_queue_policy: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        
+        # Agent preparation configuration
+        prepared_agent_cache_size: int = 64,
+        runner_pool_size: int = 32
     ):
         """Initialize the ADKAgent.
         
@@ -86,8 +122,30 @@ class ADKAgent:
             run_config_factory: Function to create RunConfig per request
             use_in_memory_services: Use in-memory implementations for unspecified services
             execution_timeout_seconds: Timeout for entire execution
-            tool_timeout_seconds: Timeout for individual tool calls
+            tool_timeout_seconds: Timeout for individual backend and client proxy tool calls (None = no limit);
+                a call that times out ends the run with a TOOL_TIMEOUT error
             max_concurrent_executions: Maximum concurrent background executions
+            tool_thread_pool_size: Number of threads running synchronous backend tools, which
+                would otherwise block the event loop (0 = call them on the event loop)
+            max_concurrent_tool_calls: Maximum concurrent calls per synchronous backend tool name
+                (tools not listed share the whole pool)
+            max_queued_executions: Maximum number of runs waiting for an execution slot
+            max_concurrent_executions_per_user: Maximum concurrent executions of a single user (None = no limit)
+            max_concurrent_executions_per_agent: Maximum concurrent executions per agent ID, for an
+                ADKAgent serving several endpoints (agent IDs not listed share the global limit)
+            execution_queue_timeout_seconds: How long a run waits for an execution slot before it fails
+            priority_extractor: Function returning the priority class of a run (higher runs first);
+                by default tool result submissions are served before new conversations
+            execution_registry: Registry shared by all worker processes serving the agent, so
+                that any worker can continue a thread (default: in-memory, single process)
+            worker_id: ID of this worker in the registry (default: "<hostname>:<pid>")
+            replay_buffer_size: Number of recent events kept per run for Last-Event-ID replay
+            replay_retention_seconds: How long a finished run can still be resumed
+            event_queue_size: Maximum number of events buffered per run for a slow client
+            event_queue_policy: What to do when the buffer is full: "block" the run,
+                "coalesce" content deltas, or "drop" the events and end the stream with RUN_ERROR
+            prepared_agent_cache_size: Number of agent copies prepared for a SystemMessage/tool set to keep (0 = disabled)
+            runner_pool_size: Number of ADK Runners kept for reuse across runs (0 = disabled)
         """
         if app_name and app_name_extractor:
             raise ValueError("Cannot specify both 'app_name' and 'app_name_extractor'")
@@ -115,6 +173,13 @@ class ADKAgent:
             self._credential_service = credential_service
         
         
+        # Cross-worker coordination: where sessions live and which worker runs a thread
+        self._registry = execution_registry or InMemoryExecutionRegistry()
+        self._worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._worker_ttl = 30  # Seconds a worker counts as alive after its last heartbeat
+        self._last_heartbeat: Optional[float] = None
+        self._hash_ring = HashRing()
+        
         # Session lifecycle management - use singleton
         # Initialize with session service based on use_in_memory_services
         if use_in_memory_services:
@@ -129,7 +194,9 @@ class ADKAgent:
             session_timeout_seconds=session_timeout_seconds,  # 20 minutes default
             cleanup_interval_seconds=cleanup_interval_seconds,
             max_sessions_per_user=None,    # No limit by default
-            auto_cleanup=True              # Enable by default
+            auto_cleanup=True,             # Enable by default
+            # Other workers only need to see sessions through a shared registry
+            registry=self._registry if self._registry.shared else None
         )
         
         # Tool execution tracking
@@ -137,7 +204,54 @@ class ADKAgent:
         self._execution_timeout = execution_timeout_seconds
         self._tool_timeout = tool_timeout_seconds
         self._max_concurrent = max_concurrent_executions
-        self._execution_lock = asyncio.Lock()
+        # Per-thread locks serialize starting runs of one thread without blocking
+        # other threads: thread_id -> [lock, number of holders and waiters]
+        self._thread_locks: Dict[str, list] = {}
+        self._priority_extractor = priority_extractor or self._default_priority
+        self._execution_queue_timeout = execution_queue_timeout_seconds
+        self._scheduler = ExecutionScheduler(
+            max_concurrent=max_concurrent_executions,
+            max_queued=max_queued_executions,
+            max_concurrent_per_user=max_concurrent_executions_per_user,
+            queue_timeout_seconds=execution_queue_timeout_seconds,
+            max_concurrent_per_agent=max_concurrent_executions_per_agent
+        )
+        
+        # Stream resumption: runs keep producing events into a replay buffer
+        # even if the client disconnects, so a reconnect can pick up where it left off
+        self._replay_buffers: Dict[str, ReplayBuffer] = {}
+        self._replay_buffer_size = replay_buffer_size
+        self._replay_retention = replay_retention_seconds
+        self._run_tasks: Set[asyncio.Task] = set()
+        
+        # Bounded per-run event queues; counters are accumulated as runs finish
+        self._event_queue_size = event_queue_size
+        self._event_queue_policy = OverflowPolicy(event_queue_policy)
+        self._event_queue_stats = {"high_water_mark": 0, "coalesced": 0, "dropped": 0, "overflows": 0}
+        
+        # LRU of agent copies prepared for a SystemMessage and frontend tool set:
+        # (agent_id, system hash, tool names) -> (source agent, prepared agent, proxy tool names)
+        self._prepared_agents: OrderedDict = OrderedDict()
+        self._prepared_agent_cache_size = prepared_agent_cache_size
+        self._prepared_agents_generation = -1
+        
+        # Backend function tools run within tool_timeout_seconds, synchronous ones on a
+        # bounded thread pool; agent trees are copied once with their tools wrapped:
+        # agent_id -> (registered agent, guarded copy)
+        self._tool_executor = ToolExecutor(
+            max_workers=tool_thread_pool_size,
+            timeout_seconds=tool_timeout_seconds,
+            max_concurrent_per_tool=max_concurrent_tool_calls
+        )
+        self._guarded_agents: OrderedDict = OrderedDict()
+        self._guarded_agents_generation = -1
+        
+        # LRU of Runners reused across runs: (app_name, id(agent)) -> (agent, runner)
+        self._runner_pool: OrderedDict = OrderedDict()
+        self._runner_pool_size = runner_pool_size
+        self._runner_pool_hits = 0
+        self._runner_pool_misses = 0
+        self._runner_pool_evictions = 0
         
         # Event translator will be created per-session for thread safety
         
@@ -220,29 +334,17 @@ class ADKAgent:
     async def _remove_pending_tool_call(self, session_id: str, tool_call_id: str):
         """Remove a tool call from the session's pending list.
         
-        Uses session properties to find the session without needing explicit app_name/user_id.
+        Uses the session index to find the session without needing explicit app_name/user_id.
         
         Args:
             session_id: The session ID (thread_id)
             tool_call_id: The tool call ID to remove
         """
         try:
-            # Search through tracked sessions to find this session_id
-            session_key = None
-            user_id = None
-            app_name = None
-            
-            for uid, keys in self._session_manager._user_sessions.items():
-                for key in keys:
-                    if key.endswith(f":{session_id}"):
-                        session_key = key
-                        user_id = uid
-                        app_name = key.split(':', 1)[0]
-                        break
-                if session_key:
-                    break
+            location = await self._session_manager.locate_session(session_id)
             
-            if session_key and user_id and app_name:
+            if location:
+                app_name, user_id = location
                 # Get current pending calls using SessionManager
                 pending_calls = await self._session_manager.get_state_value(
                     session_id=session_id,
@@ -280,21 +382,19 @@ class ADKAgent:
             True if session has pending tool calls
         """
         try:
-            # Search through tracked sessions to find this session_id
-            for uid, keys in self._session_manager._user_sessions.items():
-                for key in keys:
-                    if key.endswith(f":{session_id}"):
-                        app_name = key.split(':', 1)[0]
-                        
-                        # Get pending calls using SessionManager
-                        pending_calls = await self._session_manager.get_state_value(
-                            session_id=session_id,
-                            app_name=app_name,
-                            user_id=uid,
-                            key="pending_tool_calls",
-                            default=[]
-                        )
-                        return len(pending_calls) > 0
+            location = await self._session_manager.locate_session(session_id)
+            if location:
+                app_name, user_id = location
+                
+                # Get pending calls using SessionManager
+                pending_calls = await self._session_manager.get_state_value(
+                    session_id=session_id,
+                    app_name=app_name,
+                    user_id=user_id,
+                    key="pending_tool_calls",
+                    default=[]
+                )
+                return len(pending_calls) > 0
         except Exception as e:
             logger.error(f"Failed to check pending tool calls for session {session_id}: {e}")
         
@@ -323,16 +423,187 @@ class ADKAgent:
             credential_service=self._credential_service
         )
     
-    async def run(self, input: RunAgentInput, agent_id: str = "default") -> AsyncGenerator[BaseEvent, None]:
+    def _get_pooled_runner(self, agent_id: str, adk_agent: ADKBaseAgent, user_id: str, app_name: str) -> Runner:
+        """Get a Runner for the agent from the pool, creating one on a miss.
+        
+        Runners hold no per-run state, so one Runner serves every run of the
+        same (app_name, agent) pair, including concurrent ones.
+        """
+        if self._runner_pool_size <= 0:
+            self._runner_pool_misses += 1
+            return self._create_runner(agent_id, adk_agent, user_id, app_name)
+        
+        key = (app_name, id(adk_agent))
+        pooled = self._runner_pool.get(key)
+        # The identity check guards against id() reuse after an agent was collected
+        if pooled is not None and pooled[0] is adk_agent:
+            self._runner_pool.move_to_end(key)
+            self._runner_pool_hits += 1
+            return pooled[1]
+        
+        self._runner_pool_misses += 1
+        runner = self._create_runner(agent_id, adk_agent, user_id, app_name)
+        self._runner_pool[key] = (adk_agent, runner)
+        self._runner_pool.move_to_end(key)
+        if len(self._runner_pool) > self._runner_pool_size:
+            self._runner_pool.popitem(last=False)
+            self._runner_pool_evictions += 1
+        return runner
+    
+    def get_runner_pool_stats(self) -> Dict[str, int]:
+        """Get runner pool metrics.
+        
+        Returns:
+            Dictionary with the pool size and hit, miss and eviction counts
+        """
+        return {
+            "size": len(self._runner_pool),
+            "hits": self._runner_pool_hits,
+            "misses": self._runner_pool_misses,
+            "evictions": self._runner_pool_evictions,
+        }
+    
+    async def run(
+        self,
+        input: RunAgentInput,
+        agent_id: str = "default",
+        last_event_id: Optional[int] = None
+    ) -> AsyncGenerator[BaseEvent, None]:
         """Run the ADK agent with client-side tool support.
         
         All client-side tools are long-running. For tool result submissions,
         we continue existing executions. For new requests, we start new executions.
         ADK sessions handle conversation continuity and tool result processing.
         
+        The run is driven by a background task that records every event in a
+        replay buffer, so it keeps going if the client disconnects. The n-th
+        event of a run has sequence id n; passing the id of the last received
+        event as last_event_id reattaches to the same run (matched by thread_id
+        and run_id) and replays the events after it without rerunning the agent.
+        
         Args:
             input: The AG-UI run input
             agent_id: The agent ID to use (defaults to "default")
+            last_event_id: Sequence id of the last event the client received
+            
+        Yields:
+            AG-UI protocol events
+        """
+        if last_event_id is not None:
+            async for event in self._resume_run(input, last_event_id):
+                yield event
+            return
+        
+        buffer = self._open_replay_buffer(input)
+        task = asyncio.create_task(self._record_run(input, agent_id, buffer))
+        self._run_tasks.add(task)
+        task.add_done_callback(self._run_tasks.discard)
+        
+        follower = buffer.follow()
+        try:
+            async for _, event in follower:
+                yield event
+        except FollowerFellBehind as e:
+            logger.warning(f"Client fell behind run {input.run_id}: {e}")
+            yield self._slow_consumer_error()
+            return
+        finally:
+            await follower.aclose()
+        if buffer.error is not None:
+            raise buffer.error
+    
+    def _slow_consumer_error(self) -> RunErrorEvent:
+        """Create the RUN_ERROR ending the stream of a client that fell behind its run."""
+        return RunErrorEvent(
+            type=EventType.RUN_ERROR,
+            message="Event queue overflowed: the client is not reading events fast enough",
+            code="SLOW_CONSUMER"
+        )
+    
+    def _open_replay_buffer(self, input: RunAgentInput) -> ReplayBuffer:
+        """Create the replay buffer of a new run, dropping expired ones.
+        
+        Args:
+            input: The run input
+            
+        Returns:
+            The replay buffer registered for the run's thread
+        """
+        expired = [
+            thread_id for thread_id, buffer in self._replay_buffers.items()
+            if buffer.is_expired(self._replay_retention)
+        ]
+        for thread_id in expired:
+            del self._replay_buffers[thread_id]
+        
+        buffer = ReplayBuffer(
+            input.thread_id,
+            input.run_id,
+            max_events=self._replay_buffer_size,
+            backpressure=self._event_queue_policy != OverflowPolicy.DROP
+        )
+        self._replay_buffers[input.thread_id] = buffer
+        return buffer
+    
+    async def _record_run(self, input: RunAgentInput, agent_id: str, buffer: ReplayBuffer):
+        """Drive a run to completion, recording its events in the replay buffer.
+        
+        Args:
+            input: The run input
+            agent_id: The agent ID to use
+            buffer: The replay buffer of the run
+        """
+        error = None
+        try:
+            async for event in self._run_events(input, agent_id):
+                await buffer.append(event)
+        except Exception as e:
+            logger.error(f"Run {input.run_id} failed: {e}", exc_info=True)
+            error = e
+        finally:
+            await buffer.close(error)
+    
+    async def _resume_run(self, input: RunAgentInput, last_event_id: int) -> AsyncGenerator[BaseEvent, None]:
+        """Replay the events of a run after last_event_id, then follow it live.
+        
+        Args:
+            input: The run input identifying the run by thread_id and run_id
+            last_event_id: Sequence id of the last event the client received
+            
+        Yields:
+            AG-UI events the client has not received yet
+        """
+        buffer = self._replay_buffers.get(input.thread_id)
+        if buffer is None or buffer.run_id != input.run_id:
+            logger.warning(f"Cannot resume run {input.run_id} for thread {input.thread_id}: no replay buffer")
+            yield RunErrorEvent(
+                type=EventType.RUN_ERROR,
+                message=f"Run {input.run_id} can no longer be resumed",
+                code="RUN_NOT_RESUMABLE"
+            )
+            return
+        
+        logger.info(f"Resuming run {input.run_id} for thread {input.thread_id} after event {last_event_id}")
+        try:
+            async for _, event in buffer.follow(last_event_id):
+                yield event
+        except FollowerFellBehind as e:
+            logger.warning(f"Client fell behind resumed run {input.run_id}: {e}")
+            yield self._slow_consumer_error()
+        except ValueError as e:
+            logger.warning(f"Cannot resume run {input.run_id}: {e}")
+            yield RunErrorEvent(
+                type=EventType.RUN_ERROR,
+                message=str(e),
+                code="REPLAY_UNAVAILABLE"
+            )
+    
+    async def _run_events(self, input: RunAgentInput, agent_id: str) -> AsyncGenerator[BaseEvent, None]:
+        """Produce the events of a run.
+        
+        Args:
+            input: The AG-UI run input
+            agent_id: The agent ID to use
             
         Yields:
             AG-UI protocol events
@@ -379,6 +650,19 @@ class ADKAgent:
         return None
     
     
+    def _default_priority(self, input: RunAgentInput) -> int:
+        """Serve tool result submissions first: a user is waiting on a paused run."""
+        return 1 if self._is_tool_result_submission(input) else 0
+    
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Get admission metrics of the execution scheduler.
+        
+        Returns:
+            Dictionary with running (also per agent ID) and waiting executions,
+            admission counters and queue-time statistics
+        """
+        return self._scheduler.get_stats()
+    
     def _is_tool_result_submission(self, input: RunAgentInput) -> bool:
         """Check if this request contains tool results.
         
@@ -422,7 +706,12 @@ class ADKAgent:
             )
             return
         
+        app_name = None
         try:
+            # Serve the pending tool call bookkeeping from one session read
+            app_name = self._get_app_name(input)
+            self._session_manager.begin_state_batch(thread_id, app_name, self._get_user_id(input))
+            
             # Check if tool result matches any pending tool calls for better debugging
             for tool_result in tool_results:
                 tool_call_id = tool_result['message'].tool_call_id
@@ -451,6 +740,9 @@ class ADKAgent:
                 message=f"Failed to process tool results: {str(e)}",
                 code="TOOL_RESULT_PROCESSING_ERROR"
             )
+        finally:
+            if app_name is not None:
+                await self._session_manager.end_state_batch(thread_id, app_name)
     
     async def _extract_tool_results(self, input: RunAgentInput) -> List[Dict]:
         """Extract tool messages with their names from input.
@@ -497,6 +789,10 @@ class ADKAgent:
     ) -> AsyncGenerator[BaseEvent, None]:
         """Stream events from execution queue.
         
+        Queued events are drained without waiting. When the queue is empty the
+        stream waits for whichever comes first: the next event, the background
+        task finishing, or the execution deadline (one timer per execution).
+        
         Args:
             execution: The execution state
             
@@ -504,18 +800,50 @@ class ADKAgent:
             AG-UI events from the queue
         """
         logger.debug(f"Starting _stream_events for thread {execution.thread_id}, queue ID: {id(execution.event_queue)}")
+        loop = asyncio.get_running_loop()
+        queue = execution.event_queue
         event_count = 0
-        timeout_count = 0
         
-        while True:
-            try:
-                logger.debug(f"Waiting for event from queue (thread {execution.thread_id}, queue size: {execution.event_queue.qsize()})")
+        # Single deadline for the whole execution instead of a timeout per wait
+        remaining = execution.start_time + self._execution_timeout - time.time()
+        deadline = loop.create_future()
+        deadline_handle = loop.call_later(max(remaining, 0), deadline.set_result, None)
+        getter: Optional[asyncio.Future] = None
+        
+        try:
+            while True:
+                if getter is None:
+                    if not queue.empty():
+                        event = queue.get_nowait()
+                    elif execution.task.done():
+                        # Task completed but didn't send None
+                        self._log_task_completion(execution)
+                        break
+                    else:
+                        getter = asyncio.ensure_future(queue.get())
                 
-                # Wait for event with timeout
-                event = await asyncio.wait_for(
-                    execution.event_queue.get(),
-                    timeout=1.0  # Check every second
-                )
+                if getter is not None:
+                    if not getter.done():
+                        logger.debug(f"Waiting for event from queue (thread {execution.thread_id})")
+                        await asyncio.wait(
+                            (getter, execution.task, deadline),
+                            return_when=asyncio.FIRST_COMPLETED
+                        )
+                    if getter.done():
+                        event = getter.result()
+                        getter = None
+                    elif deadline.done():
+                        logger.error(f"Execution timed out for thread {execution.thread_id}")
+                        yield RunErrorEvent(
+                            type=EventType.RUN_ERROR,
+                            message="Execution timed out",
+                            code="EXECUTION_TIMEOUT"
+                        )
+                        break
+                    else:
+                        # The producer finished and the queue is empty
+                        self._log_task_completion(execution)
+                        break
                 
                 event_count += 1
                 logger.debug(f"Got event #{event_count} from queue: {type(event).__name__ if event else 'None'} (thread {execution.thread_id})")
@@ -528,39 +856,20 @@ class ADKAgent:
                 
                 logger.debug(f"Streaming event #{event_count}: {type(event).__name__} (thread {execution.thread_id})")
                 yield event
-                
-            except asyncio.TimeoutError:
-                timeout_count += 1
-                logger.debug(f"Timeout #{timeout_count} waiting for events (thread {execution.thread_id}, task done: {execution.task.done()}, queue size: {execution.event_queue.qsize()})")
-                
-                # Check if execution is stale
-                if execution.is_stale(self._execution_timeout):
-                    logger.error(f"Execution timed out for thread {execution.thread_id}")
-                    yield RunErrorEvent(
-                        type=EventType.RUN_ERROR,
-                        message="Execution timed out",
-                        code="EXECUTION_TIMEOUT"
-                    )
-                    break
-                
-                # Check if task is done
-                if execution.task.done():
-                    # Task completed but didn't send None
-                    execution.is_complete = True
-                    try:
-                        task_result = execution.task.result()
-                        logger.debug(f"Task completed with result: {task_result} (thread {execution.thread_id})")
-                    except Exception as e:
-                        logger.debug(f"Task completed with exception: {e} (thread {execution.thread_id})")
-                    
-                    # Wait a bit more in case there are events still coming
-                    logger.debug(f"Task done but no None signal - checking queue one more time (thread {execution.thread_id}, queue size: {execution.event_queue.qsize()})")
-                    if execution.event_queue.qsize() > 0:
-                        logger.debug(f"Found {execution.event_queue.qsize()} events in queue after task completion, continuing...")
-                        continue
-                    
-                    logger.debug(f"Task completed without sending None signal (thread {execution.thread_id})")
-                    break
+        finally:
+            deadline_handle.cancel()
+            if getter is not None and not getter.done():
+                getter.cancel()
+    
+    def _log_task_completion(self, execution: ExecutionState):
+        """Mark an execution whose task ended without a completion signal as complete."""
+        execution.is_complete = True
+        try:
+            task_result = execution.task.result()
+            logger.debug(f"Task completed with result: {task_result} (thread {execution.thread_id})")
+        except BaseException as e:
+            logger.debug(f"Task completed with exception: {e!r} (thread {execution.thread_id})")
+        logger.debug(f"Task completed without sending None signal (thread {execution.thread_id})")
     
     async def _start_new_execution(
         self, 
@@ -575,6 +884,10 @@ class ADKAgent:
         Yields:
             AG-UI events from the execution
         """
+        app_name = None
+        slot_user_id = None
+        thread_claimed = False
+        execution = None
         try:
             # Emit RUN_STARTED
             logger.debug(f"Emitting RUN_STARTED for thread {input.thread_id}, run {input.run_id}")
@@ -584,35 +897,39 @@ class ADKAgent:
                 run_id=input.run_id
             )
             
-            # Check concurrent execution limit
-            async with self._execution_lock:
-                if len(self._active_executions) >= self._max_concurrent:
-                    # Clean up stale executions
-                    await self._cleanup_stale_executions()
-                    
-                    if len(self._active_executions) >= self._max_concurrent:
-                        raise RuntimeError(
-                            f"Maximum concurrent executions ({self._max_concurrent}) reached"
-                        )
-                
+            # Cache session state for this run; writes go out at the tool pause / run end
+            app_name = self._get_app_name(input)
+            user_id = self._get_user_id(input)
+            self._session_manager.begin_state_batch(input.thread_id, app_name, user_id)
+            
+            if len(self._active_executions) >= self._max_concurrent:
+                # Clean up stale executions
+                await self._cleanup_stale_executions()
+            
+            # Only runs of the same thread wait for each other here
+            async with self._thread_lock(input.thread_id):
                 # Check if there's an existing execution for this thread
                 existing_execution = self._active_executions.get(input.thread_id)
                 if existing_execution and not existing_execution.is_complete:
                     # Wait for existing execution to complete before starting new one
                     logger.debug(f"Waiting for existing execution to complete for thread {input.thread_id}")
-            
-            # If there was an existing execution, wait for it to complete
-            if existing_execution and not existing_execution.is_complete:
-                try:
-                    await existing_execution.task
-                except Exception as e:
-                    logger.debug(f"Previous execution completed with error: {e}")
-            
-            # Start background execution
-            execution = await self._start_background_execution(input,agent_id)
-            
-            # Store execution (replacing any previous one)
-            async with self._execution_lock:
+                    try:
+                        await existing_execution.task
+                    except Exception as e:
+                        logger.debug(f"Previous execution completed with error: {e}")
+                
+                # Runs of the thread on other workers are waited for through the registry
+                await self._claim_thread(input.thread_id)
+                thread_claimed = True
+                
+                # Wait for an execution slot; raises ExecutionRejected if none frees up in time
+                await self._scheduler.acquire(user_id, self._priority_extractor(input), agent_id)
+                slot_user_id = user_id
+                
+                # Start background execution
+                execution = await self._start_background_execution(input,agent_id)
+                
+                # Store execution (replacing any previous one)
                 self._active_executions[input.thread_id] = execution
             
             # Stream events and track tool calls
@@ -642,8 +959,6 @@ class ADKAgent:
             
             # If we found tool calls, add them to session state BEFORE cleanup
             if has_tool_calls:
-                app_name = self._get_app_name(input)
-                user_id = self._get_user_id(input)
                 for tool_call_id in tool_call_ids:
                     await self._add_pending_tool_call_with_context(
                         execution.thread_id, tool_call_id, app_name, user_id
@@ -666,19 +981,108 @@ class ADKAgent:
                 code="EXECUTION_ERROR"
             )
         finally:
-            # Clean up execution if complete and no pending tool calls (HITL scenarios)
-            async with self._execution_lock:
-                if input.thread_id in self._active_executions:
-                    execution = self._active_executions[input.thread_id]
-                    execution.is_complete = True
-                    
-                    # Check if session has pending tool calls before cleanup
-                    has_pending = await self._has_pending_tool_calls(input.thread_id)
-                    if not has_pending:
-                        del self._active_executions[input.thread_id]
-                        logger.debug(f"Cleaned up execution for thread {input.thread_id}")
-                    else:
-                        logger.info(f"Preserving execution for thread {input.thread_id} - has pending tool calls (HITL scenario)")
+            if slot_user_id is not None:
+                self._scheduler.release(slot_user_id, agent_id)
+            if thread_claimed:
+                try:
+                    await self._registry.release_thread(input.thread_id, self._worker_id)
+                except Exception as e:
+                    logger.error(f"Failed to release thread {input.thread_id} in the registry: {e}")
+            
+            # Clean up this run's execution if no pending tool calls (HITL scenarios);
+            # a run that failed before starting one leaves the thread's execution alone
+            if execution is not None and self._active_executions.get(input.thread_id) is execution:
+                execution.is_complete = True
+                
+                # Check if session has pending tool calls before cleanup; the session
+                # read happens without holding any lock
+                has_pending = await self._has_pending_tool_calls(input.thread_id)
+                if has_pending:
+                    logger.info(f"Preserving execution for thread {input.thread_id} - has pending tool calls (HITL scenario)")
+                elif self._active_executions.get(input.thread_id) is execution:
+                    # Not replaced by a newer run of the thread in the meantime
+                    del self._active_executions[input.thread_id]
+                    logger.debug(f"Cleaned up execution for thread {input.thread_id}")
+            
+            if app_name is not None:
+                await self._session_manager.end_state_batch(input.thread_id, app_name)
+    
+    async def _claim_thread(self, thread_id: str):
+        """Take this worker's lease on a thread in the execution registry.
+        
+        While another worker runs the thread, the lease is retried with
+        exponential backoff for up to execution_queue_timeout_seconds.
+        
+        Args:
+            thread_id: The thread about to run
+            
+        Raises:
+            ExecutionRejected: If the other worker did not finish in time
+        """
+        await self._heartbeat()
+        # The lease covers waiting for a slot as well as the execution itself
+        ttl = self._execution_queue_timeout + self._execution_timeout
+        deadline = time.monotonic() + self._execution_queue_timeout
+        delay = 0.05
+        while not await self._registry.acquire_thread(thread_id, self._worker_id, ttl):
+            if time.monotonic() >= deadline:
+                owner = await self._registry.get_thread_owner(thread_id)
+                raise ExecutionRejected(f"Thread {thread_id} is still running on worker {owner}")
+            logger.debug(f"Waiting for another worker to finish thread {thread_id}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+    
+    async def _heartbeat(self):
+        """Announce this worker in the registry, at most a few times per worker TTL."""
+        now = time.monotonic()
+        if self._last_heartbeat is not None and now - self._last_heartbeat < self._worker_ttl / 3:
+            return
+        self._last_heartbeat = now
+        await self._registry.heartbeat(self._worker_id, self._worker_ttl)
+    
+    @property
+    def worker_id(self) -> str:
+        """ID of this worker in the execution registry."""
+        return self._worker_id
+    
+    async def get_routing_hint(self, thread_id: str) -> Optional[str]:
+        """Get the worker that should serve a thread.
+        
+        Threads are spread over the live workers of the execution registry with
+        consistent hashing, so a load balancer routing on the hint keeps a thread
+        (its tool result submissions and stream resumptions) on one worker, and
+        only the threads of a worker that joins or leaves move elsewhere.
+        
+        Args:
+            thread_id: The thread to route
+            
+        Returns:
+            Worker ID, or None if no worker is alive
+        """
+        await self._heartbeat()
+        workers = await self._registry.get_workers()
+        if self._hash_ring.nodes != frozenset(workers):
+            self._hash_ring = HashRing(workers)
+        return self._hash_ring.get(thread_id)
+    
+    @asynccontextmanager
+    async def _thread_lock(self, thread_id: str):
+        """Hold the lock of a single thread; it is discarded once nobody uses it.
+        
+        Args:
+            thread_id: The thread to lock
+        """
+        entry = self._thread_locks.get(thread_id)
+        if entry is None:
+            entry = self._thread_locks[thread_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._thread_locks[thread_id]
     
     async def _start_background_execution(
         self, 
@@ -693,7 +1097,7 @@ class ADKAgent:
         Returns:
             ExecutionState tracking the background execution
         """
-        event_queue = asyncio.Queue()
+        event_queue = BoundedEventQueue(maxsize=self._event_queue_size, policy=self._event_queue_policy)
         logger.debug(f"Created event queue {id(event_queue)} for thread {input.thread_id}")
         # Extract necessary information
         user_id = self._get_user_id(input)
@@ -703,58 +1107,21 @@ class ADKAgent:
         registry = AgentRegistry.get_instance()
         adk_agent = registry.get_agent(agent_id)
         
-        # Prepare agent modifications (SystemMessage and tools)
-        agent_updates = {}
+        # Bound its tools by the tool timeout and keep synchronous ones off the event loop
+        adk_agent = self._get_guarded_agent(agent_id, adk_agent)
         
-        # Handle SystemMessage if it's the first message - append to agent instructions
-        if input.messages and isinstance(input.messages[0], SystemMessage):
-            system_content = input.messages[0].content
-            if system_content:
-                # Get existing instruction (may be None or empty)
-                current_instruction = getattr(adk_agent, 'instruction', '') or ''
-                
-                # Append SystemMessage content to existing instructions
-                if current_instruction:
-                    new_instruction = f"{current_instruction}\n\n{system_content}"
-                else:
-                    new_instruction = system_content
-                
-                agent_updates['instruction'] = new_instruction
-                logger.debug(f"Will append SystemMessage to agent instructions: '{system_content[:100]}...'")
+        # Reuse a prepared copy of the agent for this SystemMessage and tool set
+        adk_agent, proxy_tool_names = self._get_prepared_agent(agent_id, adk_agent, input)
         
-        # Create dynamic toolset if tools provided and prepare tool updates
+        # Create dynamic toolset if tools provided
         toolset = None
         if input.tools:
-            
-            # Get existing tools from the agent
-            existing_tools = []
-            if hasattr(adk_agent, 'tools') and adk_agent.tools:
-                existing_tools = list(adk_agent.tools) if isinstance(adk_agent.tools, (list, tuple)) else [adk_agent.tools]
-            
-            # if same tool is defined in frontend and backend then agent will only use the backend tool
-            input_tools = []
-            for input_tool in input.tools:
-                # Check if this input tool's name matches any existing tool
-                # Also exclude this specific tool call "transfer_to_agent" which is used internally by the adk to handoff to other agents
-                if (not any(hasattr(existing_tool, '__name__') and input_tool.name == existing_tool.__name__
-                        for existing_tool in existing_tools) and input_tool.name != 'transfer_to_agent'):
-                    input_tools.append(input_tool)
-                        
+            input_tools = [tool for tool in input.tools if tool.name in proxy_tool_names]
             toolset = ClientProxyToolset(
                 ag_ui_tools=input_tools,
-                event_queue=event_queue
+                event_queue=event_queue,
+                tool_timeout_seconds=self._tool_timeout
             )
-
-            # Combine existing tools with our proxy toolset
-            # combined_tools = existing_tools + [toolset]
-            combined_tools = existing_tools 
-            agent_updates['tools'] = combined_tools
-            logger.debug(f"Will combine {len(existing_tools)} existing tools with proxy toolset")
-        
-        # Create a single copy of the agent with all updates if any modifications needed
-        if agent_updates:
-            adk_agent = adk_agent.model_copy(update=agent_updates)
-            logger.debug(f"Created modified agent copy with updates: {list(agent_updates.keys())}")
         
         # Create background task
         logger.debug(f"Creating background task for thread {input.thread_id}")
@@ -775,6 +1142,203 @@ class ADKAgent:
             event_queue=event_queue
         )
     
+    def _get_guarded_agent(self, agent_id: str, adk_agent: ADKBaseAgent) -> ADKBaseAgent:
+        """Get the copy of an agent tree whose function tools are wrapped by the tool executor.
+        
+        Copies are cached per agent_id (up to prepared_agent_cache_size) and
+        reused as long as the registry resolves agent_id to the same agent.
+        
+        Args:
+            agent_id: The agent ID the agent was resolved for
+            adk_agent: The registered ADK agent
+            
+        Returns:
+            The agent copy, or adk_agent itself if no tool in its tree needs wrapping
+        """
+        if self._prepared_agent_cache_size <= 0:
+            return self._guard_agent_tools(adk_agent)
+        
+        generation = AgentRegistry.get_instance().generation
+        if generation != self._guarded_agents_generation:
+            self._guarded_agents.clear()
+            self._guarded_agents_generation = generation
+        
+        cached = self._guarded_agents.get(agent_id)
+        if cached is not None and cached[0] is adk_agent:
+            self._guarded_agents.move_to_end(agent_id)
+            return cached[1]
+        
+        guarded = self._guard_agent_tools(adk_agent)
+        self._guarded_agents[agent_id] = (adk_agent, guarded)
+        self._guarded_agents.move_to_end(agent_id)
+        if len(self._guarded_agents) > self._prepared_agent_cache_size:
+            self._guarded_agents.popitem(last=False)
+        return guarded
+    
+    def _guard_agent_tools(self, adk_agent: ADKBaseAgent) -> ADKBaseAgent:
+        """Copy an agent tree, wrapping its function tools with the tool executor.
+        
+        The whole tree is copied so that parent and sub-agent links stay
+        within the copy.
+        
+        Args:
+            adk_agent: Root of the agent tree
+            
+        Returns:
+            The copied tree, or adk_agent itself if no tool in it needs wrapping
+        """
+        executor = self._tool_executor
+        
+        def needs_guard(agent: ADKBaseAgent) -> bool:
+            tools = getattr(agent, 'tools', None) or []
+            sub_agents = getattr(agent, 'sub_agents', None) or []
+            return any(executor.guards(tool) for tool in tools) or any(
+                needs_guard(sub_agent) for sub_agent in sub_agents
+            )
+        
+        def copy_tree(agent: ADKBaseAgent) -> ADKBaseAgent:
+            updates = {}
+            tools = getattr(agent, 'tools', None)
+            if tools:
+                updates['tools'] = [executor.guard_tool(tool) for tool in tools]
+            sub_agents = [copy_tree(sub_agent) for sub_agent in agent.sub_agents]
+            if sub_agents:
+                updates['sub_agents'] = sub_agents
+            copied = agent.model_copy(update=updates)
+            for sub_agent in sub_agents:
+                sub_agent.parent_agent = copied
+            return copied
+        
+        if not needs_guard(adk_agent):
+            return adk_agent
+        logger.debug(f"Wrapping the tools of agent '{adk_agent.name}' with the tool executor")
+        return copy_tree(adk_agent)
+    
+    def get_tool_executor_stats(self) -> Dict[str, Any]:
+        """Get metrics of the backend tool executor.
+        
+        Returns:
+            Dictionary with the number of backend tool calls and timeouts, and the
+            synchronous calls whose thread is still running per tool name
+        """
+        return self._tool_executor.get_stats()
+    
+    def _get_prepared_agent(
+        self,
+        agent_id: str,
+        adk_agent: ADKBaseAgent,
+        input: RunAgentInput
+    ) -> Tuple[ADKBaseAgent, FrozenSet[str]]:
+        """Get the agent copy prepared for the input's SystemMessage and tools.
+        
+        Copies are cached per (agent_id, SystemMessage hash, tool-name set) and
+        reused as long as the registry resolves agent_id to the same agent.
+        
+        Args:
+            agent_id: The agent ID the agent was resolved for
+            adk_agent: The registered ADK agent
+            input: The run input
+            
+        Returns:
+            The agent to run and the frontend tool names handled by the proxy toolset
+        """
+        system_content = None
+        if input.messages and isinstance(input.messages[0], SystemMessage):
+            system_content = input.messages[0].content or None
+        tool_names = frozenset(tool.name for tool in input.tools) if input.tools else None
+        
+        if system_content is None and tool_names is None:
+            return adk_agent, frozenset()
+        if self._prepared_agent_cache_size <= 0:
+            return self._prepare_agent(adk_agent, system_content, tool_names)
+        
+        # Registering or replacing agents invalidates every prepared copy
+        generation = AgentRegistry.get_instance().generation
+        if generation != self._prepared_agents_generation:
+            self._prepared_agents.clear()
+            self._prepared_agents_generation = generation
+        
+        system_hash = hashlib.sha256(system_content.encode("utf-8")).hexdigest() if system_content else None
+        key = (agent_id, system_hash, tool_names)
+        cached = self._prepared_agents.get(key)
+        if cached is not None and cached[0] is adk_agent:
+            self._prepared_agents.move_to_end(key)
+            logger.debug(f"Reusing prepared agent copy for '{agent_id}'")
+            return cached[1], cached[2]
+        
+        prepared_agent, proxy_tool_names = self._prepare_agent(adk_agent, system_content, tool_names)
+        self._prepared_agents[key] = (adk_agent, prepared_agent, proxy_tool_names)
+        self._prepared_agents.move_to_end(key)
+        if len(self._prepared_agents) > self._prepared_agent_cache_size:
+            self._prepared_agents.popitem(last=False)
+        return prepared_agent, proxy_tool_names
+    
+    def _prepare_agent(
+        self,
+        adk_agent: ADKBaseAgent,
+        system_content: Optional[str],
+        tool_names: Optional[FrozenSet[str]]
+    ) -> Tuple[ADKBaseAgent, FrozenSet[str]]:
+        """Copy an agent with the SystemMessage appended and frontend tools resolved.
+        
+        Args:
+            adk_agent: The registered ADK agent
+            system_content: Content of a leading SystemMessage, if any
+            tool_names: Names of the tools provided by the frontend, if any
+            
+        Returns:
+            The agent copy and the frontend tool names handled by the proxy toolset
+        """
+        # Prepare agent modifications (SystemMessage and tools)
+        agent_updates = {}
+        proxy_tool_names: FrozenSet[str] = frozenset()
+        
+        # Handle SystemMessage if it's the first message - append to agent instructions
+        if system_content:
+            # Get existing instruction (may be None or empty)
+            current_instruction = getattr(adk_agent, 'instruction', '') or ''
+            
+            # Append SystemMessage content to existing instructions
+            if current_instruction:
+                new_instruction = f"{current_instruction}\n\n{system_content}"
+            else:
+                new_instruction = system_content
+            
+            agent_updates['instruction'] = new_instruction
+            logger.debug(f"Will append SystemMessage to agent instructions: '{system_content[:100]}...'")
+        
+        # Prepare tool updates if tools provided
+        if tool_names:
+            
+            # Get existing tools from the agent
+            existing_tools = []
+            if hasattr(adk_agent, 'tools') and adk_agent.tools:
+                existing_tools = list(adk_agent.tools) if isinstance(adk_agent.tools, (list, tuple)) else [adk_agent.tools]
+            
+            # if same tool is defined in frontend and backend then agent will only use the backend tool
+            # Also exclude this specific tool call "transfer_to_agent" which is used internally by the adk to handoff to other agents
+            backend_tool_names = {
+                existing_tool.__name__ for existing_tool in existing_tools
+                if hasattr(existing_tool, '__name__')
+            }
+            proxy_tool_names = frozenset(
+                name for name in tool_names
+                if name not in backend_tool_names and name != 'transfer_to_agent'
+            )
+            
+            # Combine existing tools with our proxy toolset
+            # combined_tools = existing_tools + [toolset]
+            combined_tools = existing_tools 
+            agent_updates['tools'] = combined_tools
+            logger.debug(f"Will combine {len(existing_tools)} existing tools with proxy toolset")
+        
+        # Create a single copy of the agent with all updates if any modifications needed
+        if agent_updates:
+            adk_agent = adk_agent.model_copy(update=agent_updates)
+            logger.debug(f"Created modified agent copy with updates: {list(agent_updates.keys())}")
+        
+        return adk_agent, proxy_tool_names
+    
     async def _run_adk_in_background(
         self,
         input: RunAgentInput,
@@ -792,12 +1356,14 @@ class ADKAgent:
             app_name: App name
             event_queue: Queue for emitting events
         """
+        # Create event translator
+        event_translator = EventTranslator()
         try:
             # Agent is already prepared with tools and SystemMessage instructions (if any)
             # from _start_background_execution, so no additional agent copying needed here
             
-            # Create runner
-            runner = self._create_runner(
+            # Get a (pooled) runner
+            runner = self._get_pooled_runner(
                 agent_id="default", 
                 adk_agent=adk_agent,
                 user_id=user_id,
@@ -812,9 +1378,12 @@ class ADKAgent:
                 app_name, user_id, input.thread_id, input.state
             )
 
-            # this will always update the backend states with the frontend states
+            # this will always sync the backend states with the frontend states, writing only the keys that changed
             # Recipe Demo Example: if there is a state "salt" in the ingredients state and in frontend user remove this salt state using UI from the ingredients list then our backend should also update these state changes as well to sync both the states
-            await self._session_manager.update_session_state(input.thread_id,app_name,user_id,input.state)
+            await self._session_manager.sync_session_state(input.thread_id, app_name, user_id, input.state)
+            # The runner reads and appends to the session itself, so write the batched
+            # state now and reload it after the run
+            await self._session_manager.flush_state_batch(input.thread_id, app_name, invalidate=True)
             
             
             # Convert messages
@@ -860,8 +1429,6 @@ class ADKAgent:
                 )
                     parts.append(updated_function_response_part)
                 new_message = types.Content(parts=parts, role='user')
-            # Create event translator
-            event_translator = EventTranslator()
             
             # Run ADK agent
             is_long_running_tool = False
@@ -907,6 +1474,12 @@ class ADKAgent:
             await event_queue.put(None)
             logger.debug(f"Background task completion signal sent for thread {input.thread_id}")
             
+        except EventQueueOverflow:
+            # The queue already holds the RUN_ERROR for the client
+            logger.warning(f"Event queue overflowed for thread {input.thread_id}, stopping execution")
+        except ToolTimeoutError as e:
+            logger.warning(f"{e}, ending run {input.run_id} for thread {input.thread_id}")
+            await self._emit_tool_timeout(e, event_translator, event_queue)
         except Exception as e:
             logger.error(f"Background execution error: {e}", exc_info=True)
             # Put error in queue
@@ -919,10 +1492,69 @@ class ADKAgent:
             )
             await event_queue.put(None)
         finally:
-            # Background task cleanup completed
+            # The runner appended events to the session, so push back its expiry
+            self._session_manager.touch_session(input.thread_id, app_name)
+            if isinstance(event_queue, BoundedEventQueue):
+                self._record_event_queue_stats(event_queue)
             # Note: toolset cleanup is handled by garbage collection
             # since toolset is now embedded in the agent's tools
-            pass
+    
+    async def _emit_tool_timeout(
+        self,
+        error: ToolTimeoutError,
+        event_translator: EventTranslator,
+        event_queue: asyncio.Queue
+    ):
+        """End a run whose tool call timed out.
+        
+        The timed out calls get a TOOL_CALL_RESULT carrying the error, so the
+        client can close them, and the run ends with a RUN_ERROR.
+        
+        Args:
+            error: The timeout raised by the tool
+            event_translator: Translator of the run, which knows the unanswered tool calls
+            event_queue: Queue for emitting events
+        """
+        async for ag_ui_event in event_translator.force_close_streaming_message():
+            await event_queue.put(ag_ui_event)
+        content = json.dumps({"error": str(error), "code": "TOOL_TIMEOUT"})
+        for tool_call_id, tool_name in list(event_translator.open_tool_calls.items()):
+            if tool_name == error.tool_name:
+                await event_queue.put(ToolCallResultEvent(
+                    type=EventType.TOOL_CALL_RESULT,
+                    message_id=str(uuid.uuid4()),
+                    tool_call_id=tool_call_id,
+                    content=content
+                ))
+        await event_queue.put(RunErrorEvent(
+            type=EventType.RUN_ERROR,
+            message=str(error),
+            code="TOOL_TIMEOUT"
+        ))
+        await event_queue.put(None)
+    
+    def _record_event_queue_stats(self, event_queue: BoundedEventQueue):
+        """Fold the counters of a finished run's event queue into the agent totals."""
+        stats = self._event_queue_stats
+        stats["high_water_mark"] = max(stats["high_water_mark"], event_queue.high_water_mark)
+        stats["coalesced"] += event_queue.coalesced
+        stats["dropped"] += event_queue.dropped
+        stats["overflows"] += int(event_queue.overflowed)
+    
+    def get_event_queue_stats(self) -> Dict[str, int]:
+        """Get backpressure metrics of the per-run event queues.
+        
+        Returns:
+            Dictionary with the deepest any finished run's queue has been
+            (high_water_mark), the number of coalesced and dropped events, the number
+            of runs ended by an overflow, and the current depth of the deepest active
+            queue (max_depth)
+        """
+        depths = [
+            execution.event_queue.qsize()
+            for execution in self._active_executions.values()
+        ]
+        return {**self._event_queue_stats, "max_depth": max(depths, default=0)}
     
     async def _cleanup_stale_executions(self):
         """Clean up stale executions."""
@@ -933,17 +1565,30 @@ class ADKAgent:
                 stale_threads.append(thread_id)
         
         for thread_id in stale_threads:
-            execution = self._active_executions.pop(thread_id)
+            # A concurrent cleanup may have removed it already
+            execution = self._active_executions.pop(thread_id, None)
+            if execution is None:
+                continue
             await execution.cancel()
             logger.info(f"Cleaned up stale execution for thread {thread_id}")
 
     async def close(self):
         """Clean up resources including active executions."""
+        # Stop runs that are still recording events
+        for task in list(self._run_tasks):
+            task.cancel()
+        if self._run_tasks:
+            await asyncio.gather(*self._run_tasks, return_exceptions=True)
+        self._replay_buffers.clear()
+        self._runner_pool.clear()
+        self._guarded_agents.clear()
+        self._tool_executor.shutdown()
+        
         # Cancel all active executions
-        async with self._execution_lock:
-            for execution in self._active_executions.values():
-                await execution.cancel()
-            self._active_executions.clear()
+        executions = list(self._active_executions.values())
+        self._active_executions.clear()
+        for execution in executions:
+            await execution.cancel()
         
         # Stop session manager cleanup task
         await self._session_manager.stop_cleanup_task()
\ No newline at end of file
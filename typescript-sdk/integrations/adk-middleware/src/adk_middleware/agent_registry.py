@@ -26,6 +26,7 @@ class AgentRegistry:
         self._registry: Dict[str, BaseAgent] = {}
         self._default_agent: Optional[BaseAgent] = None
         self._agent_factory: Optional[Callable[[str], BaseAgent]] = None
+        self._generation = 0  # Bumped on every change to agent resolution
     
     @classmethod
     def get_instance(cls) -> 'AgentRegistry':
@@ -55,6 +56,7 @@ class AgentRegistry:
             raise TypeError(f"Agent must be an instance of BaseAgent, got {type(agent)}")
         
         self._registry[agent_id] = agent
+        self._generation += 1
         logger.info(f"Registered agent '{agent.name}' with ID '{agent_id}'")
     
     def unregister_agent(self, agent_id: str) -> Optional[BaseAgent]:
@@ -68,6 +70,7 @@ class AgentRegistry:
         """
         agent = self._registry.pop(agent_id, None)
         if agent:
+            self._generation += 1
             logger.info(f"Unregistered agent with ID '{agent_id}'")
         return agent
     
@@ -81,6 +84,7 @@ class AgentRegistry:
             raise TypeError(f"Agent must be an instance of BaseAgent, got {type(agent)}")
         
         self._default_agent = agent
+        self._generation += 1
         logger.info(f"Set default agent to '{agent.name}'")
     
     def set_agent_factory(self, factory: Callable[[str], BaseAgent]):
@@ -93,6 +97,7 @@ class AgentRegistry:
             factory: A callable that takes an agent_id and returns a BaseAgent
         """
         self._agent_factory = factory
+        self._generation += 1
         logger.info("Set agent factory function")
     
     def get_agent(self, agent_id: str) -> BaseAgent:
@@ -144,6 +149,14 @@ class AgentRegistry:
             f"Factory: {'set' if self._agent_factory else 'not set'}"
         )
     
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever agents are registered, replaced or removed.
+        
+        Caches derived from resolved agents can compare it to detect staleness.
+        """
+        return self._generation
+    
     def has_agent(self, agent_id: str) -> bool:
         """Check if an agent can be resolved for the given ID.
         
@@ -175,4 +188,5 @@ class AgentRegistry:
         self._registry.clear()
         self._default_agent = None
         self._agent_factory = None
+        self._generation += 1
         logger.info("Cleared all agents from registry")
\ No newline at end of file
@@ -18,6 +18,8 @@ from ag_ui.core import (
     ToolCallEndEvent
 )
 
+from .tool_executor import ToolTimeoutError
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,13 +37,15 @@ class ClientProxyTool(BaseTool):
     def __init__(
         self,
         ag_ui_tool: AGUITool,
-        event_queue: asyncio.Queue
+        event_queue: asyncio.Queue,
+        timeout_seconds: Optional[float] = None
     ):
         """Initialize the client proxy tool.
         
         Args:
             ag_ui_tool: The AG-UI tool definition
             event_queue: Queue to emit AG-UI events
+            timeout_seconds: How long emitting the tool call may take (None = no limit)
         """
         # Initialize BaseTool with name and description
         # All client-side tools are long-running for architectural simplicity
@@ -53,6 +57,7 @@ class ClientProxyTool(BaseTool):
         
         self.ag_ui_tool = ag_ui_tool
         self.event_queue = event_queue
+        self.timeout_seconds = timeout_seconds
         
         # Create dynamic function with proper parameter signatures for ADK inspection
         # This allows ADK to extract parameters from user requests correctly
@@ -132,13 +137,23 @@ class ClientProxyTool(BaseTool):
             
         Returns:
             None for long-running tools (client handles execution)
+            
+        Raises:
+            ToolTimeoutError: If the call did not finish within timeout_seconds
         """
         # Store args and context for proxy function access
         self._current_args = args
         self._current_tool_context = tool_context
         
         # Delegate to the wrapped long-running tool
-        return await self._long_running_tool.run_async(args=args, tool_context=tool_context)
+        try:
+            return await asyncio.wait_for(
+                self._long_running_tool.run_async(args=args, tool_context=tool_context),
+                self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Client tool '{self.name}' timed out after {self.timeout_seconds}s")
+            raise ToolTimeoutError(self.name, self.timeout_seconds) from None
     
     async def _execute_proxy_tool(self, args: Dict[str, Any], tool_context: Any) -> Any:
         """Execute the proxy tool logic - emit events and return None.
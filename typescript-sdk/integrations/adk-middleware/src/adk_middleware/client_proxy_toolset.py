@@ -26,17 +26,20 @@ class ClientProxyToolset(BaseToolset):
     def __init__(
         self,
         ag_ui_tools: List[AGUITool],
-        event_queue: asyncio.Queue
+        event_queue: asyncio.Queue,
+        tool_timeout_seconds: Optional[float] = None
     ):
         """Initialize the client proxy toolset.
         
         Args:
             ag_ui_tools: List of AG-UI tool definitions
             event_queue: Queue to emit AG-UI events
+            tool_timeout_seconds: Timeout applied to each proxy tool call (None = no limit)
         """
         super().__init__()
         self.ag_ui_tools = ag_ui_tools
         self.event_queue = event_queue
+        self.tool_timeout_seconds = tool_timeout_seconds
         
         logger.info(f"Initialized ClientProxyToolset with {len(ag_ui_tools)} tools (all long-running)")
     
@@ -62,7 +65,8 @@ class ClientProxyToolset(BaseToolset):
             try:
                 proxy_tool = ClientProxyTool(
                     ag_ui_tool=ag_ui_tool,
-                    event_queue=self.event_queue
+                    event_queue=self.event_queue,
+                    timeout_seconds=self.tool_timeout_seconds
                 )
                 proxy_tools.append(proxy_tool)
                 logger.debug(f"Created proxy tool for '{ag_ui_tool.name}' (long-running)")
@@ -2,32 +2,58 @@
 
 """FastAPI endpoint for ADK middleware."""
 
+from typing import Optional
+
 from fastapi import FastAPI, Request
 from fastapi.responses import StreamingResponse
-from ag_ui.core import RunAgentInput
-from ag_ui.encoder import EventEncoder
+from ag_ui.core import RunAgentInput, CoalescePolicy, coalesce_deltas
+from ag_ui.encoder import EventEncoder, FlushPolicy, batch_frames
 from .adk_agent import ADKAgent
 
 import logging
 logger = logging.getLogger(__name__)
 
 
-def add_adk_fastapi_endpoint(app: FastAPI, agent: ADKAgent, path: str = "/"):
+def add_adk_fastapi_endpoint(
+    app: FastAPI,
+    agent: ADKAgent,
+    path: str = "/",
+    flush_policy: Optional[FlushPolicy] = None,
+    coalesce_policy: Optional[CoalescePolicy] = None,
+    agent_id: Optional[str] = None,
+    routing_hint_header: Optional[str] = None
+):
     """Add ADK middleware endpoint to FastAPI app.
     
     Args:
         app: FastAPI application instance
         agent: Configured ADKAgent instance
         path: API endpoint path
+        flush_policy: Coalesce encoded events into fewer writes (None = one write per event)
+        coalesce_policy: Merge consecutive content/tool-args deltas (None = emit every delta)
+        agent_id: Registry ID of the agent served at this path (defaults to the path without '/')
+        routing_hint_header: Response header naming the worker that should serve the
+            thread (see ADKAgent.get_routing_hint); None = no header
+    
+    One ADKAgent can be added under several paths, each serving a different
+    agent ID; the endpoints then share its execution slots and bookkeeping.
+    
+    Each SSE frame carries the sequence id of its event, and a request with a
+    Last-Event-ID header resumes the run with the same thread_id and run_id.
+    Ids are not emitted when coalesce_policy is set, since merged deltas no
+    longer map one-to-one to the events buffered for replay.
     """
     
+    if agent_id is None:
+        agent_id = path.lstrip('/')
+    
     @app.post(path)
     async def adk_endpoint(input_data: RunAgentInput, request: Request):
         """ADK middleware endpoint."""
         
         # Get the accept header from the request
         accept_header = request.headers.get("accept")
-        agent_id = path.lstrip('/')
+        last_event_id = _parse_last_event_id(request.headers.get("last-event-id"))
         
         
         # Create an event encoder to properly format SSE events
@@ -36,9 +62,20 @@ def add_adk_fastapi_endpoint(app: FastAPI, agent: ADKAgent, path: str = "/"):
         async def event_generator():
             """Generate events from ADK agent."""
             try:
-                async for event in agent.run(input_data, agent_id):
+                if last_event_id is None:
+                    events = agent.run(input_data, agent_id)
+                else:
+                    events = agent.run(input_data, agent_id, last_event_id=last_event_id)
+                event_id = last_event_id or 0
+                if coalesce_policy is not None:
+                    events = coalesce_deltas(events, coalesce_policy)
+                async for event in events:
                     try:
-                        encoded = encoder.encode(event)
+                        event_id += 1
+                        if coalesce_policy is None:
+                            encoded = encoder.encode(event, event_id=event_id)
+                        else:
+                            encoded = encoder.encode(event)
                         logger.debug(f"HTTP Response: {encoded}")
                         yield encoded
                     except Exception as encoding_error:
@@ -78,19 +115,57 @@ def add_adk_fastapi_endpoint(app: FastAPI, agent: ADKAgent, path: str = "/"):
                     logger.error("Failed to encode agent error event, yielding basic SSE error")
                     yield "event: error\ndata: {\"error\": \"Agent execution failed\"}\n\n"
         
-        return StreamingResponse(event_generator(), media_type=encoder.get_content_type())
+        stream = event_generator()
+        if flush_policy is not None:
+            stream = batch_frames(stream, flush_policy)
+        
+        headers = None
+        if routing_hint_header is not None:
+            hint = await agent.get_routing_hint(input_data.thread_id)
+            if hint is not None:
+                headers = {routing_hint_header: hint}
+        
+        return StreamingResponse(stream, media_type=encoder.get_content_type(), headers=headers)
+
+
+def _parse_last_event_id(header: Optional[str]) -> Optional[int]:
+    """Parse a Last-Event-ID header, ignoring values this endpoint never emitted.
+    
+    Args:
+        header: Raw header value
+        
+    Returns:
+        The sequence id, or None to start a new run
+    """
+    if header is None:
+        return None
+    try:
+        last_event_id = int(header.strip())
+    except ValueError:
+        logger.warning(f"Ignoring malformed Last-Event-ID header: {header!r}")
+        return None
+    return last_event_id if last_event_id >= 0 else None
 
 
-def create_adk_app(agent: ADKAgent, path: str = "/") -> FastAPI:
+def create_adk_app(
+    agent: ADKAgent,
+    path: str = "/",
+    flush_policy: Optional[FlushPolicy] = None,
+    coalesce_policy: Optional[CoalescePolicy] = None
+) -> FastAPI:
     """Create a FastAPI app with ADK middleware endpoint.
     
     Args:
         agent: Configured ADKAgent instance  
         path: API endpoint path
+        flush_policy: Coalesce encoded events into fewer writes (None = one write per event)
+        coalesce_policy: Merge consecutive content/tool-args deltas (None = emit every delta)
         
     Returns:
         FastAPI application instance
     """
     app = FastAPI(title="ADK Middleware for AG-UI Protocol")
-    add_adk_fastapi_endpoint(app, agent, path)
+    add_adk_fastapi_endpoint(
+        app, agent, path, flush_policy=flush_policy, coalesce_policy=coalesce_policy
+    )
     return app
\ No newline at end of file
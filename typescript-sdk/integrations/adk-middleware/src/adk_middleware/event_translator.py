@@ -39,6 +39,7 @@ class EventTranslator:
         self._streaming_message_id: Optional[str] = None  # Current streaming message ID
         self._is_streaming: bool = False  # Whether we're currently streaming a message
         self.long_running_tool_ids: List[str] = []  # Track the long running tool IDs
+        self.open_tool_calls: Dict[str, str] = {}  # Tool call ID -> tool name, until its response arrives
     
     async def translate(
         self, 
@@ -303,6 +304,7 @@ class EventTranslator:
             
             # Track the tool call
             self._active_tool_calls[tool_call_id] = tool_call_id
+            self.open_tool_calls[tool_call_id] = func_call.name
             
             # Emit TOOL_CALL_START
             yield ToolCallStartEvent(
@@ -351,6 +353,7 @@ class EventTranslator:
         for func_response in function_response:
             
             tool_call_id = getattr(func_response, 'id', str(uuid.uuid4()))
+            self.open_tool_calls.pop(tool_call_id, None)
             # Only emit ToolCallResultEvent for tool_call_ids which are not long_running_tool
             # this is because long running tools are handle by the frontend
             if tool_call_id not in self.long_running_tool_ids:
@@ -0,0 +1,353 @@
+# src/adk_middleware/execution_registry.py
+
+"""Registry of sessions, running threads and workers shared by middleware processes."""
+
+from abc import ABC, abstractmethod
+from bisect import bisect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HashRing:
+    """Consistent hash ring mapping keys (thread IDs) to workers.
+
+    Each worker is placed on the ring at several points, so adding or removing
+    a worker only moves the keys of its neighbours. Hashes are computed with
+    MD5, which, unlike hash(), is stable across processes.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 64):
+        """Initialize the ring.
+
+        Args:
+            nodes: Initial worker IDs
+            replicas: Number of ring points per worker
+        """
+        self._replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self._nodes: set = set()
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+    @property
+    def nodes(self) -> frozenset:
+        """The workers on the ring."""
+        return frozenset(self._nodes)
+
+    def add(self, node: str):
+        """Place a worker on the ring."""
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self._replicas):
+            point = self._hash(f"{node}#{i}")
+            self._owners[point] = node
+        self._points = sorted(self._owners)
+
+    def remove(self, node: str):
+        """Take a worker off the ring."""
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        self._owners = {point: owner for point, owner in self._owners.items() if owner != node}
+        self._points = sorted(self._owners)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the worker a key belongs to, or None if the ring is empty."""
+        if not self._points:
+            return None
+        index = bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+class ExecutionRegistry(ABC):
+    """State that lets several worker processes serve the same threads.
+
+    The registry records where each session lives (app name and user ID, which
+    a tool result submission does not carry), which worker runs a thread right
+    now, and which workers are alive. Implementations whose state is visible to
+    other processes set shared to True.
+    """
+
+    shared: bool = False
+
+    @abstractmethod
+    async def register_session(self, session_id: str, app_name: str, user_id: str):
+        """Record that a session of app_name belongs to user_id."""
+
+    @abstractmethod
+    async def unregister_session(self, session_id: str, app_name: str):
+        """Forget a session."""
+
+    @abstractmethod
+    async def find_session(self, session_id: str, app_name: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Look up where a session lives.
+
+        Args:
+            session_id: Session identifier
+            app_name: Restrict the lookup to this application
+
+        Returns:
+            (app_name, user_id) of the session, or None if it is not registered
+        """
+
+    @abstractmethod
+    async def acquire_thread(self, thread_id: str, owner: str, ttl_seconds: float) -> bool:
+        """Take or renew the lease on running a thread.
+
+        Args:
+            thread_id: The thread to run
+            owner: ID of the worker taking the lease
+            ttl_seconds: Time after which the lease lapses unless renewed
+
+        Returns:
+            True if owner holds the lease, False if another worker does
+        """
+
+    @abstractmethod
+    async def release_thread(self, thread_id: str, owner: str):
+        """Give up a lease held by owner; leases of other workers are kept."""
+
+    @abstractmethod
+    async def get_thread_owner(self, thread_id: str) -> Optional[str]:
+        """Get the worker holding the lease on a thread, if any."""
+
+    @abstractmethod
+    async def heartbeat(self, worker_id: str, ttl_seconds: float):
+        """Announce that a worker is alive for the next ttl_seconds."""
+
+    @abstractmethod
+    async def get_workers(self) -> List[str]:
+        """Get the IDs of the live workers."""
+
+    async def close(self):
+        """Release resources held by the registry."""
+
+
+class InMemoryExecutionRegistry(ExecutionRegistry):
+    """Registry kept in the memory of a single process (the default)."""
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, str]] = {}  # session_id -> {app_name: user_id}
+        self._leases: Dict[str, Tuple[str, float]] = {}  # thread_id -> (owner, expires_at)
+        self._workers: Dict[str, float] = {}  # worker_id -> expires_at
+
+    async def register_session(self, session_id: str, app_name: str, user_id: str):
+        self._sessions.setdefault(session_id, {})[app_name] = user_id
+
+    async def unregister_session(self, session_id: str, app_name: str):
+        apps = self._sessions.get(session_id)
+        if apps is not None:
+            apps.pop(app_name, None)
+            if not apps:
+                del self._sessions[session_id]
+
+    async def find_session(self, session_id: str, app_name: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        apps = self._sessions.get(session_id)
+        if not apps:
+            return None
+        if app_name is not None:
+            user_id = apps.get(app_name)
+            return (app_name, user_id) if user_id is not None else None
+        return next(iter(apps.items()))
+
+    async def acquire_thread(self, thread_id: str, owner: str, ttl_seconds: float) -> bool:
+        now = time.monotonic()
+        lease = self._leases.get(thread_id)
+        if lease is not None and lease[0] != owner and lease[1] > now:
+            return False
+        self._leases[thread_id] = (owner, now + ttl_seconds)
+        return True
+
+    async def release_thread(self, thread_id: str, owner: str):
+        lease = self._leases.get(thread_id)
+        if lease is not None and lease[0] == owner:
+            del self._leases[thread_id]
+
+    async def get_thread_owner(self, thread_id: str) -> Optional[str]:
+        lease = self._leases.get(thread_id)
+        if lease is None or lease[1] <= time.monotonic():
+            return None
+        return lease[0]
+
+    async def heartbeat(self, worker_id: str, ttl_seconds: float):
+        self._workers[worker_id] = time.monotonic() + ttl_seconds
+
+    async def get_workers(self) -> List[str]:
+        now = time.monotonic()
+        return sorted(worker_id for worker_id, expires_at in self._workers.items() if expires_at > now)
+
+
+class SQLExecutionRegistry(ExecutionRegistry):
+    """Registry stored in a SQL database through a DB-API 2.0 connection.
+
+    Works with PostgreSQL (psycopg2, paramstyle "format") and SQLite (sqlite3,
+    paramstyle "qmark"; open the connection with check_same_thread=False).
+    Statements run on a dedicated thread, one at a time, so the event loop is
+    not blocked and the connection is never used concurrently. Tables are
+    created on first use.
+    """
+
+    shared = True
+
+    def __init__(self, connection: Any, paramstyle: str = "qmark", table_prefix: str = "adk_"):
+        """Initialize the registry.
+
+        Args:
+            connection: Open DB-API connection, owned by the registry from now on
+            paramstyle: Placeholder style of the driver, "qmark" (?) or "format" (%s)
+            table_prefix: Prefix of the registry's table names
+        """
+        if paramstyle not in ("qmark", "format"):
+            raise ValueError(f"Unsupported paramstyle: {paramstyle}")
+        self._connection = connection
+        self._placeholder = "?" if paramstyle == "qmark" else "%s"
+        self._sessions_table = f"{table_prefix}sessions"
+        self._leases_table = f"{table_prefix}thread_leases"
+        self._workers_table = f"{table_prefix}workers"
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="execution-registry")
+        self._initialized = False
+
+    async def _run(self, fn: Callable[[Any], Any]) -> Any:
+        """Run fn(cursor) in a transaction on the registry thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._transaction, fn)
+
+    def _transaction(self, fn: Callable[[Any], Any]) -> Any:
+        if not self._initialized:
+            self._create_tables()
+        cursor = self._connection.cursor()
+        try:
+            result = fn(cursor)
+            self._connection.commit()
+            return result
+        except BaseException:
+            self._connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _create_tables(self):
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._sessions_table} ("
+                f"session_id VARCHAR(255) NOT NULL, app_name VARCHAR(255) NOT NULL, "
+                f"user_id VARCHAR(255) NOT NULL, PRIMARY KEY (session_id, app_name))"
+            )
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._leases_table} ("
+                f"thread_id VARCHAR(255) PRIMARY KEY, owner VARCHAR(255) NOT NULL, "
+                f"expires_at DOUBLE PRECISION NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._workers_table} ("
+                f"worker_id VARCHAR(255) PRIMARY KEY, expires_at DOUBLE PRECISION NOT NULL)"
+            )
+            self._connection.commit()
+        finally:
+            cursor.close()
+        self._initialized = True
+
+    def _sql(self, statement: str) -> str:
+        """Substitute the driver's placeholder for '?'."""
+        return statement.replace("?", self._placeholder)
+
+    async def register_session(self, session_id: str, app_name: str, user_id: str):
+        statement = self._sql(
+            f"INSERT INTO {self._sessions_table} (session_id, app_name, user_id) VALUES (?, ?, ?) "
+            f"ON CONFLICT (session_id, app_name) DO UPDATE SET user_id = excluded.user_id"
+        )
+        await self._run(lambda cursor: cursor.execute(statement, (session_id, app_name, user_id)))
+
+    async def unregister_session(self, session_id: str, app_name: str):
+        statement = self._sql(f"DELETE FROM {self._sessions_table} WHERE session_id = ? AND app_name = ?")
+        await self._run(lambda cursor: cursor.execute(statement, (session_id, app_name)))
+
+    async def find_session(self, session_id: str, app_name: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        if app_name is None:
+            statement = self._sql(f"SELECT app_name, user_id FROM {self._sessions_table} WHERE session_id = ?")
+            params: tuple = (session_id,)
+        else:
+            statement = self._sql(
+                f"SELECT app_name, user_id FROM {self._sessions_table} WHERE session_id = ? AND app_name = ?"
+            )
+            params = (session_id, app_name)
+
+        def find(cursor):
+            cursor.execute(statement, params)
+            return cursor.fetchone()
+
+        row = await self._run(find)
+        return (row[0], row[1]) if row else None
+
+    async def acquire_thread(self, thread_id: str, owner: str, ttl_seconds: float) -> bool:
+        delete_expired = self._sql(f"DELETE FROM {self._leases_table} WHERE thread_id = ? AND expires_at <= ?")
+        insert = self._sql(
+            f"INSERT INTO {self._leases_table} (thread_id, owner, expires_at) VALUES (?, ?, ?) "
+            f"ON CONFLICT (thread_id) DO NOTHING"
+        )
+        renew = self._sql(f"UPDATE {self._leases_table} SET expires_at = ? WHERE thread_id = ? AND owner = ?")
+
+        def acquire(cursor):
+            now = time.time()
+            cursor.execute(delete_expired, (thread_id, now))
+            cursor.execute(insert, (thread_id, owner, now + ttl_seconds))
+            # Succeeds for a lease just inserted or already held by owner
+            cursor.execute(renew, (now + ttl_seconds, thread_id, owner))
+            return cursor.rowcount == 1
+
+        return await self._run(acquire)
+
+    async def release_thread(self, thread_id: str, owner: str):
+        statement = self._sql(f"DELETE FROM {self._leases_table} WHERE thread_id = ? AND owner = ?")
+        await self._run(lambda cursor: cursor.execute(statement, (thread_id, owner)))
+
+    async def get_thread_owner(self, thread_id: str) -> Optional[str]:
+        statement = self._sql(f"SELECT owner FROM {self._leases_table} WHERE thread_id = ? AND expires_at > ?")
+
+        def owner(cursor):
+            cursor.execute(statement, (thread_id, time.time()))
+            return cursor.fetchone()
+
+        row = await self._run(owner)
+        return row[0] if row else None
+
+    async def heartbeat(self, worker_id: str, ttl_seconds: float):
+        statement = self._sql(
+            f"INSERT INTO {self._workers_table} (worker_id, expires_at) VALUES (?, ?) "
+            f"ON CONFLICT (worker_id) DO UPDATE SET expires_at = excluded.expires_at"
+        )
+        delete_expired = self._sql(f"DELETE FROM {self._workers_table} WHERE expires_at <= ?")
+
+        def beat(cursor):
+            now = time.time()
+            cursor.execute(statement, (worker_id, now + ttl_seconds))
+            cursor.execute(delete_expired, (now,))
+
+        await self._run(beat)
+
+    async def get_workers(self) -> List[str]:
+        statement = self._sql(f"SELECT worker_id FROM {self._workers_table} WHERE expires_at > ? ORDER BY worker_id")
+
+        def workers(cursor):
+            cursor.execute(statement, (time.time(),))
+            return [row[0] for row in cursor.fetchall()]
+
+        return await self._run(workers)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._connection.close)
+        self._executor.shutdown(wait=False)
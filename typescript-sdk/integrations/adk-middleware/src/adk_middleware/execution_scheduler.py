@@ -0,0 +1,239 @@
+# src/adk_middleware/execution_scheduler.py
+
+"""Admission control for background ADK executions."""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionRejected(RuntimeError):
+    """Raised when an execution cannot be admitted."""
+
+
+class _Waiter:
+    """A request waiting for an execution slot."""
+
+    __slots__ = ("user_id", "agent_id", "future", "enqueued_at")
+
+    def __init__(self, user_id: str, agent_id: Optional[str], future: asyncio.Future):
+        self.user_id = user_id
+        self.agent_id = agent_id
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class ExecutionScheduler:
+    """Hands out a fixed number of execution slots to waiting requests.
+
+    Requests that find every slot taken wait in a bounded queue instead of
+    failing. Waiters are served by priority class (higher first) and, within a
+    class, round-robin per user, so a user with many queued requests cannot
+    starve the others. Optional per-user and per-agent limits keep a single
+    user or agent from holding all slots at once; the slots themselves are
+    shared by every agent served through the scheduler.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queued: int = 100,
+        max_concurrent_per_user: Optional[int] = None,
+        queue_timeout_seconds: float = 30,
+        max_concurrent_per_agent: Optional[Dict[str, int]] = None
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrent: Number of executions that may run at once
+            max_queued: Number of requests that may wait for a slot
+            max_concurrent_per_user: Number of slots a single user may hold (None = no limit)
+            queue_timeout_seconds: How long a request waits for a slot before it is rejected
+            max_concurrent_per_agent: Number of slots the executions of an agent ID may hold
+                (agents not listed are only bound by max_concurrent)
+        """
+        self._max_concurrent = max_concurrent
+        self._max_queued = max_queued
+        self._max_per_user = max_concurrent_per_user
+        self._queue_timeout = queue_timeout_seconds
+        self._max_per_agent = dict(max_concurrent_per_agent or {})
+
+        self._running = 0
+        self._running_per_user: Dict[str, int] = {}
+        self._running_per_agent: Dict[str, int] = {}
+        # priority -> user_id -> waiters of that user, in arrival order
+        self._waiters: Dict[int, "OrderedDict[str, Deque[_Waiter]]"] = {}
+        self._waiting = 0
+
+        # Metrics
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._waited = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def acquire(self, user_id: str, priority: int = 0, agent_id: Optional[str] = None):
+        """Wait for an execution slot.
+
+        Args:
+            user_id: The user the execution runs for
+            priority: Priority class of the request; higher classes are served first
+            agent_id: The agent the execution runs, for per-agent limits
+
+        Raises:
+            ExecutionRejected: If the wait queue is full or the wait timed out
+        """
+        if not self._waiting and self._has_slot(user_id, agent_id):
+            self._grant(user_id, agent_id)
+            return
+
+        if self._max_concurrent <= 0 or self._max_per_agent.get(agent_id) == 0 or self._waiting >= self._max_queued:
+            self._rejected += 1
+            raise ExecutionRejected(
+                f"Maximum concurrent executions ({self._max_concurrent}) reached "
+                f"and {self._waiting} requests are already waiting"
+            )
+
+        waiter = _Waiter(user_id, agent_id, asyncio.get_running_loop().create_future())
+        self._waiters.setdefault(priority, OrderedDict()).setdefault(user_id, deque()).append(waiter)
+        self._waiting += 1
+        self._queued += 1
+        logger.debug(f"Queued execution for user {user_id} (priority {priority}, {self._waiting} waiting)")
+        # A slot may be free for this user even though others are waiting
+        self._dispatch()
+
+        try:
+            await asyncio.wait((waiter.future,), timeout=self._queue_timeout)
+        except asyncio.CancelledError:
+            if waiter.future.done():
+                # The slot was handed over while we were being cancelled
+                self.release(user_id, agent_id)
+            else:
+                self._abandon(waiter)
+            raise
+
+        if not waiter.future.done():
+            self._abandon(waiter)
+            self._timed_out += 1
+            self._rejected += 1
+            raise ExecutionRejected(
+                f"Maximum concurrent executions ({self._max_concurrent}) reached; "
+                f"no slot became free within {self._queue_timeout}s"
+            )
+
+        wait_time = time.monotonic() - waiter.enqueued_at
+        self._waited += 1
+        self._total_wait += wait_time
+        self._max_wait = max(self._max_wait, wait_time)
+        logger.debug(f"Admitted execution for user {user_id} after waiting {wait_time:.3f}s")
+
+    def release(self, user_id: str, agent_id: Optional[str] = None):
+        """Return the slot of a finished execution and admit the next waiter.
+
+        Args:
+            user_id: The user the execution ran for
+            agent_id: The agent the slot was acquired for
+        """
+        self._running -= 1
+        _decrement(self._running_per_user, user_id)
+        if agent_id is not None:
+            _decrement(self._running_per_agent, agent_id)
+        self._dispatch()
+
+    def _has_slot(self, user_id: str, agent_id: Optional[str] = None) -> bool:
+        """Check if an execution of user_id and agent_id could start right now."""
+        if self._running >= self._max_concurrent:
+            return False
+        if self._max_per_user is not None and self._running_per_user.get(user_id, 0) >= self._max_per_user:
+            return False
+        agent_limit = self._max_per_agent.get(agent_id)
+        return agent_limit is None or self._running_per_agent.get(agent_id, 0) < agent_limit
+
+    def _grant(self, user_id: str, agent_id: Optional[str] = None):
+        """Assign a slot to user_id and agent_id."""
+        self._running += 1
+        self._running_per_user[user_id] = self._running_per_user.get(user_id, 0) + 1
+        if agent_id is not None:
+            self._running_per_agent[agent_id] = self._running_per_agent.get(agent_id, 0) + 1
+        self._admitted += 1
+
+    def _abandon(self, waiter: _Waiter):
+        """Forget a waiter that stopped waiting; it is skipped on dispatch."""
+        waiter.future.cancel()
+        self._waiting -= 1
+
+    def _dispatch(self):
+        """Hand free slots to waiters: by priority, then round-robin per user."""
+        while self._waiting and self._running < self._max_concurrent:
+            waiter = self._next_waiter()
+            if waiter is None:
+                # Every waiter is held back by a per-user or per-agent limit
+                return
+            self._waiting -= 1
+            self._grant(waiter.user_id, waiter.agent_id)
+            waiter.future.set_result(None)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Take the next waiter that may start now."""
+        for priority in sorted(self._waiters, reverse=True):
+            users = self._waiters[priority]
+            for user_id in list(users):
+                queue = users[user_id]
+                while queue and queue[0].future.done():
+                    queue.popleft()
+                if not queue:
+                    del users[user_id]
+                    continue
+                # The user's oldest request that is not held back by its agent's limit
+                waiter = next(
+                    (w for w in queue if not w.future.done() and self._has_slot(user_id, w.agent_id)),
+                    None
+                )
+                if waiter is None:
+                    continue
+                queue.remove(waiter)
+                # Move the user behind the others of this class
+                users.move_to_end(user_id)
+                if not queue:
+                    del users[user_id]
+                if not users:
+                    del self._waiters[priority]
+                return waiter
+            if not users:
+                del self._waiters[priority]
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get admission metrics.
+
+        Returns:
+            Dictionary with running and waiting executions (also per agent ID),
+            admission counters and the average and maximum time admitted
+            requests waited for a slot
+        """
+        return {
+            "running": self._running,
+            "running_per_agent": dict(self._running_per_agent),
+            "waiting": self._waiting,
+            "admitted": self._admitted,
+            "queued": self._queued,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "avg_wait_seconds": self._total_wait / self._waited if self._waited else 0.0,
+            "max_wait_seconds": self._max_wait,
+        }
+
+
+def _decrement(counts: Dict[str, int], key: str):
+    """Decrement a usage counter, dropping it at zero."""
+    remaining = counts.get(key, 0) - 1
+    if remaining > 0:
+        counts[key] = remaining
+    else:
+        counts.pop(key, None)
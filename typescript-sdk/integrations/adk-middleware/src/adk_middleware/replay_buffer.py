@@ -0,0 +1,154 @@
+# src/adk_middleware/replay_buffer.py
+
+"""Bounded per-run event buffer that lets clients resume dropped streams."""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import AsyncGenerator, Deque, Dict, Optional, Tuple
+import logging
+
+from ag_ui.core import BaseEvent
+
+logger = logging.getLogger(__name__)
+
+
+class FollowerFellBehind(ValueError):
+    """Raised to a follower whose next event was evicted while it was reading."""
+
+
+class ReplayBuffer:
+    """Keeps the most recent events of a run together with their sequence ids.
+
+    Sequence ids start at 1 and grow by one per event, so a client that has
+    seen event N can resume with every later event as long as N + 1 is still
+    buffered. Any number of followers can read the buffer concurrently.
+
+    With backpressure enabled, append waits instead of evicting an event that
+    an attached follower has not read yet, so a slow client slows the run down
+    rather than losing events.
+    """
+
+    def __init__(self, thread_id: str, run_id: str, max_events: int = 1024, backpressure: bool = False):
+        """Initialize the replay buffer.
+
+        Args:
+            thread_id: The thread ID of the run
+            run_id: The run ID of the run
+            max_events: Number of most recent events kept for replay
+            backpressure: Wait for attached followers instead of evicting unread events
+        """
+        if max_events <= 0:
+            raise ValueError("max_events must be positive")
+
+        self.thread_id = thread_id
+        self.run_id = run_id
+        self.is_closed = False
+        self.closed_at: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self._events: Deque[Tuple[int, BaseEvent]] = deque(maxlen=max_events)
+        self._last_seq = 0
+        self._changed = asyncio.Condition()
+        self._backpressure = backpressure
+        # follower token -> sequence id of the next event it will read
+        self._followers: Dict[int, int] = {}
+        self._follower_ids = itertools.count()
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence id of the most recent event (0 if none was appended)."""
+        return self._last_seq
+
+    async def append(self, event: BaseEvent) -> int:
+        """Append an event and wake up all followers.
+
+        Args:
+            event: The event emitted by the run
+
+        Returns:
+            The sequence id assigned to the event
+        """
+        async with self._changed:
+            if self._backpressure:
+                await self._changed.wait_for(self._has_room)
+            self._last_seq += 1
+            self._events.append((self._last_seq, event))
+            self._changed.notify_all()
+        return self._last_seq
+
+    def _has_room(self) -> bool:
+        """Check if appending would not evict an event a follower still has to read."""
+        if len(self._events) < self._events.maxlen or not self._followers:
+            return True
+        return min(self._followers.values()) > self._events[0][0]
+
+    async def close(self, error: Optional[BaseException] = None):
+        """Mark the run as finished; followers stop after the last event.
+
+        Args:
+            error: Exception that ended the run, re-raised to live followers
+        """
+        async with self._changed:
+            self.is_closed = True
+            self.closed_at = time.time()
+            self.error = error
+            self._changed.notify_all()
+        logger.debug(f"Closed replay buffer for thread {self.thread_id} after {self._last_seq} events")
+
+    def is_expired(self, retention_seconds: float) -> bool:
+        """Check if the run finished more than retention_seconds ago.
+
+        Args:
+            retention_seconds: How long a finished run stays resumable
+
+        Returns:
+            True if the buffer can be discarded
+        """
+        return self.is_closed and time.time() - self.closed_at > retention_seconds
+
+    async def follow(self, after_seq: int = 0) -> AsyncGenerator[Tuple[int, BaseEvent], None]:
+        """Yield every event after after_seq, then live events until the run closes.
+
+        Args:
+            after_seq: Sequence id of the last event the client received
+
+        Yields:
+            (sequence id, event) tuples in order
+
+        Raises:
+            ValueError: If after_seq was never emitted or later events were evicted
+            FollowerFellBehind: If events were evicted before the follower read them
+        """
+        if after_seq < 0 or after_seq > self._last_seq:
+            raise ValueError(f"Event id {after_seq} was not emitted by run {self.run_id}")
+        if self._events and after_seq + 1 < self._events[0][0]:
+            raise ValueError(f"Events after id {after_seq} are no longer buffered for run {self.run_id}")
+
+        next_seq = after_seq + 1
+        token = next(self._follower_ids)
+        try:
+            while True:
+                async with self._changed:
+                    # Publish our position so a blocked append can proceed
+                    self._followers[token] = next_seq
+                    self._changed.notify_all()
+                    await self._changed.wait_for(lambda: self._last_seq >= next_seq or self.is_closed)
+                    if self._events and next_seq < self._events[0][0]:
+                        # Only possible without backpressure
+                        raise FollowerFellBehind(
+                            f"Events after id {next_seq - 1} were evicted before the client read them"
+                        )
+                    if self._last_seq < next_seq:
+                        # Closed and fully drained
+                        return
+                    first_seq = self._events[0][0]
+                    batch = list(itertools.islice(self._events, next_seq - first_seq, None))
+
+                for seq, event in batch:
+                    yield seq, event
+                next_seq = batch[-1][0] + 1
+        finally:
+            async with self._changed:
+                del self._followers[token]
+                self._changed.notify_all()
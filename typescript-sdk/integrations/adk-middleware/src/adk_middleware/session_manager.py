@@ -2,14 +2,28 @@
 
 """Session manager that adds production features to ADK's native session service."""
 
-from typing import Dict, Optional, Set, Any, Union
+from typing import Dict, FrozenSet, List, Optional, Set, Any, Tuple, Union
 import asyncio
+import heapq
 import logging
 import time
 
+from .execution_registry import ExecutionRegistry
+
 logger = logging.getLogger(__name__)
 
 
+class _StateBatch:
+    """Session state cached in memory while a run is in progress."""
+    
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.session: Any = None  # ADK session object the snapshot was read from
+        self.state: Optional[Dict[str, Any]] = None  # None until loaded
+        self.pending: Dict[str, Any] = {}  # Deltas not yet written with append_event
+        self.refs = 0
+
+
 class SessionManager:
     """Session manager that wraps ADK's session service.
     
@@ -20,6 +34,7 @@ class SessionManager:
     - Automatic cleanup of expired sessions
     - Optional automatic session memory on deletion
     - State management and updates
+    - Per-run write-back state cache (see begin_state_batch)
     """
     
     _instance = None
@@ -38,7 +53,8 @@ class SessionManager:
         session_timeout_seconds: int = 1200,  # 20 minutes default
         cleanup_interval_seconds: int = 300,  # 5 minutes
         max_sessions_per_user: Optional[int] = None,
-        auto_cleanup: bool = True
+        auto_cleanup: bool = True,
+        registry: Optional[ExecutionRegistry] = None
     ):
         """Initialize the session manager.
         
@@ -49,6 +65,8 @@ class SessionManager:
             cleanup_interval_seconds: Interval between cleanup cycles
             max_sessions_per_user: Maximum concurrent sessions per user (None = unlimited)
             auto_cleanup: Enable automatic session cleanup task
+            registry: Registry shared with other worker processes; sessions are
+                published to it so that any worker can locate them
         """
         if self._initialized:
             return
@@ -63,10 +81,21 @@ class SessionManager:
         self._cleanup_interval = cleanup_interval_seconds
         self._max_per_user = max_sessions_per_user
         self._auto_cleanup = auto_cleanup
+        self._registry = registry
         
-        # Minimal tracking: just keys and user counts
+        # Minimal tracking: keys plus the indexes needed for O(1) lookups
         self._session_keys: Set[str] = set()  # "app_name:session_id" keys
         self._user_sessions: Dict[str, Set[str]] = {}  # user_id -> set of session_keys
+        self._session_owners: Dict[str, str] = {}  # session_key -> user_id
+        self._session_index: Dict[str, Dict[str, str]] = {}  # session_id -> {app_name: user_id}
+        
+        # Expiry index: cleanup only inspects sessions whose deadline has passed.
+        # Heap entries are invalidated lazily by comparing with _expiry_deadlines.
+        self._expiry_heap: List[Tuple[float, str]] = []  # (deadline, session_key)
+        self._expiry_deadlines: Dict[str, float] = {}  # session_key -> current deadline
+        
+        # Write-back state cache for sessions with a run in progress
+        self._state_batches: Dict[str, _StateBatch] = {}  # session_key -> cached state
         
         self._cleanup_task: Optional[asyncio.Task] = None
         self._initialized = True
@@ -79,9 +108,36 @@ class SessionManager:
             f"memory: {'enabled' if memory_service else 'disabled'}"
         )
     
+    def _warn_if_reconfigured(self, **config):
+        """Log configuration that differs from the one the shared instance was created with."""
+        current = {
+            "session_service": self._session_service,
+            "memory_service": self._memory_service,
+            "session_timeout_seconds": self._timeout,
+            "cleanup_interval_seconds": self._cleanup_interval,
+            "max_sessions_per_user": self._max_per_user,
+            "auto_cleanup": self._auto_cleanup,
+            "registry": self._registry,
+        }
+        ignored = [
+            name for name, value in config.items()
+            if name in current and value is not current[name] and value != current[name]
+        ]
+        if ignored:
+            logger.warning(
+                f"SessionManager is shared by the whole process; ignoring differing "
+                f"configuration: {', '.join(ignored)}"
+            )
+    
     @classmethod
     def get_instance(cls, **kwargs):
-        """Get the singleton instance."""
+        """Get the singleton instance.
+        
+        The first call configures the instance; configuration passed to later
+        calls is ignored (with a warning if it differs).
+        """
+        if cls._instance is not None and cls._instance._initialized and kwargs:
+            cls._instance._warn_if_reconfigured(**kwargs)
         return cls(**kwargs)
     
     @classmethod
@@ -136,7 +192,15 @@ class SessionManager:
             logger.debug(f"Retrieved existing session: {session_key}")
         
         # Track the session key
-        self._track_session(session_key, user_id)
+        published = self._session_owners.get(session_key) == user_id
+        self._track_session(session_key, user_id, getattr(session, 'last_update_time', None))
+        if not published:
+            await self._publish_session(session_id, app_name, user_id)
+        
+        # A run in progress reads state from this fresh copy from now on
+        batch = self._state_batches.get(session_key)
+        if batch is not None:
+            self._prime_state_batch(batch, session)
         
         # Start cleanup if needed
         if self._auto_cleanup and not self._cleanup_task:
@@ -167,6 +231,14 @@ class SessionManager:
             True if successful, False otherwise
         """
         try:
+            # Within a state batch the update is applied in memory and written later
+            batch = await self._load_state_batch(f"{app_name}:{session_id}")
+            if batch is not None and state_updates:
+                batch.state.update(state_updates)
+                batch.pending.update(state_updates)
+                logger.debug(f"Cached state updates for session {app_name}:{session_id}: {state_updates}")
+                return True
+            
             session = await self._session_service.get_session(
                 session_id=session_id,
                 app_name=app_name,
@@ -177,9 +249,6 @@ class SessionManager:
                 logger.warning(f"Session not found: {app_name}:{session_id}")
                 return False
             
-            # Apply state updates using EventActions
-            from google.adk.events import Event, EventActions
-            
             # Prepare state delta
             if merge:
                 # Merge with existing state
@@ -190,27 +259,73 @@ class SessionManager:
                 # Note: Complete replacement might need clearing existing keys
                 # This depends on ADK's behavior - may need to explicitly clear
             
-            # Create event with state changes
-            actions = EventActions(state_delta=state_delta)
-            event = Event(
-                invocation_id=f"state_update_{int(time.time())}",
-                author="system",
-                actions=actions,
-                timestamp=time.time()
-            )
-            
-            # Apply changes through ADK's event system
-            await self._session_service.append_event(session, event)
-            
-            logger.info(f"Updated state for session {app_name}:{session_id}")
-            logger.debug(f"State updates: {state_updates}")
-            
+            await self._append_state_delta(session, state_delta)
             return True
             
         except Exception as e:
             logger.error(f"Failed to update session state: {e}", exc_info=True)
             return False
     
+    async def sync_session_state(
+        self,
+        session_id: str,
+        app_name: str,
+        user_id: str,
+        state: Dict[str, Any]
+    ) -> bool:
+        """Bring session state in line with a client-provided state.
+        
+        Only keys whose value differs from the stored state are written; if
+        nothing differs no event is appended at all. Keys missing from state
+        are left untouched, as with update_session_state.
+        
+        Args:
+            session_id: Session identifier
+            app_name: Application name
+            user_id: User identifier
+            state: State as last seen by the client
+            
+        Returns:
+            True if the session is in sync, False otherwise
+        """
+        if not isinstance(state, dict) or not state:
+            return True
+        
+        current_state = await self.get_session_state(session_id, app_name, user_id)
+        if current_state is None:
+            return False
+        
+        missing = object()
+        state_delta = {
+            key: value for key, value in state.items()
+            if current_state.get(key, missing) != value
+        }
+        if not state_delta:
+            logger.debug(f"Client state matches session {app_name}:{session_id}, skipping update")
+            return True
+        
+        return await self.update_session_state(session_id, app_name, user_id, state_delta)
+    
+    async def _append_state_delta(self, session: Any, state_delta: Dict[str, Any]):
+        """Write a state delta to a session through ADK's event system."""
+        from google.adk.events import Event, EventActions
+        
+        # Create event with state changes
+        actions = EventActions(state_delta=state_delta)
+        event = Event(
+            invocation_id=f"state_update_{int(time.time())}",
+            author="system",
+            actions=actions,
+            timestamp=time.time()
+        )
+        
+        # Apply changes through ADK's event system
+        await self._session_service.append_event(session, event)
+        self.touch_session(session.id, session.app_name)
+        
+        logger.info(f"Updated state for session {session.app_name}:{session.id}")
+        logger.debug(f"State updates: {state_delta}")
+    
     async def get_session_state(
         self,
         session_id: str,
@@ -228,6 +343,10 @@ class SessionManager:
             Session state dictionary or None if session not found
         """
         try:
+            batch = await self._load_state_batch(f"{app_name}:{session_id}")
+            if batch is not None:
+                return dict(batch.state)
+            
             session = await self._session_service.get_session(
                 session_id=session_id,
                 app_name=app_name,
@@ -270,6 +389,10 @@ class SessionManager:
             Value for the key or default
         """
         try:
+            batch = await self._load_state_batch(f"{app_name}:{session_id}")
+            if batch is not None:
+                return batch.state.get(key, default)
+            
             session = await self._session_service.get_session(
                 session_id=session_id,
                 app_name=app_name,
@@ -453,6 +576,109 @@ class SessionManager:
             logger.error(f"Failed to initialize session state: {e}", exc_info=True)
             return False
     
+    # ===== RUN STATE BATCHES =====
+    
+    def begin_state_batch(self, session_id: str, app_name: str, user_id: str):
+        """Start caching a session's state for the duration of a run.
+        
+        Until the matching end_state_batch, state reads are served from memory
+        (loaded at most once) and updates are collected into a single delta
+        that flush_state_batch writes with one append_event. Batches nest.
+        
+        Args:
+            session_id: Session identifier
+            app_name: Application name
+            user_id: User identifier
+        """
+        session_key = f"{app_name}:{session_id}"
+        batch = self._state_batches.get(session_key)
+        if batch is None:
+            batch = self._state_batches[session_key] = _StateBatch(user_id)
+        batch.refs += 1
+    
+    async def flush_state_batch(self, session_id: str, app_name: str, invalidate: bool = False) -> bool:
+        """Write the pending state delta of a batch with a single append_event.
+        
+        Args:
+            session_id: Session identifier
+            app_name: Application name
+            invalidate: Reload state on the next read, e.g. because the ADK runner
+                is about to append its own events to the session
+            
+        Returns:
+            True if nothing was pending or the write succeeded, False otherwise
+        """
+        session_key = f"{app_name}:{session_id}"
+        batch = self._state_batches.get(session_key)
+        if batch is None:
+            return True
+        
+        success = True
+        if batch.pending:
+            try:
+                if batch.session is None:
+                    # A previous flush failed after the snapshot was invalidated
+                    await self._load_state_batch(session_key)
+                await self._append_state_delta(batch.session, batch.pending)
+                batch.pending = {}
+            except Exception as e:
+                logger.error(f"Failed to flush state for session {session_key}: {e}", exc_info=True)
+                success = False
+        
+        if invalidate:
+            batch.session = None
+            batch.state = None
+        return success
+    
+    async def end_state_batch(self, session_id: str, app_name: str) -> bool:
+        """Flush and release a state batch started with begin_state_batch.
+        
+        Args:
+            session_id: Session identifier
+            app_name: Application name
+            
+        Returns:
+            True if the pending state was written, False otherwise
+        """
+        session_key = f"{app_name}:{session_id}"
+        batch = self._state_batches.get(session_key)
+        if batch is None:
+            return True
+        
+        success = await self.flush_state_batch(session_id, app_name)
+        batch.refs -= 1
+        if batch.refs <= 0:
+            del self._state_batches[session_key]
+        return success
+    
+    async def _load_state_batch(self, session_key: str) -> Optional[_StateBatch]:
+        """Get the loaded state batch of a session, or None if it is not batched or missing."""
+        batch = self._state_batches.get(session_key)
+        if batch is None:
+            return None
+        
+        if batch.state is None:
+            app_name, session_id = session_key.split(':', 1)
+            session = await self._session_service.get_session(
+                session_id=session_id,
+                app_name=app_name,
+                user_id=batch.user_id
+            )
+            if not session:
+                return None
+            self._prime_state_batch(batch, session)
+        return batch
+    
+    def _prime_state_batch(self, batch: _StateBatch, session: Any):
+        """Snapshot a freshly read session into a batch, keeping pending updates."""
+        if hasattr(session.state, 'to_dict'):
+            state = session.state.to_dict()
+        else:
+            state = dict(session.state or {})
+        state.update(batch.pending)
+        batch.session = session
+        batch.state = state
+    
     # ===== BULK STATE OPERATIONS =====
     
     async def bulk_update_user_state(
@@ -497,13 +723,29 @@ class SessionManager:
     
     # ===== EXISTING METHODS (unchanged) =====
     
-    def _track_session(self, session_key: str, user_id: str):
-        """Track a session key for enumeration."""
+    def _track_session(self, session_key: str, user_id: str, last_update_time: Optional[float] = None):
+        """Track a session key for enumeration, lookup and expiry.
+        
+        Without a known last_update_time the session is checked on the next cleanup pass.
+        """
+        previous_owner = self._session_owners.get(session_key)
+        if previous_owner is not None and previous_owner != user_id:
+            self._untrack_session(session_key, previous_owner)
+        
         self._session_keys.add(session_key)
         
         if user_id not in self._user_sessions:
             self._user_sessions[user_id] = set()
         self._user_sessions[user_id].add(session_key)
+        
+        app_name, session_id = session_key.split(':', 1)
+        self._session_owners[session_key] = user_id
+        self._session_index.setdefault(session_id, {})[app_name] = user_id
+        
+        if isinstance(last_update_time, (int, float)):
+            self._schedule_expiry(session_key, last_update_time + self._timeout)
+        else:
+            self._schedule_expiry(session_key, time.time())
     
     def _untrack_session(self, session_key: str, user_id: str):
         """Remove session tracking."""
@@ -513,6 +755,113 @@ class SessionManager:
             self._user_sessions[user_id].discard(session_key)
             if not self._user_sessions[user_id]:
                 del self._user_sessions[user_id]
+        
+        if self._session_owners.get(session_key) == user_id:
+            del self._session_owners[session_key]
+            self._expiry_deadlines.pop(session_key, None)
+            app_name, session_id = session_key.split(':', 1)
+            apps = self._session_index.get(session_id)
+            if apps is not None:
+                apps.pop(app_name, None)
+                if not apps:
+                    del self._session_index[session_id]
+    
+    def _schedule_expiry(self, session_key: str, deadline: float):
+        """Set the time at which cleanup should next inspect a session."""
+        self._expiry_deadlines[session_key] = deadline
+        heapq.heappush(self._expiry_heap, (deadline, session_key))
+        
+        # Drop invalidated entries once they dominate the heap
+        if len(self._expiry_heap) > 2 * len(self._expiry_deadlines) + 64:
+            self._expiry_heap = [
+                (deadline, key) for key, deadline in self._expiry_deadlines.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+    
+    def touch_session(self, session_id: str, app_name: str):
+        """Record activity on a tracked session, postponing its expiry.
+        
+        Args:
+            session_id: Session identifier
+            app_name: Application name
+        """
+        session_key = f"{app_name}:{session_id}"
+        if session_key in self._session_owners:
+            self._schedule_expiry(session_key, time.time() + self._timeout)
+    
+    def find_session(self, session_id: str, app_name: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Look up where a tracked session lives.
+        
+        Args:
+            session_id: Session identifier
+            app_name: Restrict the lookup to this application
+            
+        Returns:
+            (app_name, user_id) of the session, or None if it is not tracked
+        """
+        apps = self._session_index.get(session_id)
+        if not apps:
+            return None
+        if app_name is not None:
+            user_id = apps.get(app_name)
+            return (app_name, user_id) if user_id is not None else None
+        return next(iter(apps.items()))
+    
+    async def locate_session(self, session_id: str, app_name: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Look up where a session lives, asking the shared registry if it is not tracked here.
+        
+        With several worker processes a session may have been created by another
+        worker. A session found in the registry is tracked locally from then on.
+        
+        Args:
+            session_id: Session identifier
+            app_name: Restrict the lookup to this application
+            
+        Returns:
+            (app_name, user_id) of the session, or None if it is unknown
+        """
+        location = self.find_session(session_id, app_name)
+        if location is not None or self._registry is None:
+            return location
+        
+        try:
+            location = await self._registry.find_session(session_id, app_name)
+        except Exception as e:
+            logger.error(f"Failed to look up session {session_id} in the registry: {e}")
+            return None
+        if location is not None:
+            found_app_name, user_id = location
+            self._track_session(f"{found_app_name}:{session_id}", user_id)
+            logger.debug(f"Located session {found_app_name}:{session_id} of another worker")
+        return location
+    
+    async def _publish_session(self, session_id: str, app_name: str, user_id: str):
+        """Make a session visible to other workers through the registry."""
+        if self._registry is None:
+            return
+        try:
+            await self._registry.register_session(session_id, app_name, user_id)
+        except Exception as e:
+            logger.error(f"Failed to register session {app_name}:{session_id}: {e}")
+    
+    async def _forget_session(self, session_key: str, user_id: str):
+        """Stop tracking a deleted session here and in the registry."""
+        self._untrack_session(session_key, user_id)
+        if self._registry is None:
+            return
+        app_name, session_id = session_key.split(':', 1)
+        try:
+            await self._registry.unregister_session(session_id, app_name)
+        except Exception as e:
+            logger.error(f"Failed to unregister session {session_key}: {e}")
+    
+    def get_session_owner(self, session_key: str) -> Optional[str]:
+        """Get the user_id owning a tracked "app_name:session_id" key."""
+        return self._session_owners.get(session_key)
+    
+    def get_user_session_keys(self, user_id: str) -> FrozenSet[str]:
+        """Get the tracked "app_name:session_id" keys of a user."""
+        return frozenset(self._user_sessions.get(user_id, ()))
     
     async def _remove_oldest_user_session(self, user_id: str):
         """Remove the oldest session for a user based on lastUpdateTime."""
@@ -575,7 +924,7 @@ class SessionManager:
         except Exception as e:
             logger.error(f"Failed to delete session {session_key}: {e}")
         
-        self._untrack_session(session_key, session.user_id)
+        await self._forget_session(session_key, session.user_id)
     
     def _start_cleanup_task(self):
         """Start the cleanup task if not already running."""
@@ -601,23 +950,28 @@ class SessionManager:
                 logger.error(f"Cleanup error: {e}", exc_info=True)
     
     async def _cleanup_expired_sessions(self):
-        """Find and remove expired sessions based on lastUpdateTime."""
+        """Find and remove expired sessions based on lastUpdateTime.
+        
+        Only sessions whose deadline in the expiry index has passed are fetched.
+        Sessions that turn out to have been updated since are rescheduled.
+        """
         current_time = time.time()
         expired_count = 0
         
-        # Check all tracked sessions
-        for session_key in list(self._session_keys):  # Copy to avoid modification during iteration
-            app_name, session_id = session_key.split(':', 1)
-            
-            # Find user_id for this session
-            user_id = None
-            for uid, keys in self._user_sessions.items():
-                if session_key in keys:
-                    user_id = uid
-                    break
-            
+        # Collect due sessions first, rescheduling below pushes onto the heap
+        due_keys = []
+        while self._expiry_heap and self._expiry_heap[0][0] <= current_time:
+            deadline, session_key = heapq.heappop(self._expiry_heap)
+            if self._expiry_deadlines.get(session_key) == deadline:
+                due_keys.append(session_key)
+        
+        for session_key in due_keys:
+            user_id = self._session_owners.get(session_key)
             if not user_id:
                 continue
+            app_name, session_id = session_key.split(':', 1)
+            # Check again next pass unless rescheduled below
+            self._schedule_expiry(session_key, current_time + self._cleanup_interval)
             
             try:
                 session = await self._session_service.get_session(
@@ -636,9 +990,12 @@ class SessionManager:
                         else:
                             await self._delete_session(session)
                             expired_count += 1
+                    else:
+                        # Updated outside the middleware (e.g. by the runner)
+                        self._schedule_expiry(session_key, session.last_update_time + self._timeout)
                 elif not session:
                     # Session doesn't exist, just untrack it
-                    self._untrack_session(session_key, user_id)
+                    await self._forget_session(session_key, user_id)
                     
             except Exception as e:
                 logger.error(f"Error checking session {session_key}: {e}")
@@ -0,0 +1,231 @@
+# src/adk_middleware/tool_executor.py
+
+"""Runs backend tools off the event loop and within the tool timeout."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import contextvars
+import copy
+import functools
+import inspect
+import logging
+
+from google.adk.tools import FunctionTool
+
+logger = logging.getLogger(__name__)
+
+
+class ToolTimeoutError(TimeoutError):
+    """Raised when a tool call does not finish within the tool timeout."""
+
+    def __init__(self, tool_name: str, timeout: float):
+        super().__init__(f"Tool '{tool_name}' did not finish within {timeout}s")
+        self.tool_name = tool_name
+        self.timeout = timeout
+
+
+def is_sync_callable(func: Any) -> bool:
+    """Check if calling func blocks until its result is ready."""
+    if not callable(func):
+        return False
+    for target in (func, getattr(func, '__call__', None)):
+        if (
+            inspect.iscoroutinefunction(target)
+            or inspect.isasyncgenfunction(target)
+            or inspect.isgeneratorfunction(target)
+        ):
+            return False
+    return True
+
+
+def _tool_function(tool: Any) -> Optional[Callable[..., Any]]:
+    """Get the function behind an entry of an agent's tools, if it is a function tool."""
+    if isinstance(tool, FunctionTool):
+        func = tool.func
+    elif inspect.isfunction(tool) or inspect.ismethod(tool):
+        func = tool
+    else:
+        return None
+    # Streaming (generator) tools are left to ADK
+    if inspect.isasyncgenfunction(func) or inspect.isgeneratorfunction(func):
+        return None
+    return func
+
+
+class ToolExecutor:
+    """Runs backend tool functions with a deadline, synchronous ones on a thread pool.
+
+    ADK calls a synchronous FunctionTool directly on the event loop, so a slow
+    query or HTTP request in one tool stalls every stream served by the
+    process. wrap() turns such a function into a coroutine function that runs
+    it on a bounded, named thread pool instead. Each tool can be limited to a
+    number of concurrent calls, so one slow tool cannot occupy every thread.
+
+    Every call, synchronous or not, is bounded by the timeout and raises
+    ToolTimeoutError when it expires. A coroutine is cancelled; a thread cannot
+    be interrupted and keeps its tool's concurrency slot until it returns.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        timeout_seconds: Optional[float] = 300,
+        max_concurrent_per_tool: Optional[Dict[str, int]] = None
+    ):
+        """Initialize the executor.
+
+        Args:
+            max_workers: Number of threads running synchronous tool calls
+                (0 = call them on the event loop)
+            timeout_seconds: How long a tool call may take (None = no limit)
+            max_concurrent_per_tool: Number of concurrent calls per tool name
+                (tools not listed are only bound by max_workers)
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="adk-tool"
+        ) if max_workers > 0 else None
+        self._timeout = timeout_seconds
+        self._max_per_tool = dict(max_concurrent_per_tool or {})
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        # Metrics
+        self._calls = 0
+        self._timeouts = 0
+        self._running: Dict[str, int] = {}
+
+    @property
+    def timeout_seconds(self) -> Optional[float]:
+        """How long a tool call may take."""
+        return self._timeout
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Turn a tool function into a coroutine function bounded by the timeout.
+
+        Synchronous functions run on the pool. The wrapper keeps the name,
+        docstring and signature of func, so ADK derives the same function
+        declaration from it.
+
+        Args:
+            name: Tool name used for concurrency limits and metrics
+            func: The tool function
+
+        Returns:
+            Coroutine function with the same parameters as func
+        """
+        if is_sync_callable(func):
+            @functools.wraps(func)
+            async def run_in_pool(*args, **kwargs):
+                return await self.run(name, func, *args, **kwargs)
+
+            return run_in_pool
+
+        @functools.wraps(func)
+        async def run_with_deadline(*args, **kwargs):
+            self._calls += 1
+            return await self._wait(name, func(*args, **kwargs))
+
+        return run_with_deadline
+
+    async def run(self, name: str, func: Callable[..., Any], /, *args, **kwargs) -> Any:
+        """Call func on the pool, honoring the tool's concurrency limit and the timeout.
+
+        name and func are positional-only, so tools may take arguments of the same name.
+
+        Raises:
+            ToolTimeoutError: If the call did not finish within the timeout
+        """
+        semaphore = self._get_semaphore(name)
+        if semaphore is not None:
+            await semaphore.acquire()
+
+        loop = asyncio.get_running_loop()
+        # Context variables (e.g. tracing spans) follow the call into the thread
+        context = contextvars.copy_context()
+        try:
+            future = loop.run_in_executor(
+                self._executor, functools.partial(context.run, func, *args, **kwargs)
+            )
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+
+        self._calls += 1
+        self._running[name] = self._running.get(name, 0) + 1
+
+        def finished(_):
+            remaining = self._running[name] - 1
+            if remaining:
+                self._running[name] = remaining
+            else:
+                del self._running[name]
+            if semaphore is not None:
+                semaphore.release()
+
+        # The slot is held until the thread returns, even after a timeout
+        future.add_done_callback(finished)
+
+        return await self._wait(name, asyncio.shield(future))
+
+    async def _wait(self, name: str, awaitable: Any) -> Any:
+        """Await a tool call, cancelling it when the timeout expires."""
+        try:
+            return await asyncio.wait_for(awaitable, self._timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            logger.warning(f"Tool '{name}' timed out after {self._timeout}s")
+            raise ToolTimeoutError(name, self._timeout) from None
+
+    def _get_semaphore(self, name: str) -> Optional[asyncio.Semaphore]:
+        limit = self._max_per_tool.get(name)
+        if limit is None:
+            return None
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = self._semaphores[name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def guards(self, tool: Any) -> bool:
+        """Check if guard_tool() changes an entry of an agent's tools."""
+        func = _tool_function(tool)
+        if func is None:
+            return False
+        if is_sync_callable(func):
+            return self._executor is not None
+        return self._timeout is not None
+
+    def guard_tool(self, tool: Any) -> Any:
+        """Get a version of an agent tool that is bounded by the timeout and does not block.
+
+        Args:
+            tool: An entry of an agent's tools (function, FunctionTool or other tool)
+
+        Returns:
+            The wrapped tool, or tool itself if it needs no wrapping
+        """
+        if not self.guards(tool):
+            return tool
+        if isinstance(tool, FunctionTool):
+            guarded = copy.copy(tool)
+            guarded.func = self.wrap(tool.name, tool.func)
+            return guarded
+        return self.wrap(tool.__name__, tool)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tool execution metrics.
+
+        Returns:
+            Dictionary with the number of calls and timeouts, and the
+            synchronous calls whose thread is still running per tool name
+        """
+        return {
+            "calls": self._calls,
+            "timeouts": self._timeouts,
+            "running": dict(self._running),
+        }
+
+    def shutdown(self):
+        """Stop accepting calls; running calls finish in the background."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -8,9 +8,10 @@ from unittest.mock import Mock, MagicMock, AsyncMock, patch
 
 
 from adk_middleware import ADKAgent, AgentRegistry,SessionManager
+from adk_middleware.execution_state import ExecutionState
 from ag_ui.core import (
     RunAgentInput, EventType, UserMessage, Context,
-    RunStartedEvent, RunFinishedEvent, TextMessageChunkEvent, SystemMessage
+    RunStartedEvent, RunFinishedEvent, TextMessageChunkEvent, SystemMessage, Tool
 )
 from google.adk.agents import Agent
 
@@ -183,8 +184,7 @@ class TestADKAgent:
         mock_execution = Mock()
         mock_execution.cancel = AsyncMock()
         
-        async with adk_agent._execution_lock:
-            adk_agent._active_executions["test_thread"] = mock_execution
+        adk_agent._active_executions["test_thread"] = mock_execution
         
         await adk_agent.close()
         
@@ -314,6 +314,104 @@ class TestADKAgent:
         # Verify the SystemMessage became the instruction
         assert captured_agent.instruction == "You are a math tutor."
 
+    @pytest.mark.asyncio
+    async def test_prepared_agent_cache(self, registry):
+        """Test that prepared agent copies are reused and invalidated on registration."""
+        def backend_tool():
+            """A tool implemented by the backend."""
+
+        base_agent = Agent(name="test_agent", instruction="Base.", tools=[backend_tool])
+        registry.register_agent("cached", base_agent)
+        adk_agent = ADKAgent(app_name="test_app", user_id="test_user", prepared_agent_cache_size=2)
+
+        def make_input(system, tool_names):
+            return RunAgentInput(
+                thread_id="test_thread",
+                run_id="test_run",
+                messages=[
+                    SystemMessage(id="sys_1", role="system", content=system),
+                    UserMessage(id="msg_1", role="user", content="Hello")
+                ],
+                context=[],
+                state={},
+                tools=[Tool(name=name, description="", parameters={}) for name in tool_names],
+                forwarded_props={}
+            )
+
+        first, proxy_names = adk_agent._get_prepared_agent("cached", base_agent, make_input("Be brief.", ["ui", "backend_tool"]))
+        assert first.instruction == "Base.\n\nBe brief."
+        assert proxy_names == {"ui"}
+
+        # Same system message and tool set (in any order) reuse the copy
+        again, _ = adk_agent._get_prepared_agent("cached", base_agent, make_input("Be brief.", ["backend_tool", "ui"]))
+        assert again is first
+
+        # A different system message gets its own copy
+        other, _ = adk_agent._get_prepared_agent("cached", base_agent, make_input("Be long.", ["ui", "backend_tool"]))
+        assert other is not first
+        assert other.instruction == "Base.\n\nBe long."
+
+        # Replacing the agent in the registry invalidates the cache
+        replacement = Agent(name="test_agent", instruction="Replaced.")
+        registry.register_agent("cached", replacement)
+        fresh, proxy_names = adk_agent._get_prepared_agent("cached", replacement, make_input("Be brief.", ["ui", "backend_tool"]))
+        assert fresh is not first
+        assert fresh.instruction == "Replaced.\n\nBe brief."
+        assert proxy_names == {"ui", "backend_tool"}
+        assert len(adk_agent._prepared_agents) == 1
+
+    def test_runner_pool(self):
+        """Test that runners are reused per (app_name, agent) and evicted by LRU."""
+        adk_agent = ADKAgent(app_name="test_app", user_id="test_user", runner_pool_size=2)
+        agent_a = Agent(name="agent_a")
+        agent_b = Agent(name="agent_b")
+        
+        with patch.object(adk_agent, '_create_runner', side_effect=lambda *args: MagicMock()) as create_runner:
+            runner = adk_agent._get_pooled_runner("default", agent_a, "user_1", "app")
+            assert adk_agent._get_pooled_runner("default", agent_a, "user_2", "app") is runner
+            assert adk_agent._get_pooled_runner("default", agent_a, "user_1", "other_app") is not runner
+            adk_agent._get_pooled_runner("default", agent_b, "user_1", "app")
+            
+            # agent_a/app was least recently used and got evicted
+            assert adk_agent._get_pooled_runner("default", agent_a, "user_1", "app") is not runner
+        
+        assert create_runner.call_count == 4
+        assert adk_agent.get_runner_pool_stats() == {"size": 2, "hits": 1, "misses": 4, "evictions": 2}
+
+    @pytest.mark.asyncio
+    async def test_stream_events_ends_when_task_finishes(self):
+        """Test that the stream ends as soon as the producer task exits without a sentinel."""
+        adk_agent = ADKAgent(app_name="test_app", user_id="test_user")
+        queue = asyncio.Queue()
+        
+        async def producer():
+            for i in range(3):
+                await queue.put(TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta=str(i)))
+                await asyncio.sleep(0.01)
+        
+        execution = ExecutionState(task=asyncio.create_task(producer()), thread_id="thread", event_queue=queue)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        events = [event async for event in adk_agent._stream_events(execution)]
+        
+        assert [event.delta for event in events] == ["0", "1", "2"]
+        assert loop.time() - started < 0.5
+        assert execution.is_complete
+    
+    @pytest.mark.asyncio
+    async def test_stream_events_execution_deadline(self):
+        """Test that a silent execution is ended by the execution deadline."""
+        adk_agent = ADKAgent(app_name="test_app", user_id="test_user", execution_timeout_seconds=0.05)
+        task = asyncio.create_task(asyncio.sleep(60))
+        execution = ExecutionState(task=task, thread_id="thread", event_queue=asyncio.Queue())
+        
+        events = [event async for event in adk_agent._stream_events(execution)]
+        task.cancel()
+        
+        assert len(events) == 1
+        assert events[0].type == EventType.RUN_ERROR
+        assert events[0].code == "EXECUTION_TIMEOUT"
+
 
 @pytest.fixture(autouse=True)
 def reset_registry():
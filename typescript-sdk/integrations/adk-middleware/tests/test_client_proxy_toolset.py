@@ -223,16 +223,17 @@ class TestClientProxyToolset:
     @pytest.mark.asyncio
     async def test_tool_timeout_configuration(self, sample_tools, mock_event_queue):
         """Test that tool timeout is properly configured."""
-        # Tool timeout configuration was removed in all-long-running architecture
         toolset = ClientProxyToolset(
             ag_ui_tools=sample_tools,
-            event_queue=mock_event_queue
+            event_queue=mock_event_queue,
+            tool_timeout_seconds=30
         )
         
         tools = await toolset.get_tools()
         
-        # All tools should be created successfully
+        # All tools should be created successfully, with the timeout
         assert len(tools) == len(sample_tools)
+        assert all(tool.timeout_seconds == 30 for tool in tools)
     
     @pytest.mark.asyncio
     async def test_lifecycle_get_tools_then_close(self, toolset):
@@ -8,8 +8,11 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from fastapi.responses import StreamingResponse
 
-from ag_ui.core import RunAgentInput, UserMessage, RunStartedEvent, RunErrorEvent, EventType
-from ag_ui.encoder import EventEncoder
+from ag_ui.core import (
+    RunAgentInput, UserMessage, RunStartedEvent, RunErrorEvent, EventType,
+    TextMessageStartEvent, TextMessageContentEvent, TextMessageEndEvent, CoalescePolicy
+)
+from ag_ui.encoder import EventEncoder, FlushPolicy
 from adk_middleware.endpoint import add_adk_fastapi_endpoint, create_adk_app
 from adk_middleware.adk_agent import ADKAgent
 
@@ -121,6 +124,51 @@ class TestAddADKFastAPIEndpoint:
         mock_agent.run.assert_called_once_with(sample_input, "agent123")
         assert response.status_code == 200
     
+    @patch('adk_middleware.endpoint.EventEncoder')
+    def test_endpoint_explicit_agent_id(self, mock_encoder_class, app, mock_agent, sample_input):
+        """Test that one agent can serve several paths with explicit agent IDs."""
+        mock_encoder = MagicMock()
+        mock_encoder.encode.return_value = "encoded_event"
+        mock_encoder.get_content_type.return_value = "text/event-stream"
+        mock_encoder_class.return_value = mock_encoder
+        
+        mock_event = RunStartedEvent(
+            type=EventType.RUN_STARTED,
+            thread_id="test_thread",
+            run_id="test_run"
+        )
+        mock_agent.run = AsyncMock(return_value=AsyncMock(__aiter__=AsyncMock(return_value=iter([mock_event]))))
+        
+        add_adk_fastapi_endpoint(app, mock_agent, path="/chat", agent_id="assistant")
+        add_adk_fastapi_endpoint(app, mock_agent, path="/email")
+        
+        client = TestClient(app)
+        client.post("/chat", json=sample_input.model_dump())
+        client.post("/email", json=sample_input.model_dump())
+        
+        assert [c.args for c in mock_agent.run.call_args_list] == [
+            (sample_input, "assistant"), (sample_input, "email")
+        ]
+    
+    @patch('adk_middleware.endpoint.EventEncoder')
+    def test_endpoint_routing_hint_header(self, mock_encoder_class, app, mock_agent, sample_input):
+        """Test that the response names the worker that should serve the thread."""
+        mock_encoder = MagicMock()
+        mock_encoder.encode.return_value = "encoded_event"
+        mock_encoder.get_content_type.return_value = "text/event-stream"
+        mock_encoder_class.return_value = mock_encoder
+        
+        mock_agent.run = AsyncMock(return_value=AsyncMock(__aiter__=AsyncMock(return_value=iter([]))))
+        mock_agent.get_routing_hint = AsyncMock(return_value="worker-b")
+        
+        add_adk_fastapi_endpoint(app, mock_agent, path="/routed", routing_hint_header="X-Worker-Hint")
+        add_adk_fastapi_endpoint(app, mock_agent, path="/plain")
+        
+        client = TestClient(app)
+        assert client.post("/routed", json=sample_input.model_dump()).headers["x-worker-hint"] == "worker-b"
+        assert "x-worker-hint" not in client.post("/plain", json=sample_input.model_dump()).headers
+        mock_agent.get_routing_hint.assert_awaited_once_with("test_thread")
+    
     @patch('adk_middleware.endpoint.EventEncoder')
     def test_endpoint_root_path_agent_id(self, mock_encoder_class, app, mock_agent, sample_input):
         """Test agent_id extraction for root path."""
@@ -185,6 +233,89 @@ class TestAddADKFastAPIEndpoint:
         assert mock_encoder.encode.call_count == 2
         assert mock_logger.debug.call_count == 2
     
+    def test_endpoint_with_flush_policy(self, app, mock_agent, sample_input):
+        """Test that a flush policy coalesces events without changing the stream."""
+        events = [
+            RunStartedEvent(type=EventType.RUN_STARTED, thread_id="test_thread", run_id="test_run"),
+            TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="msg"),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg", delta="Hi"),
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="msg"),
+        ]
+        
+        async def mock_agent_run(input_data, agent_id):
+            for event in events:
+                yield event
+        
+        mock_agent.run = mock_agent_run
+        
+        add_adk_fastapi_endpoint(app, mock_agent, path="/test", flush_policy=FlushPolicy(max_latency_seconds=10))
+        
+        client = TestClient(app)
+        response = client.post("/test", json=sample_input.model_dump())
+        
+        encoder = EventEncoder()
+        assert response.status_code == 200
+        assert response.text == "".join(
+            encoder.encode(event, event_id=index) for index, event in enumerate(events, start=1)
+        )
+    
+    def test_endpoint_emits_event_ids(self, app, mock_agent, sample_input):
+        """Test that SSE frames carry the sequence id of their event."""
+        async def mock_agent_run(input_data, agent_id):
+            yield RunStartedEvent(type=EventType.RUN_STARTED, thread_id="test_thread", run_id="test_run")
+            yield TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="msg")
+        
+        mock_agent.run = mock_agent_run
+        add_adk_fastapi_endpoint(app, mock_agent, path="/test")
+        
+        client = TestClient(app)
+        response = client.post("/test", json=sample_input.model_dump())
+        
+        frames = response.text.split("\n\n")[:-1]
+        assert [frame.split("\n")[0] for frame in frames] == ["id: 1", "id: 2"]
+    
+    def test_endpoint_resumes_from_last_event_id(self, app, mock_agent, sample_input):
+        """Test that Last-Event-ID is passed to the agent and ids continue after it."""
+        received = {}
+        
+        async def mock_agent_run(input_data, agent_id, last_event_id=None):
+            received["last_event_id"] = last_event_id
+            yield TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="msg")
+        
+        mock_agent.run = mock_agent_run
+        add_adk_fastapi_endpoint(app, mock_agent, path="/test")
+        
+        client = TestClient(app)
+        response = client.post("/test", json=sample_input.model_dump(), headers={"Last-Event-ID": "41"})
+        
+        assert received["last_event_id"] == 41
+        assert response.text.startswith("id: 42\n")
+        
+        response = client.post("/test", json=sample_input.model_dump(), headers={"Last-Event-ID": "bogus"})
+        assert received["last_event_id"] is None
+        assert response.text.startswith("id: 1\n")
+    
+    def test_endpoint_with_coalesce_policy(self, app, mock_agent, sample_input):
+        """Test that a coalesce policy merges consecutive content deltas."""
+        async def mock_agent_run(input_data, agent_id):
+            yield TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="msg")
+            for delta in ["Hel", "lo", "!"]:
+                yield TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg", delta=delta)
+            yield TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="msg")
+        
+        mock_agent.run = mock_agent_run
+        
+        add_adk_fastapi_endpoint(
+            app, mock_agent, path="/test", coalesce_policy=CoalescePolicy(max_latency_seconds=10)
+        )
+        
+        client = TestClient(app)
+        response = client.post("/test", json=sample_input.model_dump())
+        
+        assert response.status_code == 200
+        assert response.text.count("TEXT_MESSAGE_CONTENT") == 1
+        assert '"delta":"Hello!"' in response.text
+    
     @patch('adk_middleware.endpoint.EventEncoder')
     @patch('adk_middleware.endpoint.logger')
     def test_endpoint_encoding_error_handling(self, mock_logger, mock_encoder_class, app, mock_agent, sample_input):
@@ -435,7 +566,9 @@ class TestCreateADKApp:
         app = create_adk_app(mock_agent, path="/test")
         
         # Should call add_adk_fastapi_endpoint with correct parameters
-        mock_add_endpoint.assert_called_once_with(app, mock_agent, "/test")
+        mock_add_endpoint.assert_called_once_with(
+            app, mock_agent, "/test", flush_policy=None, coalesce_policy=None
+        )
     
     def test_create_app_default_path(self, mock_agent):
         """Test creating app with default path."""
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""Test the execution registry shared by worker processes."""
+
+import pytest
+import asyncio
+import sqlite3
+
+from google.adk.sessions import InMemorySessionService
+
+from adk_middleware import ADKAgent, SessionManager
+from adk_middleware.execution_registry import HashRing, InMemoryExecutionRegistry, SQLExecutionRegistry
+from adk_middleware.execution_scheduler import ExecutionRejected
+
+
+def sqlite_registry(path):
+    """Open a SQL registry on a SQLite file, as a separate worker would."""
+    return SQLExecutionRegistry(sqlite3.connect(str(path), check_same_thread=False))
+
+
+class TestHashRing:
+    """Test cases for consistent hashing of thread IDs."""
+
+    def test_mapping_is_stable(self):
+        """Test that rings with the same workers agree on every key."""
+        ring = HashRing(["worker-a", "worker-b", "worker-c"])
+        other = HashRing(["worker-c", "worker-a", "worker-b"])
+
+        owners = {ring.get(f"thread_{i}") for i in range(100)}
+        assert owners == {"worker-a", "worker-b", "worker-c"}
+        assert all(ring.get(f"thread_{i}") == other.get(f"thread_{i}") for i in range(100))
+
+    def test_removing_worker_only_moves_its_keys(self):
+        """Test that keys of the remaining workers keep their owner."""
+        ring = HashRing(["worker-a", "worker-b", "worker-c"])
+        before = {f"thread_{i}": ring.get(f"thread_{i}") for i in range(200)}
+
+        ring.remove("worker-b")
+
+        for key, owner in before.items():
+            if owner != "worker-b":
+                assert ring.get(key) == owner
+            else:
+                assert ring.get(key) in {"worker-a", "worker-c"}
+        assert ring.nodes == {"worker-a", "worker-c"}
+
+    def test_empty_ring(self):
+        """Test that an empty ring has no owner for any key."""
+        assert HashRing().get("thread") is None
+
+
+class TestExecutionRegistry:
+    """Test cases run against every registry implementation."""
+
+    @pytest.fixture(params=["memory", "sql"])
+    async def registry(self, request, tmp_path):
+        """Create a registry of each implementation."""
+        if request.param == "memory":
+            registry = InMemoryExecutionRegistry()
+        else:
+            registry = sqlite_registry(tmp_path / "registry.db")
+        yield registry
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_sessions(self, registry):
+        """Test registering, finding and unregistering sessions."""
+        await registry.register_session("thread_1", "app1", "alice")
+        await registry.register_session("thread_1", "app2", "bob")
+        await registry.register_session("thread_1", "app1", "carol")
+
+        assert await registry.find_session("thread_1", "app1") == ("app1", "carol")
+        assert await registry.find_session("thread_1") in {("app1", "carol"), ("app2", "bob")}
+        assert await registry.find_session("thread_1", "app3") is None
+
+        await registry.unregister_session("thread_1", "app1")
+        await registry.unregister_session("thread_1", "app2")
+        assert await registry.find_session("thread_1") is None
+
+    @pytest.mark.asyncio
+    async def test_thread_leases(self, registry):
+        """Test that only one worker holds the lease on a thread."""
+        assert await registry.acquire_thread("thread", "worker-a", 60)
+        assert not await registry.acquire_thread("thread", "worker-b", 60)
+        assert await registry.acquire_thread("thread", "worker-a", 60)
+        assert await registry.get_thread_owner("thread") == "worker-a"
+
+        await registry.release_thread("thread", "worker-b")
+        assert await registry.get_thread_owner("thread") == "worker-a"
+
+        await registry.release_thread("thread", "worker-a")
+        assert await registry.get_thread_owner("thread") is None
+        assert await registry.acquire_thread("thread", "worker-b", 60)
+
+    @pytest.mark.asyncio
+    async def test_lapsed_lease_can_be_taken_over(self, registry):
+        """Test that the lease of a worker that stopped renewing it lapses."""
+        assert await registry.acquire_thread("thread", "worker-a", 0)
+
+        assert await registry.get_thread_owner("thread") is None
+        assert await registry.acquire_thread("thread", "worker-b", 60)
+
+    @pytest.mark.asyncio
+    async def test_workers(self, registry):
+        """Test that only workers with a recent heartbeat are live."""
+        await registry.heartbeat("worker-b", 60)
+        await registry.heartbeat("worker-a", 60)
+        await registry.heartbeat("worker-c", 0)
+
+        assert await registry.get_workers() == ["worker-a", "worker-b"]
+
+
+class TestMultipleWorkers:
+    """Test cases for ADKAgents in different workers sharing a SQL registry."""
+
+    @pytest.fixture(autouse=True)
+    def reset_session_manager(self):
+        """Reset session manager before each test."""
+        SessionManager.reset_instance()
+        yield
+        SessionManager.reset_instance()
+
+    @pytest.mark.asyncio
+    async def test_session_created_by_another_worker_is_located(self, tmp_path):
+        """Test that a worker finds the app and user of a session it never saw."""
+        session_service = InMemorySessionService()  # Stands in for a shared database
+        manager = SessionManager.get_instance(
+            session_service=session_service, auto_cleanup=False, registry=sqlite_registry(tmp_path / "r.db")
+        )
+        await manager.get_or_create_session("thread", "app", "alice")
+
+        # A fresh process with its own connection to the registry
+        SessionManager.reset_instance()
+        manager = SessionManager.get_instance(
+            session_service=session_service, auto_cleanup=False, registry=sqlite_registry(tmp_path / "r.db")
+        )
+        assert manager.find_session("thread") is None
+        assert await manager.locate_session("thread") == ("app", "alice")
+        assert manager.find_session("thread") == ("app", "alice")
+
+        session = await session_service.get_session(app_name="app", user_id="alice", session_id="thread")
+        await manager._delete_session(session)
+        assert await manager._registry.find_session("thread") is None
+
+    @pytest.mark.asyncio
+    async def test_thread_runs_on_one_worker_at_a_time(self, tmp_path):
+        """Test that a worker waits for the run of a thread on another worker."""
+        worker_a = ADKAgent(
+            app_name="app", user_id="user", worker_id="worker-a",
+            execution_registry=sqlite_registry(tmp_path / "r.db")
+        )
+        worker_b = ADKAgent(
+            app_name="app", user_id="user", worker_id="worker-b",
+            execution_registry=sqlite_registry(tmp_path / "r.db"),
+            execution_queue_timeout_seconds=5
+        )
+
+        await worker_a._claim_thread("thread")
+        claim = asyncio.create_task(worker_b._claim_thread("thread"))
+        await asyncio.sleep(0.2)
+        assert not claim.done()
+
+        await worker_a._registry.release_thread("thread", "worker-a")
+        await asyncio.wait_for(claim, timeout=2)
+        assert await worker_a._registry.get_thread_owner("thread") == "worker-b"
+
+        worker_a._execution_queue_timeout = 0.1
+        with pytest.raises(ExecutionRejected, match="worker-b"):
+            await worker_a._claim_thread("thread")
+
+        # Both workers route every thread to the same live worker
+        hints = [await agent.get_routing_hint(f"thread_{i}") for agent in (worker_a, worker_b) for i in range(20)]
+        assert hints[:20] == hints[20:]
+        assert set(hints) == {"worker-a", "worker-b"}
+
+        await worker_a._registry.close()
+        await worker_b._registry.close()
+
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""Test the admission scheduler for background executions."""
+
+import pytest
+import asyncio
+
+from adk_middleware.execution_scheduler import ExecutionScheduler, ExecutionRejected
+
+
+async def enqueue(scheduler, admitted, name, user_id, priority=0):
+    """Queue a request that records its name once admitted."""
+    async def request():
+        await scheduler.acquire(user_id, priority)
+        admitted.append(name)
+    task = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    return task
+
+
+async def enqueue_for_agent(scheduler, admitted, name, user_id, agent_id):
+    """Queue a request for an agent that records its name once admitted."""
+    async def request():
+        await scheduler.acquire(user_id, agent_id=agent_id)
+        admitted.append(name)
+    task = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    return task
+
+
+class TestExecutionScheduler:
+    """Test cases for ExecutionScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_waits_instead_of_failing(self):
+        """Test that a request over the limit is admitted once a slot frees up."""
+        scheduler = ExecutionScheduler(max_concurrent=1)
+        admitted = []
+        await scheduler.acquire("alice")
+
+        task = await enqueue(scheduler, admitted, "second", "alice")
+        assert admitted == []
+
+        scheduler.release("alice")
+        await asyncio.wait_for(task, timeout=1)
+
+        assert admitted == ["second"]
+        stats = scheduler.get_stats()
+        assert stats["running"] == 1
+        assert stats["admitted"] == 2
+        assert stats["queued"] == 1
+
+    @pytest.mark.asyncio
+    async def test_priority_then_round_robin_per_user(self):
+        """Test that waiters are served by priority, then alternating between users."""
+        scheduler = ExecutionScheduler(max_concurrent=1)
+        admitted = []
+        await scheduler.acquire("alice")
+
+        tasks = [
+            await enqueue(scheduler, admitted, "alice_1", "alice"),
+            await enqueue(scheduler, admitted, "alice_2", "alice"),
+            await enqueue(scheduler, admitted, "alice_3", "alice"),
+            await enqueue(scheduler, admitted, "bob_1", "bob"),
+            await enqueue(scheduler, admitted, "carol_urgent", "carol", priority=1),
+        ]
+        holder = "alice"
+        for task in [tasks[4], tasks[0], tasks[3], tasks[1], tasks[2]]:
+            scheduler.release(holder)
+            await asyncio.wait_for(task, timeout=1)
+            holder = admitted[-1].split("_")[0]
+
+        assert admitted == ["carol_urgent", "alice_1", "bob_1", "alice_2", "alice_3"]
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_per_user_limit(self):
+        """Test that a user at their limit does not block other users."""
+        scheduler = ExecutionScheduler(max_concurrent=3, max_concurrent_per_user=1)
+        admitted = []
+        await scheduler.acquire("alice")
+
+        alice = await enqueue(scheduler, admitted, "alice", "alice")
+        bob = await enqueue(scheduler, admitted, "bob", "bob")
+        await asyncio.wait_for(bob, timeout=1)
+        assert admitted == ["bob"]
+
+        scheduler.release("alice")
+        await asyncio.wait_for(alice, timeout=1)
+        assert admitted == ["bob", "alice"]
+
+    @pytest.mark.asyncio
+    async def test_per_agent_limit(self):
+        """Test that agents share the slots but each stays within its own limit."""
+        scheduler = ExecutionScheduler(max_concurrent=3, max_concurrent_per_agent={"email": 1})
+        admitted = []
+        await scheduler.acquire("alice", agent_id="email")
+
+        # bob's email run waits, but his chat run behind it may start
+        email = await enqueue_for_agent(scheduler, admitted, "bob_email", "bob", "email")
+        chat = await enqueue_for_agent(scheduler, admitted, "bob_chat", "bob", "chat")
+        await asyncio.wait_for(chat, timeout=1)
+        assert admitted == ["bob_chat"]
+        assert scheduler.get_stats()["running_per_agent"] == {"email": 1, "chat": 1}
+
+        scheduler.release("alice", "email")
+        await asyncio.wait_for(email, timeout=1)
+        assert admitted == ["bob_chat", "bob_email"]
+
+        with pytest.raises(ExecutionRejected):
+            await ExecutionScheduler(max_concurrent=3, max_concurrent_per_agent={"off": 0}).acquire(
+                "alice", agent_id="off"
+            )
+
+    @pytest.mark.asyncio
+    async def test_rejections(self):
+        """Test that a full wait queue and an expired wait reject the request."""
+        scheduler = ExecutionScheduler(max_concurrent=1, max_queued=1, queue_timeout_seconds=0.05)
+        await scheduler.acquire("alice")
+
+        waiter = asyncio.create_task(scheduler.acquire("bob"))
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutionRejected, match="requests are already waiting"):
+            await scheduler.acquire("carol")
+        with pytest.raises(ExecutionRejected, match="no slot became free"):
+            await waiter
+
+        stats = scheduler.get_stats()
+        assert stats["rejected"] == 2
+        assert stats["timed_out"] == 1
+        assert stats["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_gives_up_its_place(self):
+        """Test that a cancelled request neither holds a place nor leaks a slot."""
+        scheduler = ExecutionScheduler(max_concurrent=1)
+        admitted = []
+        await scheduler.acquire("alice")
+
+        cancelled = await enqueue(scheduler, admitted, "cancelled", "bob")
+        task = await enqueue(scheduler, admitted, "next", "carol")
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        scheduler.release("alice")
+        await asyncio.wait_for(task, timeout=1)
+
+        assert admitted == ["next"]
+        assert scheduler.get_stats()["running"] == 1
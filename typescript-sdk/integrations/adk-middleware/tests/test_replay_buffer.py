@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+"""Tests for resumable runs and slow clients backed by the replay buffer."""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+
+from ag_ui.core import (
+    RunAgentInput, EventType, UserMessage,
+    RunStartedEvent, RunFinishedEvent, TextMessageContentEvent,
+    BoundedEventQueue, EventQueueOverflow, OverflowPolicy
+)
+from adk_middleware import ADKAgent, SessionManager
+from adk_middleware.replay_buffer import ReplayBuffer, FollowerFellBehind
+
+
+def content(delta):
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg", delta=delta)
+
+
+class TestReplayBuffer:
+    """Test cases for ReplayBuffer."""
+
+    @pytest.mark.asyncio
+    async def test_sequence_ids_and_replay(self):
+        """Test that events get consecutive ids and can be replayed from any offset."""
+        buffer = ReplayBuffer("thread", "run")
+        assert [await buffer.append(content(str(i))) for i in range(3)] == [1, 2, 3]
+        await buffer.close()
+
+        replayed = [(seq, event.delta) async for seq, event in buffer.follow(1)]
+        assert replayed == [(2, "1"), (3, "2")]
+        assert [seq async for seq, _ in buffer.follow(3)] == []
+
+    @pytest.mark.asyncio
+    async def test_follow_waits_for_live_events(self):
+        """Test that a follower receives events appended after it attached."""
+        buffer = ReplayBuffer("thread", "run")
+        await buffer.append(content("a"))
+
+        async def collect():
+            return [event.delta async for _, event in buffer.follow()]
+
+        follower = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        await buffer.append(content("b"))
+        await buffer.close()
+
+        assert await asyncio.wait_for(follower, timeout=1) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_evicted_events_cannot_be_replayed(self):
+        """Test that the buffer is bounded and refuses to replay evicted events."""
+        buffer = ReplayBuffer("thread", "run", max_events=2)
+        for i in range(4):
+            await buffer.append(content(str(i)))
+        await buffer.close()
+
+        assert [seq async for seq, _ in buffer.follow(2)] == [3, 4]
+        with pytest.raises(ValueError, match="no longer buffered"):
+            async for _ in buffer.follow(1):
+                pass
+        with pytest.raises(ValueError, match="was not emitted"):
+            async for _ in buffer.follow(5):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_follower_falling_behind(self):
+        """Test that a live follower whose next event was evicted gets FollowerFellBehind."""
+        buffer = ReplayBuffer("thread", "run", max_events=2)
+        await buffer.append(content("a"))
+        follower = buffer.follow()
+        assert (await follower.__anext__())[0] == 1
+
+        for delta in "bcd":
+            await buffer.append(content(delta))
+
+        with pytest.raises(FollowerFellBehind):
+            await follower.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_backpressure_waits_for_followers(self):
+        """Test that append waits instead of evicting events a follower has not read."""
+        buffer = ReplayBuffer("thread", "run", max_events=2, backpressure=True)
+        follower = buffer.follow()
+        await buffer.append(content("a"))
+        await buffer.append(content("b"))
+        assert (await follower.__anext__())[0] == 1
+
+        producer = asyncio.create_task(buffer.append(content("c")))
+        await asyncio.sleep(0)
+        assert not producer.done()
+
+        assert (await follower.__anext__())[0] == 2
+        assert (await follower.__anext__())[0] == 3
+        assert await asyncio.wait_for(producer, timeout=1) == 3
+
+        # Detached followers no longer hold the run back
+        await follower.aclose()
+        await asyncio.wait_for(buffer.append(content("d")), timeout=1)
+
+    def test_invalid_size(self):
+        """Test that the buffer size must be positive."""
+        with pytest.raises(ValueError):
+            ReplayBuffer("thread", "run", max_events=0)
+
+
+class TestResumableRuns:
+    """Test cases for resuming ADKAgent runs with a Last-Event-ID."""
+
+    @pytest.fixture(autouse=True)
+    def reset_session_manager(self):
+        """Reset session manager before each test."""
+        SessionManager.reset_instance()
+        yield
+        SessionManager.reset_instance()
+
+    @pytest.fixture
+    def adk_agent(self):
+        """Create an ADKAgent instance."""
+        return ADKAgent(app_name="test_app", user_id="test_user", use_in_memory_services=True)
+
+    @pytest.fixture
+    def sample_input(self):
+        """Create a sample RunAgentInput."""
+        return RunAgentInput(
+            thread_id="test_thread",
+            run_id="test_run",
+            messages=[UserMessage(id="msg1", role="user", content="Hello")],
+            context=[],
+            state={},
+            tools=[],
+            forwarded_props={}
+        )
+
+    @pytest.mark.asyncio
+    async def test_run_survives_disconnect_and_resumes(self, adk_agent, sample_input):
+        """Test that a dropped client can reattach without rerunning the agent."""
+        release = asyncio.Event()
+        runs = []
+
+        async def mock_run_events(input, agent_id):
+            runs.append(input.run_id)
+            yield RunStartedEvent(type=EventType.RUN_STARTED, thread_id=input.thread_id, run_id=input.run_id)
+            yield content("Hel")
+            await release.wait()
+            yield content("lo")
+            yield RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id=input.thread_id, run_id=input.run_id)
+
+        with patch.object(adk_agent, '_run_events', side_effect=mock_run_events):
+            # The client drops after the first two events
+            stream = adk_agent.run(sample_input)
+            first = [await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+
+            release.set()
+            resumed = [event async for event in adk_agent.run(sample_input, last_event_id=2)]
+
+        assert [event.type for event in first] == [EventType.RUN_STARTED, EventType.TEXT_MESSAGE_CONTENT]
+        assert [event.type for event in resumed] == [EventType.TEXT_MESSAGE_CONTENT, EventType.RUN_FINISHED]
+        assert resumed[0].delta == "lo"
+        assert runs == ["test_run"]
+
+    @pytest.mark.asyncio
+    async def test_resumed_client_falling_behind(self, adk_agent, sample_input):
+        """Test that a resumed client that falls behind the run gets a RUN_ERROR."""
+        buffer = adk_agent._replay_buffers["test_thread"] = ReplayBuffer("test_thread", "test_run", max_events=2)
+        await buffer.append(content("a"))
+        await buffer.append(content("b"))
+
+        stream = adk_agent.run(sample_input, last_event_id=1)
+        events = [await stream.__anext__()]
+        for delta in "cde":
+            await buffer.append(content(delta))
+        events.extend([event async for event in stream])
+
+        assert events[0].delta == "b"
+        assert events[-1].type == EventType.RUN_ERROR
+        assert events[-1].code == "SLOW_CONSUMER"
+
+    @pytest.mark.asyncio
+    async def test_unknown_run_is_not_resumable(self, adk_agent, sample_input):
+        """Test that resuming a run without a replay buffer yields a RUN_ERROR."""
+        events = [event async for event in adk_agent.run(sample_input, last_event_id=3)]
+
+        assert len(events) == 1
+        assert events[0].type == EventType.RUN_ERROR
+        assert events[0].code == "RUN_NOT_RESUMABLE"
+
+    @pytest.mark.asyncio
+    async def test_close_stops_recording_runs(self, adk_agent, sample_input):
+        """Test that close cancels runs no client is listening to anymore."""
+        async def mock_run_events(input, agent_id):
+            yield content("a")
+            await asyncio.sleep(60)
+
+        with patch.object(adk_agent, '_run_events', side_effect=mock_run_events):
+            stream = adk_agent.run(sample_input)
+            await stream.__anext__()
+            await stream.aclose()
+
+            await asyncio.wait_for(adk_agent.close(), timeout=1)
+
+        assert not adk_agent._run_tasks
+        assert not adk_agent._replay_buffers
+
+
+class TestSlowConsumers:
+    """Test cases for the backpressure policy applied to slow clients."""
+
+    @pytest.fixture(autouse=True)
+    def reset_session_manager(self):
+        """Reset session manager before each test."""
+        SessionManager.reset_instance()
+        yield
+        SessionManager.reset_instance()
+
+    @pytest.fixture
+    def sample_input(self):
+        """Create a sample RunAgentInput."""
+        return RunAgentInput(
+            thread_id="test_thread",
+            run_id="test_run",
+            messages=[UserMessage(id="msg1", role="user", content="Hello")],
+            context=[],
+            state={},
+            tools=[],
+            forwarded_props={}
+        )
+
+    async def read_slowly(self, adk_agent, sample_input):
+        async def mock_run_events(input, agent_id):
+            for i in range(5):
+                yield content(str(i))
+
+        with patch.object(adk_agent, '_run_events', side_effect=mock_run_events):
+            stream = adk_agent.run(sample_input)
+            events = [await stream.__anext__()]
+            # Let the run get ahead of the client
+            await asyncio.sleep(0.05)
+            events.extend([event async for event in stream])
+        return events
+
+    @pytest.mark.asyncio
+    async def test_block_policy_delivers_every_event(self, sample_input):
+        """Test that a slow client holds the run back instead of losing events."""
+        adk_agent = ADKAgent(app_name="test_app", user_id="test_user", replay_buffer_size=2)
+
+        events = await self.read_slowly(adk_agent, sample_input)
+
+        assert [event.delta for event in events] == ["0", "1", "2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_drop_policy_ends_stream_with_run_error(self, sample_input):
+        """Test that a client falling behind under the drop policy gets a RUN_ERROR."""
+        adk_agent = ADKAgent(
+            app_name="test_app", user_id="test_user", replay_buffer_size=2, event_queue_policy="drop"
+        )
+
+        events = await self.read_slowly(adk_agent, sample_input)
+
+        assert len(events) < 5
+        assert events[-1].type == EventType.RUN_ERROR
+        assert events[-1].code == "SLOW_CONSUMER"
+
+    def test_event_queue_stats(self):
+        """Test that finished run queues are folded into the agent metrics."""
+        adk_agent = ADKAgent(app_name="test_app", user_id="test_user")
+        queue = BoundedEventQueue(maxsize=1, policy=OverflowPolicy.DROP)
+        queue.put_nowait(content("a"))
+        with pytest.raises(EventQueueOverflow):
+            queue.put_nowait(content("b"))
+
+        adk_agent._record_event_queue_stats(queue)
+
+        assert adk_agent.get_event_queue_stats() == {
+            "high_water_mark": 1, "coalesced": 0, "dropped": 2, "overflows": 1, "max_depth": 0
+        }
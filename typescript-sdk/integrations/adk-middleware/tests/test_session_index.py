@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+"""Test the session and expiry indexes maintained by SessionManager."""
+
+import pytest
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+from adk_middleware import SessionManager
+
+
+class TestSessionIndex:
+    """Test cases for SessionManager session lookups."""
+
+    @pytest.fixture(autouse=True)
+    def reset_session_manager(self):
+        """Reset session manager before each test."""
+        SessionManager.reset_instance()
+        yield
+        SessionManager.reset_instance()
+
+    @pytest.fixture
+    def mock_session_service(self):
+        """Create a mock session service."""
+        service = AsyncMock()
+        service.get_session = AsyncMock()
+        service.delete_session = AsyncMock()
+        return service
+
+    @pytest.fixture
+    def manager(self, mock_session_service):
+        """Create a session manager instance."""
+        return SessionManager.get_instance(
+            session_service=mock_session_service,
+            auto_cleanup=False
+        )
+
+    def test_find_session(self, manager):
+        """Test looking up app and user of a tracked session."""
+        manager._track_session("app1:thread_1", "alice")
+        manager._track_session("app2:thread_1", "bob")
+        manager._track_session("app1:thread_2", "alice")
+
+        assert manager.find_session("thread_1", app_name="app1") == ("app1", "alice")
+        assert manager.find_session("thread_1", app_name="app2") == ("app2", "bob")
+        assert manager.find_session("thread_1") in {("app1", "alice"), ("app2", "bob")}
+        assert manager.find_session("thread_1", app_name="app3") is None
+        assert manager.find_session("missing") is None
+
+        assert manager.get_session_owner("app1:thread_2") == "alice"
+        assert manager.get_session_owner("app1:missing") is None
+        assert manager.get_user_session_keys("alice") == {"app1:thread_1", "app1:thread_2"}
+        assert manager.get_user_session_keys("nobody") == frozenset()
+
+    def test_untrack_session_updates_indexes(self, manager):
+        """Test that untracking removes the session from every index."""
+        manager._track_session("app1:thread_1", "alice")
+        manager._untrack_session("app1:thread_1", "alice")
+
+        assert manager.find_session("thread_1") is None
+        assert manager.get_session_owner("app1:thread_1") is None
+        assert manager._session_index == {}
+        assert manager._user_sessions == {}
+        assert manager.get_session_count() == 0
+
+    def test_retracking_moves_session_to_new_owner(self, manager):
+        """Test that a session key is owned by exactly one user."""
+        manager._track_session("app1:thread_1", "alice")
+        manager._track_session("app1:thread_1", "bob")
+
+        assert manager.find_session("thread_1") == ("app1", "bob")
+        assert manager.get_user_session_count("alice") == 0
+        assert manager.get_user_session_count("bob") == 1
+
+    @pytest.mark.asyncio
+    async def test_cleanup_uses_session_owner(self, manager, mock_session_service):
+        """Test that cleanup fetches each session with its owning user."""
+        session = MagicMock()
+        session.id = "thread_1"
+        session.app_name = "app1"
+        session.user_id = "alice"
+        session.state = {}
+        session.last_update_time = time.time() - 10_000
+        mock_session_service.get_session.return_value = session
+
+        manager._track_session("app1:thread_1", "alice")
+        await manager._cleanup_expired_sessions()
+
+        mock_session_service.get_session.assert_called_once_with(
+            session_id="thread_1", app_name="app1", user_id="alice"
+        )
+        assert manager.find_session("thread_1") is None
+
+
+class TestExpiryIndex:
+    """Test cases for the expiry index driving session cleanup."""
+
+    @pytest.fixture(autouse=True)
+    def reset_session_manager(self):
+        """Reset session manager before each test."""
+        SessionManager.reset_instance()
+        yield
+        SessionManager.reset_instance()
+
+    @pytest.fixture
+    def mock_session_service(self):
+        """Create a mock session service."""
+        service = AsyncMock()
+        service.get_session = AsyncMock()
+        service.delete_session = AsyncMock()
+        return service
+
+    @pytest.fixture
+    def manager(self, mock_session_service):
+        """Create a session manager with a 100 second timeout."""
+        return SessionManager.get_instance(
+            session_service=mock_session_service,
+            session_timeout_seconds=100,
+            cleanup_interval_seconds=10,
+            auto_cleanup=False
+        )
+
+    def make_session(self, session_id, last_update_time):
+        session = MagicMock()
+        session.id = session_id
+        session.app_name = "app"
+        session.user_id = "alice"
+        session.state = {}
+        session.last_update_time = last_update_time
+        return session
+
+    @pytest.mark.asyncio
+    async def test_cleanup_only_fetches_due_sessions(self, manager, mock_session_service):
+        """Test that sessions far from expiry are not fetched."""
+        now = time.time()
+        manager._track_session("app:fresh", "alice", last_update_time=now)
+        manager._track_session("app:stale", "alice", last_update_time=now - 500)
+        mock_session_service.get_session.return_value = self.make_session("stale", now - 500)
+
+        await manager._cleanup_expired_sessions()
+
+        mock_session_service.get_session.assert_called_once_with(
+            session_id="stale", app_name="app", user_id="alice"
+        )
+        mock_session_service.delete_session.assert_called_once()
+        assert manager.find_session("fresh") == ("app", "alice")
+        assert manager.find_session("stale") is None
+
+    @pytest.mark.asyncio
+    async def test_recently_updated_session_is_rescheduled(self, manager, mock_session_service):
+        """Test that a due session updated elsewhere is rescheduled, not deleted."""
+        now = time.time()
+        manager._track_session("app:thread", "alice", last_update_time=now - 500)
+        mock_session_service.get_session.return_value = self.make_session("thread", now - 5)
+
+        await manager._cleanup_expired_sessions()
+        await manager._cleanup_expired_sessions()
+
+        assert mock_session_service.get_session.call_count == 1
+        mock_session_service.delete_session.assert_not_called()
+        assert manager._expiry_deadlines["app:thread"] == pytest.approx(now + 95)
+
+    @pytest.mark.asyncio
+    async def test_touch_session_postpones_expiry(self, manager, mock_session_service):
+        """Test that touching a session removes it from the next cleanup pass."""
+        manager._track_session("app:thread", "alice")
+        manager.touch_session("thread", "app")
+        manager.touch_session("unknown", "app")
+
+        await manager._cleanup_expired_sessions()
+
+        mock_session_service.get_session.assert_not_called()
+        assert "app:unknown" not in manager._expiry_deadlines
+
+    def test_untrack_invalidates_heap_entries(self, manager):
+        """Test that untracked sessions leave no live deadline behind."""
+        for i in range(200):
+            manager._track_session(f"app:thread_{i}", "alice")
+            manager.touch_session(f"thread_{i}", "app")
+            manager._untrack_session(f"app:thread_{i}", "alice")
+
+        assert manager._expiry_deadlines == {}
+        assert len(manager._expiry_heap) <= 64
+
+
+class TestSharedInstance:
+    """Test cases for sharing one SessionManager across ADKAgents."""
+
+    @pytest.fixture(autouse=True)
+    def reset_session_manager(self):
+        """Reset session manager before each test."""
+        SessionManager.reset_instance()
+        yield
+        SessionManager.reset_instance()
+
+    def test_differing_configuration_is_reported(self, caplog):
+        """Test that configuration ignored by the shared instance is logged."""
+        service = AsyncMock()
+        manager = SessionManager.get_instance(
+            session_service=service, session_timeout_seconds=100, auto_cleanup=False
+        )
+
+        with caplog.at_level("WARNING", logger="adk_middleware.session_manager"):
+            assert SessionManager.get_instance(session_service=service, session_timeout_seconds=100) is manager
+            assert SessionManager.get_instance() is manager
+            assert not caplog.records
+
+            SessionManager.get_instance(session_service=AsyncMock(), session_timeout_seconds=50)
+
+        assert "session_service, session_timeout_seconds" in caplog.text
+        assert manager._timeout == 100
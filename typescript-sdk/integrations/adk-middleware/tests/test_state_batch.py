@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Test the per-run write-back state cache and client state sync of SessionManager."""
+
+import pytest
+from unittest.mock import patch
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+
+from adk_middleware import SessionManager
+
+
+class TestStateBatch:
+    """Test cases for begin/flush/end_state_batch."""
+
+    @pytest.fixture(autouse=True)
+    def reset_session_manager(self):
+        """Reset session manager before each test."""
+        SessionManager.reset_instance()
+        yield
+        SessionManager.reset_instance()
+
+    @pytest.fixture
+    def session_service(self):
+        """Create a real in-memory session service."""
+        return InMemorySessionService()
+
+    @pytest.fixture
+    def manager(self, session_service):
+        """Create a session manager instance."""
+        return SessionManager.get_instance(session_service=session_service, auto_cleanup=False)
+
+    async def stored_state(self, session_service):
+        session = await session_service.get_session(app_name="app", user_id="user", session_id="thread")
+        return dict(session.state)
+
+    @pytest.mark.asyncio
+    async def test_batch_serves_reads_and_coalesces_writes(self, manager, session_service):
+        """Test that a batch reads the session once and writes a single event."""
+        manager.begin_state_batch("thread", "app", "user")
+        await manager.get_or_create_session("thread", "app", "user", initial_state={"count": 0})
+
+        with patch.object(session_service, 'get_session', wraps=session_service.get_session) as get_session, \
+             patch.object(session_service, 'append_event', wraps=session_service.append_event) as append_event:
+            assert await manager.update_session_state("thread", "app", "user", {"count": 1})
+            assert await manager.set_state_value("thread", "app", "user", "pending_tool_calls", ["call_1"])
+            assert await manager.get_state_value("thread", "app", "user", "count") == 1
+            assert await manager.get_session_state("thread", "app", "user") == {
+                "count": 1, "pending_tool_calls": ["call_1"]
+            }
+            get_session.assert_not_called()
+            append_event.assert_not_called()
+
+            assert await manager.end_state_batch("thread", "app")
+            assert append_event.call_count == 1
+
+        assert await self.stored_state(session_service) == {"count": 1, "pending_tool_calls": ["call_1"]}
+        assert manager._state_batches == {}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_state_written_by_others(self, manager, session_service):
+        """Test that invalidating a batch picks up changes made outside of it."""
+        await manager.get_or_create_session("thread", "app", "user", initial_state={"count": 0})
+        manager.begin_state_batch("thread", "app", "user")
+
+        await manager.update_session_state("thread", "app", "user", {"count": 1})
+        assert await manager.flush_state_batch("thread", "app", invalidate=True)
+        assert await self.stored_state(session_service) == {"count": 1}
+
+        # Another writer (e.g. the ADK runner) appends to the session
+        session = await session_service.get_session(app_name="app", user_id="user", session_id="thread")
+        await session_service.append_event(session, Event(
+            author="agent", invocation_id="run", actions=EventActions(state_delta={"count": 2})
+        ))
+
+        assert await manager.get_state_value("thread", "app", "user", "count") == 2
+        await manager.set_state_value("thread", "app", "user", "done", True)
+        assert await manager.end_state_batch("thread", "app")
+        assert await self.stored_state(session_service) == {"count": 2, "done": True}
+
+    @pytest.mark.asyncio
+    async def test_nested_batches_flush_on_last_end(self, manager, session_service):
+        """Test that nested batches share one cache released by the outermost end."""
+        await manager.get_or_create_session("thread", "app", "user")
+        manager.begin_state_batch("thread", "app", "user")
+        manager.begin_state_batch("thread", "app", "user")
+
+        await manager.set_state_value("thread", "app", "user", "key", "value")
+        await manager.end_state_batch("thread", "app")
+        assert "app:thread" in manager._state_batches
+        await manager.end_state_batch("thread", "app")
+
+        assert manager._state_batches == {}
+        assert await self.stored_state(session_service) == {"key": "value"}
+
+    @pytest.mark.asyncio
+    async def test_missing_session_is_not_cached(self, manager):
+        """Test that a batch for a session that does not exist falls back to the service."""
+        manager.begin_state_batch("thread", "app", "user")
+
+        assert await manager.get_session_state("thread", "app", "user") is None
+        assert not await manager.update_session_state("thread", "app", "user", {"key": "value"})
+        assert await manager.end_state_batch("thread", "app")
+
+
+class TestSyncSessionState:
+    """Test cases for syncing client state into the session."""
+
+    @pytest.fixture(autouse=True)
+    def reset_session_manager(self):
+        """Reset session manager before each test."""
+        SessionManager.reset_instance()
+        yield
+        SessionManager.reset_instance()
+
+    @pytest.fixture
+    def session_service(self):
+        """Create a real in-memory session service."""
+        return InMemorySessionService()
+
+    @pytest.fixture
+    def manager(self, session_service):
+        """Create a session manager instance."""
+        return SessionManager.get_instance(session_service=session_service, auto_cleanup=False)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_state_appends_nothing(self, manager, session_service):
+        """Test that syncing an identical state does not append an event."""
+        await manager.get_or_create_session("thread", "app", "user", initial_state={"items": ["salt"], "n": 1})
+
+        with patch.object(session_service, 'append_event', wraps=session_service.append_event) as append_event:
+            assert await manager.sync_session_state("thread", "app", "user", {"items": ["salt"], "n": 1})
+            assert await manager.sync_session_state("thread", "app", "user", {})
+            append_event.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_only_changed_keys_are_written(self, manager, session_service):
+        """Test that the appended delta holds only the keys that differ."""
+        await manager.get_or_create_session("thread", "app", "user", initial_state={"items": ["salt"], "n": 1})
+
+        with patch.object(session_service, 'append_event', wraps=session_service.append_event) as append_event:
+            assert await manager.sync_session_state(
+                "thread", "app", "user", {"items": [], "n": 1, "new": None}
+            )
+            event = append_event.call_args[0][1]
+
+        assert event.actions.state_delta == {"items": [], "new": None}
+        session = await session_service.get_session(app_name="app", user_id="user", session_id="thread")
+        assert dict(session.state) == {"items": [], "n": 1, "new": None}
+
+    @pytest.mark.asyncio
+    async def test_missing_session(self, manager):
+        """Test that syncing into a missing session fails."""
+        assert not await manager.sync_session_state("thread", "app", "user", {"key": "value"})
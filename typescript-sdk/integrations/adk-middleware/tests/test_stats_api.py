@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""Test the shared stats API client of the examples against a local stub server."""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from examples.stats_api import StatsApiClient, StatsApiError, fan_out
+
+
+@pytest.fixture
+async def stub_server():
+    """Start a stub stats API with JSON, HTML, empty, flaky and slow responses."""
+    attempts = {"flaky": 0}
+
+    async def flaky(request):
+        attempts["flaky"] += 1
+        if attempts["flaky"] == 1:
+            return web.Response(status=503, text="Service Unavailable")
+        return web.json_response({"attempts": attempts["flaky"]})
+
+    async def slow(request):
+        await asyncio.sleep(5)
+        return web.json_response({})
+
+    async def teams(request):
+        return web.json_response([{"Name": "Penn State"}])
+
+    async def html(request):
+        return web.Response(text="<html><body>Service Unavailable</body></html>", content_type="text/html")
+
+    async def empty(request):
+        return web.Response(status=200)
+
+    app = web.Application()
+    app.router.add_get("/teams", teams)
+    app.router.add_get("/html", html)
+    app.router.add_get("/empty", empty)
+    app.router.add_get("/flaky", flaky)
+    app.router.add_get("/slow", slow)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def client(stub_server):
+    """Create a client for the stub server."""
+    client = StatsApiClient(base_url=str(stub_server.make_url("")), max_retries=0)
+    yield client
+    await client.close()
+
+
+class TestStatsApiClient:
+    """Test cases for StatsApiClient."""
+
+    async def test_decodes_json(self, client):
+        """Test that a JSON response is decoded."""
+        assert await client.get("/teams") == [{"Name": "Penn State"}]
+
+    @pytest.mark.parametrize("path", ["/html", "/empty"])
+    async def test_non_json_body_raises_stats_api_error(self, client, path):
+        """Test that a body that is not JSON raises StatsApiError instead of a decode error."""
+        with pytest.raises(StatsApiError) as exc_info:
+            await client.get(path)
+
+        assert exc_info.value.status == 200
+
+    async def test_fan_out_reports_non_json_body(self, client):
+        """Test that fan_out reports a non-JSON response as an error of its call."""
+        results, errors = await fan_out({
+            "teams": client.get("/teams"),
+            "html": client.get("/html"),
+        })
+
+        assert results == {"teams": [{"Name": "Penn State"}]}
+        assert isinstance(errors["html"], StatsApiError)
+
+    async def test_retries_retryable_status(self, stub_server):
+        """Test that a 503 is retried and the later answer returned."""
+        client = StatsApiClient(base_url=str(stub_server.make_url("")), max_retries=1, backoff_seconds=0.01)
+        try:
+            assert await client.get("/flaky") == {"attempts": 2}
+        finally:
+            await client.close()
+
+    async def test_error_status_raises_stats_api_error(self, client):
+        """Test that an error status without retries left raises StatsApiError."""
+        with pytest.raises(StatsApiError) as exc_info:
+            await client.get("/flaky")
+
+        assert exc_info.value.status == 503
+
+    async def test_fan_out_deadline(self, client):
+        """Test that fan_out keeps the calls that finished and times out the rest."""
+        results, errors = await asyncio.wait_for(fan_out({
+            "teams": client.get("/teams"),
+            "slow": client.get("/slow"),
+        }, timeout=0.2), timeout=2)
+
+        assert results == {"teams": [{"Name": "Penn State"}]}
+        assert isinstance(errors["slow"], asyncio.TimeoutError)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+"""Test running backend tools on the tool thread pool and within the tool timeout."""
+
+import pytest
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ag_ui.core import EventType, RunAgentInput, Tool as AGUITool, UserMessage
+from google.adk.agents import Agent
+from google.adk.events import Event
+from google.adk.tools import FunctionTool
+from google.genai import types
+
+from adk_middleware import ADKAgent, AgentRegistry, SessionManager
+from adk_middleware.client_proxy_tool import ClientProxyTool
+from adk_middleware.tool_executor import ToolExecutor, ToolTimeoutError
+
+
+def lookup_player(name: str) -> dict:
+    """Look up a player by name."""
+    time.sleep(0.2)
+    return {"name": name, "thread": threading.current_thread().name}
+
+
+async def lookup_team(name: str) -> dict:
+    """Look up a team by name."""
+    return {"name": name}
+
+
+class TestToolExecutor:
+    """Test cases for ToolExecutor."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create a tool executor."""
+        executor = ToolExecutor(max_workers=4, timeout_seconds=5, max_concurrent_per_tool={"lookup_player": 1})
+        yield executor
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_sync_tool_does_not_block_the_loop(self, executor):
+        """Test that the event loop keeps running while a synchronous tool works."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        result = await executor.wrap("lookup_player", lookup_player)(name="Ada")
+        ticking.cancel()
+
+        assert result["name"] == "Ada"
+        assert result["thread"].startswith("adk-tool")
+        assert ticks >= 5
+        assert executor.get_stats() == {"calls": 1, "timeouts": 0, "running": {}}
+
+    @pytest.mark.asyncio
+    async def test_per_tool_limit(self, executor):
+        """Test that a limited tool runs its calls one at a time while others proceed."""
+        running = {"lookup_player": 0, "other": 0}
+        peak = {"lookup_player": 0, "other": 0}
+        lock = threading.Lock()
+
+        def tool(name):
+            with lock:
+                running[name] += 1
+                peak[name] = max(peak[name], running[name])
+            time.sleep(0.05)
+            with lock:
+                running[name] -= 1
+
+        await asyncio.gather(
+            *[executor.run("lookup_player", tool, "lookup_player") for _ in range(3)],
+            *[executor.run("other", tool, "other") for _ in range(3)]
+        )
+
+        assert peak["lookup_player"] == 1
+        assert peak["other"] > 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_slot_until_thread_returns(self):
+        """Test that a timed out call fails but still counts against its tool's limit."""
+        executor = ToolExecutor(max_workers=2, timeout_seconds=0.05, max_concurrent_per_tool={"lookup_player": 1})
+
+        with pytest.raises(ToolTimeoutError, match="lookup_player"):
+            await executor.run("lookup_player", lookup_player, "Ada")
+        assert executor.get_stats()["running"] == {"lookup_player": 1}
+
+        await asyncio.sleep(0.3)
+        assert executor.get_stats() == {"calls": 1, "timeouts": 1, "running": {}}
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_async_tool_is_cancelled_at_deadline(self):
+        """Test that an async tool past the timeout is cancelled and reported."""
+        executor = ToolExecutor(max_workers=0, timeout_seconds=0.05)
+        cancelled = False
+
+        async def slow_tool():
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        with pytest.raises(ToolTimeoutError) as exc_info:
+            await executor.wrap("slow_tool", slow_tool)()
+
+        assert exc_info.value.tool_name == "slow_tool"
+        assert exc_info.value.timeout == 0.05
+        assert cancelled
+        assert executor.get_stats() == {"calls": 1, "timeouts": 1, "running": {}}
+
+    def test_guard_tool(self, executor):
+        """Test that function tools are wrapped and keep their declaration."""
+        function_tool = FunctionTool(lookup_player)
+        guarded = executor.guard_tool(function_tool)
+        assert guarded is not function_tool
+        assert function_tool.func is lookup_player
+        assert asyncio.iscoroutinefunction(guarded.func)
+        assert guarded.name == "lookup_player"
+        assert guarded._get_declaration() == function_tool._get_declaration()
+
+        wrapped = executor.guard_tool(lookup_player)
+        assert wrapped.__name__ == "lookup_player"
+        assert FunctionTool(wrapped)._get_declaration() == function_tool._get_declaration()
+
+        async_tool = FunctionTool(lookup_team)
+        assert executor.guard_tool(async_tool) is not async_tool
+        assert executor.guard_tool(async_tool)._get_declaration() == async_tool._get_declaration()
+
+        unbounded = ToolExecutor(max_workers=0, timeout_seconds=None)
+        assert unbounded.guard_tool(async_tool) is async_tool
+        assert unbounded.guard_tool(lookup_player) is lookup_player
+
+
+class TestGuardedAgents:
+    """Test cases for guarding the tools of registered agents."""
+
+    @pytest.fixture(autouse=True)
+    def reset_registry(self):
+        """Reset agent registry before each test."""
+        AgentRegistry.reset_instance()
+        yield
+        AgentRegistry.reset_instance()
+
+    def test_agent_tree_is_copied_once(self):
+        """Test that an agent tree with function tools is copied with links intact."""
+        scout = Agent(name="scout", instruction="Scout.", tools=[lookup_player])
+        coach = Agent(name="coach", instruction="Coach.", tools=[lookup_team], sub_agents=[scout])
+        AgentRegistry.get_instance().register_agent("coach", coach)
+        adk_agent = ADKAgent(app_name="test_app", user_id="test_user")
+
+        guarded = adk_agent._get_guarded_agent("coach", coach)
+
+        assert guarded is not coach
+        assert guarded.tools[0].__name__ == "lookup_team"
+        assert guarded.tools[0] is not lookup_team
+        guarded_scout = guarded.sub_agents[0]
+        assert guarded_scout.parent_agent is guarded
+        assert asyncio.iscoroutinefunction(guarded_scout.tools[0])
+        assert scout.tools == [lookup_player]
+        assert scout.parent_agent is coach
+        assert adk_agent._get_guarded_agent("coach", coach) is guarded
+
+    def test_agent_without_guarded_tools_is_used_as_is(self):
+        """Test that agents whose tools need no wrapping are not copied."""
+        team_agent = Agent(name="team", instruction="Teams.", tools=[lookup_team])
+        scout = Agent(name="scout", instruction="Scout.", tools=[lookup_player])
+
+        unbounded = ADKAgent(app_name="test_app", user_id="test_user", tool_timeout_seconds=None)
+        assert unbounded._get_guarded_agent("team", team_agent) is team_agent
+        disabled = ADKAgent(
+            app_name="test_app", user_id="test_user", tool_thread_pool_size=0, tool_timeout_seconds=None
+        )
+        assert disabled._get_guarded_agent("scout", scout) is scout
+        assert disabled.get_tool_executor_stats() == {"calls": 0, "timeouts": 0, "running": {}}
+
+
+class TestToolTimeouts:
+    """Test cases for runs whose tool call times out."""
+
+    @pytest.fixture(autouse=True)
+    def reset_singletons(self):
+        """Reset agent registry and session manager before each test."""
+        AgentRegistry.reset_instance()
+        SessionManager.reset_instance()
+        yield
+        AgentRegistry.reset_instance()
+        SessionManager.reset_instance()
+
+    @pytest.mark.asyncio
+    async def test_client_proxy_tool_timeout(self):
+        """Test that a client tool that cannot emit its call in time raises ToolTimeoutError."""
+        event_queue = MagicMock()
+
+        async def blocked_put(event):
+            await asyncio.sleep(5)
+
+        event_queue.put = blocked_put
+        proxy_tool = ClientProxyTool(
+            ag_ui_tool=AGUITool(name="confirm", description="Confirm.", parameters={"type": "object", "properties": {}}),
+            event_queue=event_queue,
+            timeout_seconds=0.05
+        )
+
+        with pytest.raises(ToolTimeoutError, match="confirm"):
+            await proxy_tool.run_async(args={}, tool_context=MagicMock(function_call_id="call_1"))
+
+    @pytest.mark.asyncio
+    async def test_run_reports_tool_timeout(self):
+        """Test that a timed out tool call gets an error result and the run a RUN_ERROR."""
+        AgentRegistry.get_instance().set_default_agent(Agent(name="coach", instruction="Coach."))
+        adk_agent = ADKAgent(app_name="test_app", user_id="test_user", tool_timeout_seconds=0.05)
+
+        call_event = Event(
+            author="coach",
+            content=types.Content(role="model", parts=[
+                types.Part(function_call=types.FunctionCall(id="call_1", name="lookup_player", args={"name": "Ada"}))
+            ])
+        )
+
+        async def run_async(*args, **kwargs):
+            yield call_event
+            raise ToolTimeoutError("lookup_player", 0.05)
+
+        runner = AsyncMock()
+        runner.run_async = run_async
+        run_input = RunAgentInput(
+            thread_id="thread", run_id="run",
+            messages=[UserMessage(id="msg1", role="user", content="Find Ada")],
+            context=[], state={}, tools=[], forwarded_props={}
+        )
+
+        with patch.object(adk_agent, '_create_runner', return_value=runner):
+            events = [event async for event in adk_agent.run(run_input)]
+
+        results = [event for event in events if event.type == EventType.TOOL_CALL_RESULT]
+        assert len(results) == 1
+        assert results[0].tool_call_id == "call_1"
+        assert json.loads(results[0].content)["code"] == "TOOL_TIMEOUT"
+        errors = [event for event in events if event.type == EventType.RUN_ERROR]
+        assert [error.code for error in errors] == ["TOOL_TIMEOUT"]
+        assert events.index(results[0]) < events.index(errors[0])
+        await adk_agent.close()
@@ -24,7 +24,12 @@ from ag_ui.core import (
     RunFinishedEvent,
     RunErrorEvent,
     Message,
-    Tool
+    Tool,
+    CoalescePolicy,
+    coalesce_deltas,
+    BoundedEventQueue,
+    EventQueueOverflow,
+    OverflowPolicy,
 )
 from ag_ui.core.events import (
   TextMessageChunkEvent,
@@ -35,7 +40,7 @@ from ag_ui.core.events import (
   StateSnapshotEvent,
   CustomEvent,
 )
-from ag_ui.encoder import EventEncoder
+from ag_ui.encoder import EventEncoder, FlushPolicy, batch_frames
 
 from .events import (
   BridgedTextMessageChunkEvent,
@@ -51,15 +56,37 @@ QUEUES = {}
 QUEUES_LOCK = asyncio.Lock()
 
 
-async def create_queue(flow: object) -> asyncio.Queue:
-    """Create a queue for a flow."""
+async def create_queue(
+    flow: object,
+    maxsize: int = 1000,
+    policy: OverflowPolicy = OverflowPolicy.COALESCE,
+) -> BoundedEventQueue:
+    """Create a bounded queue for a flow."""
     queue_id = id(flow)
     async with QUEUES_LOCK:
-        queue = asyncio.Queue()
+        queue = BoundedEventQueue(maxsize=maxsize, policy=policy)
         QUEUES[queue_id] = queue
         return queue
 
 
+def put_event(flow: object, event: Optional[object]) -> None:
+    """Put an event into the queue of a flow without blocking the event bus.
+
+    Event bus handlers cannot wait for a slow client, so an event that does not
+    fit into the full queue overflows it: the client receives a RUN_ERROR and
+    the remaining events of the flow are dropped.
+    """
+    queue = get_queue(flow)
+    if queue is None:
+        return
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        queue.overflow()
+    except EventQueueOverflow:
+        pass
+
+
 def get_queue(flow: object) -> Optional[asyncio.Queue]:
     """Get the queue for a flow."""
     queue_id = id(flow)
@@ -82,57 +109,56 @@ class FastAPICrewFlowEventListener(BaseEventListener):
         """Setup listeners for the FastAPI CrewFlow event listener"""
         @crewai_event_bus.on(FlowStartedEvent)
         def _(source, event):  # pylint: disable=unused-argument
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
-                    RunStartedEvent(
-                        type=EventType.RUN_STARTED,
-                         # will be replaced by the correct thread_id/run_id when sending the event
-                        thread_id="?",
-                        run_id="?",
-                    ),
+            put_event(
+                source,
+                RunStartedEvent(
+                    type=EventType.RUN_STARTED,
+                     # will be replaced by the correct thread_id/run_id when sending the event
+                    thread_id="?",
+                    run_id="?",
                 )
+            )
         @crewai_event_bus.on(FlowFinishedEvent)
         def _(source, event):  # pylint: disable=unused-argument
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
-                    RunFinishedEvent(
-                        type=EventType.RUN_FINISHED,
-                        thread_id="?",
-                        run_id="?",
-                    ),
-                )
-                queue.put_nowait(None)
+            put_event(
+                source,
+                RunFinishedEvent(
+                    type=EventType.RUN_FINISHED,
+                    thread_id="?",
+                    run_id="?",
+                ),
+            )
+            put_event(source, None)
         @crewai_event_bus.on(MethodExecutionStartedEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
-                    StepStartedEvent(
-                        type=EventType.STEP_STARTED,
-                        step_name=event.method_name
-                    )
+            put_event(
+                source,
+                StepStartedEvent(
+                    type=EventType.STEP_STARTED,
+                    step_name=event.method_name
                 )
+            )
         @crewai_event_bus.on(MethodExecutionFinishedEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
+            if get_queue(source) is not None:
                 messages = litellm_messages_to_ag_ui_messages(source.state.messages)
 
-                queue.put_nowait(
+                put_event(
+                    source,
                     MessagesSnapshotEvent(
                         type=EventType.MESSAGES_SNAPSHOT,
                         messages=messages
                     )
                 )
-                queue.put_nowait(
+                put_event(
+                    source,
                     StateSnapshotEvent(
                         type=EventType.STATE_SNAPSHOT,
                         snapshot=source.state
                     )
                 )
-                queue.put_nowait(
+                put_event(
+                    source,
                     StepFinishedEvent(
                         type=EventType.STEP_FINISHED,
                         step_name=event.method_name
@@ -140,52 +166,62 @@ class FastAPICrewFlowEventListener(BaseEventListener):
                 )
         @crewai_event_bus.on(BridgedTextMessageChunkEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
-                    TextMessageChunkEvent(
-                        type=EventType.TEXT_MESSAGE_CHUNK,
-                        message_id=event.message_id,
-                        role=event.role,
-                        delta=event.delta,
-                    )
+            put_event(
+                source,
+                TextMessageChunkEvent(
+                    type=EventType.TEXT_MESSAGE_CHUNK,
+                    message_id=event.message_id,
+                    role=event.role,
+                    delta=event.delta,
                 )
+            )
         @crewai_event_bus.on(BridgedToolCallChunkEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
-                    ToolCallChunkEvent(
-                        type=EventType.TOOL_CALL_CHUNK,
-                        tool_call_id=event.tool_call_id,
-                        tool_call_name=event.tool_call_name,
-                        delta=event.delta,
-                    )
+            put_event(
+                source,
+                ToolCallChunkEvent(
+                    type=EventType.TOOL_CALL_CHUNK,
+                    tool_call_id=event.tool_call_id,
+                    tool_call_name=event.tool_call_name,
+                    delta=event.delta,
                 )
+            )
         @crewai_event_bus.on(BridgedCustomEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
-                    CustomEvent(
-                        type=EventType.CUSTOM,
-                        name=event.name,
-                        value=event.value
-                    )
+            put_event(
+                source,
+                CustomEvent(
+                    type=EventType.CUSTOM,
+                    name=event.name,
+                    value=event.value
                 )
+            )
         @crewai_event_bus.on(BridgedStateSnapshotEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
-                    StateSnapshotEvent(
-                        type=EventType.STATE_SNAPSHOT,
-                        snapshot=event.snapshot
-                    )
+            put_event(
+                source,
+                StateSnapshotEvent(
+                    type=EventType.STATE_SNAPSHOT,
+                    snapshot=event.snapshot
                 )
+            )
+
+def add_crewai_flow_fastapi_endpoint(
+    app: FastAPI,
+    flow: Flow,
+    path: str = "/",
+    flush_policy: Optional[FlushPolicy] = None,
+    coalesce_policy: Optional[CoalescePolicy] = None,
+    max_queue_size: int = 1000,
+    queue_policy: OverflowPolicy = OverflowPolicy.COALESCE,
+):
+    """Adds a CrewAI endpoint to the FastAPI app.
 
-def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
-    """Adds a CrewAI endpoint to the FastAPI app."""
+    Pass a flush_policy to coalesce encoded events into fewer writes and a
+    coalesce_policy to merge consecutive text message and tool call chunk deltas.
+    At most max_queue_size events are buffered per request for a slow client;
+    queue_policy decides what happens to events that do not fit.
+    """
     global GLOBAL_EVENT_LISTENER # pylint: disable=global-statement
 
     # Set up the global event listener singleton
@@ -213,8 +249,8 @@ def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
         )
         inputs["id"] = input_data.thread_id
 
-        async def event_generator():
-            queue = await create_queue(flow_copy)
+        async def flow_events():
+            queue = await create_queue(flow_copy, max_queue_size, queue_policy)
             token = flow_context.set(flow_copy)
             try:
                 asyncio.create_task(flow_copy.kickoff_async(inputs=inputs))
@@ -228,26 +264,50 @@ def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
                         item.thread_id = input_data.thread_id
                         item.run_id = input_data.run_id
 
-                    yield encoder.encode(item)
+                    yield item
+
+                    if queue.overflowed and queue.empty():
+                        # The client fell behind and received the RUN_ERROR
+                        break
 
             except Exception as e:  # pylint: disable=broad-exception-caught
-                yield encoder.encode(
-                    RunErrorEvent(
-                        type=EventType.RUN_ERROR,
-                        thread_id=input_data.thread_id,
-                        run_id=input_data.run_id,
-                        error=str(e),
-                    )
+                yield RunErrorEvent(
+                    type=EventType.RUN_ERROR,
+                    thread_id=input_data.thread_id,
+                    run_id=input_data.run_id,
+                    error=str(e),
                 )
             finally:
                 await delete_queue(flow_copy)
                 flow_context.reset(token)
 
-        return StreamingResponse(event_generator(), media_type=encoder.get_content_type())
-
-def add_crewai_crew_fastapi_endpoint(app: FastAPI, crew: Crew, path: str = "/"):
+        async def event_generator():
+            events = flow_events()
+            if coalesce_policy is not None:
+                events = coalesce_deltas(events, coalesce_policy)
+            async for event in events:
+                yield encoder.encode(event)
+
+        stream = event_generator()
+        if flush_policy is not None:
+            stream = batch_frames(stream, flush_policy)
+
+        return StreamingResponse(stream, media_type=encoder.get_content_type())
+
+def add_crewai_crew_fastapi_endpoint(
+    app: FastAPI,
+    crew: Crew,
+    path: str = "/",
+    flush_policy: Optional[FlushPolicy] = None,
+    coalesce_policy: Optional[CoalescePolicy] = None,
+    max_queue_size: int = 1000,
+    queue_policy: OverflowPolicy = OverflowPolicy.COALESCE,
+):
     """Adds a CrewAI crew endpoint to the FastAPI app."""
-    add_crewai_flow_fastapi_endpoint(app, ChatWithCrewFlow(crew=crew), path)
+    add_crewai_flow_fastapi_endpoint(
+        app, ChatWithCrewFlow(crew=crew), path, flush_policy, coalesce_policy,
+        max_queue_size, queue_policy
+    )
 
 
 def crewai_prepare_inputs(  # pylint: disable=unused-argument, too-many-arguments
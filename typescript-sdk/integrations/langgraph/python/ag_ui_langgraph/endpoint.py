@@ -1,13 +1,26 @@
+from typing import Optional
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
+from ag_ui.core import CoalescePolicy, coalesce_deltas
 from ag_ui.core.types import RunAgentInput
-from ag_ui.encoder import EventEncoder
+from ag_ui.encoder import EventEncoder, FlushPolicy, batch_frames
 
 from .agent import LangGraphAgent
 
-def add_langgraph_fastapi_endpoint(app: FastAPI, agent: LangGraphAgent, path: str = "/"):
-    """Adds an endpoint to the FastAPI app."""
+def add_langgraph_fastapi_endpoint(
+    app: FastAPI,
+    agent: LangGraphAgent,
+    path: str = "/",
+    flush_policy: Optional[FlushPolicy] = None,
+    coalesce_policy: Optional[CoalescePolicy] = None,
+):
+    """Adds an endpoint to the FastAPI app.
+
+    Pass a flush_policy to coalesce encoded events into fewer writes and a
+    coalesce_policy to merge consecutive content and tool call argument deltas.
+    """
 
     @app.post(path)
     async def langgraph_agent_endpoint(input_data: RunAgentInput, request: Request):
@@ -18,10 +31,17 @@ def add_langgraph_fastapi_endpoint(app: FastAPI, agent: LangGraphAgent, path: st
         encoder = EventEncoder(accept=accept_header)
 
         async def event_generator():
-            async for event in agent.run(input_data):
+            events = agent.run(input_data)
+            if coalesce_policy is not None:
+                events = coalesce_deltas(events, coalesce_policy)
+            async for event in events:
                 yield encoder.encode(event)
 
+        stream = event_generator()
+        if flush_policy is not None:
+            stream = batch_frames(stream, flush_policy)
+
         return StreamingResponse(
-            event_generator(),
+            stream,
             media_type=encoder.get_content_type()
         )
\ No newline at end of file